@@ -0,0 +1,181 @@
+"""
+    Compares the query builder used by the "Search" and "Create Savelist" features with the previous implementation,
+    which ran one query per criterion and intersected the results in Python.
+
+    The benchmark runs on a temporary database populated with a synthetic library; the database of the application is
+    not modified. It needs to be started from the folder of the application, since it reads its configuration file:
+
+        python benchmark_savelist.py [--rows 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import main
+
+
+# Sets of criteria exercising every column; the last one contains a criterion without any match
+CRITERIA_SETS = [
+    ["artist=Artist 17"],
+    ["artist=Artist 1", "album=Album 2"],
+    ["title=love", "release_year=1999"],
+    ["title=night", "artist=Artist", "tags=rock,jazz"],
+    ["tags=rock+live"],
+    ["artist=Nobody", "title=love"],
+]
+
+WORDS = ["love", "night", "summer", "heart", "fire", "dream", "road", "rain", "light", "dance"]
+TAGS = ["rock", "pop", "jazz", "blues", "metal", "folk", "live", "demo"]
+
+
+def legacy_intersection(list1, list2):
+    """
+        The intersection helper used by the previous implementation.
+
+        :param list1: The first list.
+        :param list2: The second list.
+        :return: Returns a list containing only the common variables of the two lists passed as arguments.
+    """
+
+    if not list1 and not list2:  # Both lists passed as arguments are empty
+        return []
+
+    elif not list1 and list2:  # The first list passed as argument is empty
+        return list2
+
+    elif list1 and not list2:  # The second list passed as argument is empty
+        return list1
+
+    return [value for value in list1 if value in list2]
+
+
+def legacy_find_media(criteria):
+    """
+        The previous implementation: one query per criterion, combined using "legacy_intersection".
+
+        :param criteria: The list of search criteria (eg. "artist=...").
+        :return: A list containing the full paths of the matching media files.
+    """
+
+    cursor = main.connection.cursor()
+
+    results = {"title": [], "artist": [], "album": [], "release_date": [], "tags": []}
+
+    for criterion in criteria:
+        column, value = criterion.split("=", 1)
+
+        if column == "release_year":
+            column = "release_date"
+
+        for tag in value.split(",") if column == "tags" else [value]:
+            cursor.execute("SELECT full_path FROM media WHERE INSTR(" + column + ", ?) > 0", (tag,))
+
+            results[column].extend(entry[0] for entry in cursor.fetchall() if main.is_in_media_folder(entry[0]))
+
+    cursor.close()
+
+    return legacy_intersection(legacy_intersection(legacy_intersection(legacy_intersection(
+        results["title"], results["artist"]), results["album"]), results["release_date"]), results["tags"])
+
+
+def populate_database(rows):
+    """
+        Fills the "media" table with a synthetic library.
+
+        :param rows: The number of media items to be generated.
+        :return: None
+    """
+
+    generator = random.Random(0)  # The library is identical between runs
+
+    def media_items():
+        for index in range(rows):
+            yield (" ".join(generator.sample(WORDS, 3)), "Artist " + str(generator.randrange(500)),
+                   "Album " + str(generator.randrange(2000)), str(generator.randrange(1960, 2021)) + "-01-01",
+                   ",".join(generator.sample(TAGS, 2)), main.media_folder + "/" + str(index) + ".mp3")
+
+    main.connection.executemany("INSERT INTO media (title, artist, album, release_date, tags, full_path) "
+                                "VALUES (?, ?, ?, ?, ?, ?)", media_items())
+    main.connection.commit()
+
+    main.rebuild_media_tags(main.connection)  # Indexing the tags of the library
+
+
+def measure(function, criteria, repeat):
+    """
+        Measures the fastest of several runs of a search function.
+
+        :param function: The search function.
+        :param criteria: The list of search criteria passed to the function.
+        :param repeat: The number of runs.
+
+        :return: A tuple containing the duration of the fastest run (in seconds) and the number of results.
+    """
+
+    best = None
+    results = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = function(criteria)
+        duration = time.perf_counter() - start
+
+        best = duration if best is None else min(best, duration)
+
+    return best, len(results)
+
+
+def run_benchmark():
+    """
+        Parses the command line and prints the timings of both implementations for every set of criteria.
+
+        :return: None
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmarks the compiled search criteria against the previous "
+                                                 "implementation.")
+    parser.add_argument("--rows", type=int, default=100000, help="the number of media items in the library")
+    parser.add_argument("--repeat", type=int, default=5, help="the number of runs of every search")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary_folder:
+        # The database is created inside the temporary folder
+        os.chdir(temporary_folder)
+        os.mkdir("Resources")
+
+        main.connection = main.connect_to_database()
+        main.media_folder = (temporary_folder + "/media").replace("\\", "/")
+
+        populate_database(arguments.rows)
+
+        fts5_available = main.fts5_available
+
+        print("\n" + str(arguments.rows) + " media items, best of " + str(arguments.repeat) + " runs\n")
+        print("{:<50} {:>16} {:>16} {:>16}".format("Criteria", "Legacy", "Compiled (SQL)", "Compiled (FTS5)"))
+
+        for criteria in CRITERIA_SETS:
+            legacy = measure(legacy_find_media, criteria, arguments.repeat)
+
+            main.fts5_available = False
+            compiled = measure(main.find_media_by_criteria, criteria, arguments.repeat)
+
+            cells = [legacy, compiled]
+
+            if fts5_available:
+                main.fts5_available = True
+                cells.append(measure(main.find_media_by_criteria, criteria, arguments.repeat))
+
+            print("{:<50}".format(" ".join(criteria)) +
+                  "".join(" {:>16}".format("{:.1f} ms ({})".format(duration * 1000, count))
+                          for duration, count in cells))
+
+        main.connection.close()
+
+        os.chdir(os.path.dirname(os.path.abspath(main.__file__)))
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -23,17 +23,70 @@ from os import path
 import ntpath
 import shutil
 import zipfile
+import fnmatch
+import glob
+import io
+
+# Library for computing the content hashes of the media files
+import hashlib
+
+# Library for running tasks on a pool of worker threads
+import concurrent.futures
+
+# Library for working with timestamps
+import time
+
+# Library providing the logarithms used for converting loudness measurements to gains
+import math
 
 # 3rd party library for playing audio files
 from pydub import AudioSegment
-from pydub.playback import play
-
-# Library for enabling multithreading
-import _thread
+from pydub.utils import get_player_name
+
+# Optional 3rd party library for writing the decoded audio to the sound card (ffplay is used if it is not installed)
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+
+# Optional 3rd party library for computing the waveforms of the media files (they are not displayed if it is not
+# installed)
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Library used for running ffmpeg, which decodes the media files while they are being played
+import subprocess
+
+# Libraries for enabling multithreading
+import threading
+import queue
+
+# Libraries used by the media folder watcher for accessing the inotify API of the operating system
+import ctypes
+import ctypes.util
+import select
+import struct
 
 # Library that allows system calls
 import sys
 
+# Libraries used for creating reflinks; "fcntl" is only available on Unix-like operating systems
+import errno
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Library for working with regular expressions
+import re
+import unicodedata
+
+# Library providing lightweight record types
+from collections import namedtuple, OrderedDict, deque
+
 
 # Variables tasked with processing the configuration file of the application
 config_var = configparser.ConfigParser()  # We will use a config file to store the path of the media folder
@@ -41,6 +94,151 @@ config_var.read('config.ini')
 
 option = ""  # Variable that will store user choice in CLI-commands that require a "Yes" or "No" answer
 
+fts5_available = False  # Specifies whether the SQLite library supports the full-text index used for searching
+
+copy_method_cache = {}  # The copy method chosen for every pair of file systems (see "copy_file_data")
+copy_method_lock = threading.Lock()
+
+# The SQL expression deriving the release year (as an integer) from the release date of a media item. Both dates
+# starting with the year (eg. "1999-02-01") and dates ending with it (eg. "01/02/1999") are supported.
+RELEASE_YEAR_EXPRESSION = ("CASE WHEN media.release_date GLOB '[0-9][0-9][0-9][0-9]*' "
+                           "THEN CAST(SUBSTR(media.release_date, 1, 4) AS INTEGER) "
+                           "WHEN media.release_date GLOB '*[0-9][0-9][0-9][0-9]' "
+                           "THEN CAST(SUBSTR(media.release_date, -4) AS INTEGER) END")
+
+# The SQL expression used by queries for the release year; the indexed "release_year" column is used whenever the
+# SQLite library supports generated columns
+release_year_column = RELEASE_YEAR_EXPRESSION
+
+# Directories modified less than 2 seconds before a scan are not trusted by the folder manifest, since further changes
+# within the same timestamp granularity would go unnoticed by the next scan
+MANIFEST_RACY_WINDOW_NS = 2 * 10 ** 9
+
+# The modification time recorded by the folder manifest for the directories that need to be listed again by the next
+# scan (eg. recently modified or unreadable ones). They stay in the manifest, so that the scan still visits them even
+# if their parent directory is unchanged.
+MANIFEST_DIRTY_MTIME = -1
+
+# The prefixes of the search criteria accepted by the CLI commands (eg. "artist=...")
+SEARCH_CRITERIA = ("title=", "artist=", "album=", "release_year=", "tags=")
+
+# A lightweight, read-only record holding the columns of a media item required for displaying it
+MediaRow = namedtuple("MediaRow", ["id", "full_path", "mode", "artist", "title", "album", "release_date", "tags"])
+
+# The size (in bytes) of the blocks read while computing the content hash of a media file
+CONTENT_HASH_CHUNK_SIZE = 1024 * 1024
+
+# The size (in bytes) of the BLAKE2b digests identifying the contents of the media files
+CONTENT_HASH_DIGEST_SIZE = 32
+
+# The ioctl request that makes a file share the data blocks of another file (see "man 2 ioctl_ficlone")
+FICLONE = 0x40049409
+
+# The errors reported by the copy methods that are not supported by the file systems (or by the operating system)
+COPY_UNSUPPORTED_ERRORS = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL, errno.ENOSYS, errno.ENOTTY,
+                           errno.EPERM, errno.EMLINK}
+
+# The text encodings of the ID3v2 text frames, indexed by the byte preceding the text
+ID3_TEXT_ENCODINGS = {0: "latin-1", 1: "utf-16", 2: "utf-16-be", 3: "utf-8"}
+
+# The ID3v2 frames read by the metadata extraction (ID3v2.2 uses 3-character identifiers), and the metadata they hold
+ID3_TEXT_FRAMES = {"TIT2": "title", "TT2": "title", "TPE1": "artist", "TP1": "artist", "TALB": "album", "TAL": "album",
+                   "TDRC": "release_date", "TYER": "release_date", "TYE": "release_date", "TLEN": "length",
+                   "TLE": "length"}
+
+# The subchunks of the RIFF INFO list read by the metadata extraction, and the metadata they hold
+RIFF_INFO_FIELDS = {b"INAM": "title", b"IART": "artist", b"IPRD": "album", b"ICRD": "release_date"}
+
+# The bitrates (in kbps) of MPEG audio frames, indexed by (MPEG-1, layer) and by the bitrate index of the frame header.
+# MPEG-2 and MPEG-2.5 share the bitrates of layer 2 between layers 2 and 3.
+MPEG_BITRATES = {(True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+                 (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+                 (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+                 (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+                 (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)}
+
+# The sample rates of MPEG audio frames, indexed by the version bits (MPEG-1, MPEG-2 and MPEG-2.5) of the frame header
+MPEG_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+# Batches of at least this many media files have their metadata extracted by a pool of worker processes
+METADATA_POOL_THRESHOLD = 16
+
+# The format of the audio decoded by ffmpeg for the playback (16-bit stereo at 44.1 kHz)
+PLAYBACK_SAMPLE_RATE = 44100
+PLAYBACK_CHANNELS = 2
+PLAYBACK_SAMPLE_WIDTH = 2
+
+# The size (in bytes) of the blocks of decoded audio passed from ffmpeg to the audio output (about 0.1 seconds)
+PLAYBACK_CHUNK_SIZE = 16384
+
+# The size (in bytes) of the ring buffer holding the decoded audio waiting to be played (about 6 seconds); it bounds the
+# memory used by the playback, no matter how long the media file is
+PLAYBACK_BUFFER_SIZE = 64 * PLAYBACK_CHUNK_SIZE
+
+# The format of the audio decoded by ffmpeg for computing waveforms (16-bit mono at 8 kHz, which is plenty for a strip
+# that is a few hundred pixels wide and keeps the decoding cheap)
+WAVEFORM_SAMPLE_RATE = 8000
+
+# The number of (minimum, maximum) pairs stored for the waveform of every media file
+WAVEFORM_BUCKETS = 400
+
+# The number of samples reduced to a single (minimum, maximum) pair while a media file is being decoded
+WAVEFORM_BLOCK_SIZE = 256
+
+# The size (in bytes) of the blocks of decoded audio read from ffmpeg while computing a waveform (whole sample blocks)
+WAVEFORM_CHUNK_SIZE = 128 * WAVEFORM_BLOCK_SIZE * 2
+
+# The size (in pixels) of the waveforms drawn in the rows of the media list and in the configuration window
+WAVEFORM_ROW_SIZE = (120, 24)
+WAVEFORM_WINDOW_SIZE = (400, 60)
+
+WAVEFORM_COLOR = "#4a7ab5"
+
+# The interval (in seconds) at which the GUI checks whether new waveforms have been computed
+WAVEFORM_POLL_INTERVAL = 1.0
+
+# The format of the audio decoded by ffmpeg for the loudness analysis (32-bit float stereo at 48 kHz, the sample rate
+# the coefficients of the K-weighting filter are specified for)
+LOUDNESS_SAMPLE_RATE = 48000
+LOUDNESS_CHANNELS = 2
+
+# The loudness is measured over blocks of 400 ms overlapping by 75%, ie. a new block starts every 100 ms (ITU-R BS.1770)
+LOUDNESS_STEP_SIZE = LOUDNESS_SAMPLE_RATE // 10
+
+# The number of frames decoded and filtered at once (5 seconds)
+LOUDNESS_CHUNK_FRAMES = 50 * LOUDNESS_STEP_SIZE
+
+# The length (in samples) of the impulse response of the K-weighting filter used for filtering the audio; the response
+# of the filter decays by more than 200 dB within it
+LOUDNESS_FILTER_LENGTH = 8192
+
+# The coefficients ((b0, b1, b2), (a1, a2)) of the two stages of the K-weighting filter of ITU-R BS.1770 at 48 kHz
+K_WEIGHTING_STAGES = (((1.53512485958697, -2.69169618940638, 1.19839281085285), (-1.69065929318241, 0.73248077421585)),
+                      ((1.0, -2.0, 1.0), (-1.99004745483398, 0.99007225036621)))
+
+# The gates of the integrated loudness: blocks quieter than -70 LUFS, or more than 10 LU quieter than the loudness of
+# the blocks passing the absolute gate, are not measured
+LOUDNESS_ABSOLUTE_GATE = -70.0
+LOUDNESS_RELATIVE_GATE = -10.0
+
+# The interval (in seconds) at which the GUI checks whether the loudness analysis has ended
+LOUDNESS_POLL_INTERVAL = 0.5
+
+# The name of the marker file placed inside savelist folders; folders containing it are skipped by the folder scan
+SAVELIST_MARKER = ".songstorage-savelist"
+
+# Events received by the media folder watcher within this interval (in seconds) are coalesced into a single update
+WATCHER_COALESCE_DELAY = 0.5
+
+# The GUI waits for the user to stop typing for this interval (in seconds) before searching the database
+SEARCH_DEBOUNCE_DELAY = 0.15
+
+# The interval (in seconds) at which the GUI checks whether the background search has finished
+SEARCH_POLL_INTERVAL = 0.05
+
+# The number of recent search queries whose results are kept in memory by the GUI
+SEARCH_CACHE_SIZE = 32
+
 
 def connect_to_database():
     """
@@ -72,11 +270,128 @@ def connect_to_database():
                         full_path text NOT NULL UNIQUE
                         ); """
 
-    # Attempting to create the "media" table if it doesn't exist already
+    # The variables storing the SQL commands for creating the tables of the folder manifest. The manifest remembers the
+    # state of the media folder after each scan, allowing the scan to skip directories and files that did not change.
+    create_directory_manifest = """ CREATE TABLE IF NOT EXISTS directory_manifest (
+                                    path text PRIMARY KEY,
+                                    mtime integer NOT NULL
+                                    ); """
+
+    create_file_manifest = """ CREATE TABLE IF NOT EXISTS file_manifest (
+                               full_path text PRIMARY KEY,
+                               size integer NOT NULL,
+                               mtime integer NOT NULL,
+                               inode integer NOT NULL
+                               ); """
+
+    # The scan settings the folder manifest was recorded with; the manifest is discarded when they change
+    create_manifest_settings = """ CREATE TABLE IF NOT EXISTS manifest_settings (
+                                   name text PRIMARY KEY,
+                                   value text NOT NULL
+                                   ); """
+
+    # The variable storing the SQL command for creating the trigger keeping the folder manifest consistent with the
+    # "media" table. When a media item is removed while its file is still on disk (eg. the file could not be deleted),
+    # its manifest entry is discarded and its directory is marked as dirty, so that the next scan lists the directory
+    # again and indexes the file anew. The directory is the part of the path preceding the last slash; it is kept in the
+    # manifest, since the scan only visits the subdirectories of an unchanged directory that the manifest knows of.
+    # The trigger is re-created, since older versions of the application removed the directory from the manifest.
+    create_manifest_trigger = """ CREATE TRIGGER media_manifest_delete AFTER DELETE ON media BEGIN
+                                      DELETE FROM file_manifest WHERE full_path = old.full_path;
+                                      UPDATE directory_manifest SET mtime = """ + str(MANIFEST_DIRTY_MTIME) + """
+                                      WHERE path = substr(
+                                          rtrim(old.full_path, replace(old.full_path, '/', '')), 1,
+                                          length(rtrim(old.full_path, replace(old.full_path, '/', ''))) - 1);
+                                  END; """
+
+    # The variable storing the SQL command for creating the waveform table. Waveforms are identified by the content hash
+    # of the media files, so identical media files share their waveform and renamed media files keep it. Every waveform
+    # is stored as interleaved (minimum, maximum) pairs of signed bytes; an empty waveform means the media file could
+    # not be decoded.
+    create_waveform_table = """ CREATE TABLE IF NOT EXISTS waveforms (
+                                content_hash text PRIMARY KEY,
+                                peaks blob NOT NULL
+                                ) WITHOUT ROWID; """
+
+    # The write-generation counter of the "media" table, incremented by triggers on every change of the table. It allows
+    # caches of query results to detect whether they are out of date using a single lookup. Updates of the columns that
+    # are never displayed nor searched (content hashes, embedded metadata, loudness etc.) do not count as changes, since
+    # background analyses write them for every media file; the update trigger is re-created, since older versions of the
+    # application fired it on every column.
+    create_media_state = """ CREATE TABLE IF NOT EXISTS media_state (
+                             id integer PRIMARY KEY CHECK (id = 0),
+                             generation integer NOT NULL
+                             );
+
+                             INSERT OR IGNORE INTO media_state (id, generation) VALUES (0, 0);
+
+                             CREATE TRIGGER IF NOT EXISTS media_state_insert AFTER INSERT ON media BEGIN
+                                 UPDATE media_state SET generation = generation + 1;
+                             END;
+
+                             CREATE TRIGGER IF NOT EXISTS media_state_delete AFTER DELETE ON media BEGIN
+                                 UPDATE media_state SET generation = generation + 1;
+                             END;
+
+                             DROP TRIGGER IF EXISTS media_state_update;
+
+                             CREATE TRIGGER media_state_update
+                             AFTER UPDATE OF title, artist, album, release_date, tags, mode, full_path ON media BEGIN
+                                 UPDATE media_state SET generation = generation + 1;
+                             END; """
+
+    # The variable storing the SQL commands for creating the tag tables. Every distinct tag is stored once, while the
+    # join table links the media items to their tags; the "tags" column of the "media" table keeps a copy of the tags
+    # meant for displaying them.
+    create_tag_tables = """ CREATE TABLE IF NOT EXISTS tags (
+                            id integer PRIMARY KEY,
+                            name text NOT NULL UNIQUE COLLATE NOCASE
+                            );
+
+                            CREATE TABLE IF NOT EXISTS media_tags (
+                            media_id integer NOT NULL,
+                            tag_id integer NOT NULL,
+                            PRIMARY KEY (media_id, tag_id)
+                            ) WITHOUT ROWID;
+
+                            CREATE INDEX IF NOT EXISTS media_tags_tag ON media_tags (tag_id, media_id);
+
+                            CREATE TRIGGER IF NOT EXISTS media_tags_delete AFTER DELETE ON media BEGIN
+                                DELETE FROM media_tags WHERE media_id = old.id;
+                            END; """
+
+    # The variable storing the SQL commands for creating the secondary indexes of the "media" table. Artists and albums
+    # are compared without regard to letter case.
+    create_indexes = """ CREATE INDEX IF NOT EXISTS media_artist ON media (artist COLLATE NOCASE);
+                         CREATE INDEX IF NOT EXISTS media_album ON media (album COLLATE NOCASE); """
+
+    # Attempting to create the "media" table and the manifest tables if they don't exist already
     try:
         cursor = temp_connection.cursor()
         cursor.execute(create_table)
+        cursor.executescript(create_indexes)
+        create_release_year_column(temp_connection)
+        create_content_hash_columns(temp_connection)
+        create_metadata_columns(temp_connection)
+        create_loudness_columns(temp_connection)
+        cursor.execute(create_directory_manifest)
+        cursor.execute(create_file_manifest)
+        cursor.execute(create_manifest_settings)
+        cursor.execute("DROP TRIGGER IF EXISTS media_manifest_delete")
+        cursor.execute(create_manifest_trigger)
+        cursor.execute(create_waveform_table)
         temp_connection.commit()
+        cursor.executescript(create_media_state)
+
+        # Databases created by older versions of the application only store the tags in the "media" table
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'media_tags'")
+        migrate_tags = not cursor.fetchone()[0]
+
+        cursor.executescript(create_tag_tables)
+
+        if migrate_tags:
+            rebuild_media_tags(temp_connection)
+
         cursor.close()
     except Error as e:
         print("Error: Could not create the table.")
@@ -86,534 +401,5366 @@ def connect_to_database():
     if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
         print("\nThe media table exists or has been created successfully..")
 
+    create_full_text_index(temp_connection)
+
     # Returning the connection variable so that it can be used by other features of the application
     return temp_connection
 
 
-def add_media(file, mode, gui_instance=None):
+def create_release_year_column(temp_connection):
     """
-        Adds the file specified as parameter to the database.
-
-        :param file: the file to be added to the database
-        :param mode: the mode in which the algorithm runs.
-                     '0' means the user is trying to copy a media file from another source folder.
-                     '1' means the current file is already present in the media folder, but it's not indexed by the
-                     database (this can happen if, for example, the user has manually placed a media file inside
-                     the media folder).
-        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
-                             means the method will process some GUI-related elements such as widgets or windows.
+        Adds the derived "release_year" column to the "media" table (if missing) and indexes it, allowing range queries
+        on the release year to use the index. SQLite libraries older than version 3.31 do not support generated
+        columns; the release year is then computed while scanning the table.
 
-        :return True: The method has successfully added the media file both to the media folder and to the database.
-        :return False: There was an error when trying to add the media file, or the file already exists.
+        :param temp_connection: The connection to the database.
+        :return: None
     """
 
-    global option  # Using the global variable that specifies user choice (typically "Yes" or "No" choices)
-    global config_var  # Using the global variable that reads and modifies the configuration file
+    global release_year_column  # Using the global variable that specifies how queries obtain the release year
 
-    basename_file = os.path.basename(file)
+    cursor = temp_connection.cursor()
 
-    # Checking if the specified file is a valid media file
-    if basename_file.endswith('.mp3') or basename_file.endswith('.wav'):
-        assumed_artist = ""  # This variable will store the artist of the media
+    try:
+        cursor.execute("PRAGMA table_xinfo(media)")
 
-        if "-" in basename_file:
+        if "release_year" not in [column[1] for column in cursor.fetchall()]:
+            # Generated columns cannot refer to the name of their table
+            cursor.execute("ALTER TABLE media ADD COLUMN release_year integer GENERATED ALWAYS AS (" +
+                           RELEASE_YEAR_EXPRESSION.replace("media.", "") + ") VIRTUAL")
 
-            """ 
-                Usually, media files use a '-' character to split the title of the media and the artist.
-                This algorithm will attempt to automatically 'guess' the title and artist of the media if this
-                character is present.
-            """
+        cursor.execute("CREATE INDEX IF NOT EXISTS media_release_year ON media (release_year)")
+        temp_connection.commit()
 
-            # If there is a whitespace before the '-' character, we remove it
-            if basename_file.split("-")[0].endswith(" "):
-                assumed_artist = basename_file.split("-")[0][:-1]  # The auto-processed artist name
-            else:
-                assumed_artist = basename_file.split("-")[0]
+        release_year_column = "media.release_year"
 
-            if file.split("-")[1].startswith(" "):  # If there is a whitespace after the '-' character, we remove it
-                assumed_title = basename_file.split("-")[1][1:-4]  # The auto-processed media title
-            else:
-                assumed_title = basename_file.split("-")[1][:-4]
+    except Error:  # The SQLite library does not support generated columns
+        temp_connection.rollback()
 
-        else:  # If no "-" character is present in the title of the file, assuming the title is the name of the file
-            assumed_title = os.path.splitext(basename_file)[0]
+        release_year_column = RELEASE_YEAR_EXPRESSION
 
         if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
-            print("\nAssumed title: " + assumed_title)
-            print("Assumed artist: " + assumed_artist)
-
-        if not mode:  # The user is attempting to add media files from another directory
-            try:
-                shutil.copy2(file, media_folder)  # Copying the source file to the media folder
+            print("\nThe SQLite library does not support generated columns; the release year will not be indexed.")
 
-            except PermissionError:  # Application does not have permission to write in the media folder
-                # Application is running in GUI-mode
-                if gui_instance is not None:
-                    messagebox.showerror("Unable to copy file", "Unable to copy file to media folder. Make sure you "
-                                         "haven't selected a write-protected folder.")
+    cursor.close()
 
-                # Application is running in CLI or debugging mode
-                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
-                    print("\nError: Unable to copy file to media folder. Make sure you haven't selected a "
-                          "write-protected folder.")
 
-                return False
+def create_content_hash_columns(temp_connection):
+    """
+        Adds the columns storing the content hash of every media file to the "media" table (if missing), along with the
+        size and modification time of the file at the time it was hashed. A stored hash is only trusted as long as the
+        size and modification time of the file did not change.
 
-        # Updating the database
-        cursor = connection.cursor()
+        :param temp_connection: The connection to the database.
+        :return: None
+    """
 
-        # Getting the full path of the file (using an app-level convention for slashes)
-        full_path = os.path.join(media_folder, os.path.basename(file)).replace("\\", "/")
+    cursor = temp_connection.cursor()
+    cursor.execute("PRAGMA table_info(media)")
 
-        cursor.execute("SELECT COUNT(1) FROM media WHERE full_path = \"" + full_path + "\"")
-        result = int(str(cursor.fetchone())[1])
+    existing_columns = [column[1] for column in cursor.fetchall()]
 
-        if not result:  # The selected file is not present in the database
-            sql_command = ''' INSERT INTO media(title, artist, album, release_date, tags, full_path)
-                            VALUES (?, ?, ?, ?, ?, ?) '''
+    for column, column_type in (("content_hash", "text"), ("file_size", "integer"), ("file_mtime", "integer")):
+        if column not in existing_columns:
+            cursor.execute("ALTER TABLE media ADD COLUMN " + column + " " + column_type)
 
-            values = (assumed_title, assumed_artist, '', '', '', full_path)
+    # Duplicates are looked up by their hash, while the candidates of an imported file are looked up by their size
+    cursor.executescript(""" CREATE INDEX IF NOT EXISTS media_content_hash ON media (content_hash);
+                             CREATE INDEX IF NOT EXISTS media_file_size ON media (file_size); """)
 
-            try:  # Attempting to add the media file to the database
-                cursor.execute(sql_command, values)
+    temp_connection.commit()
+    cursor.close()
 
-                connection.commit()
 
-            except Error:  # Database is locked
-                # Application is running in GUI-mode
-                if gui_instance is not None:
-                    messagebox.showerror("Database is locked", "Error when trying to commit changes to database. Make "
-                                         "sure another application is not using the database.")
+def create_metadata_columns(temp_connection):
+    """
+        Adds the columns storing the duration and bitrate read from every media file to the "media" table (if missing),
+        along with the size and modification time of the file at the time its embedded metadata was extracted. Files
+        are only parsed again if their size or modification time changed.
 
-                # Application is running in CLI or debugging mode
-                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
-                    print("\nError when trying to commit changes to database. Make sure another application is not "
-                          "using the database.")
+        :param temp_connection: The connection to the database.
+        :return: None
+    """
 
-                return False
+    cursor = temp_connection.cursor()
+    cursor.execute("PRAGMA table_info(media)")
 
-            if gui_instance is not None:  # The method has been fired by a GUI widget
-                gui_instance.display_media()  # Updating the media list
+    existing_columns = [column[1] for column in cursor.fetchall()]
 
-            else:  # The method has been fired by using CLI
-                cursor.execute("SELECT id FROM media WHERE full_path = \"" + full_path + "\"")
-                new_id = cursor.fetchone()
+    for column, column_type in (("duration", "real"), ("bitrate", "integer"), ("metadata_size", "integer"),
+                                ("metadata_mtime", "integer")):
+        if column not in existing_columns:
+            cursor.execute("ALTER TABLE media ADD COLUMN " + column + " " + column_type)
 
-                print("\nThe song was added successfully!\n\nThe ID of the song is: " + str(new_id[0]) +
-                      "\nDo you want to configure the song metadata now? (Y/N)")
+    temp_connection.commit()
+    cursor.close()
 
-                option = input()  # Getting user response
-                if option.lower() == "y":  # The user has responded affirmatively
-                    SongStorageCLI.configure_media(full_path)
 
-                else:  # The user has responded negatively
-                    print("\nThe auto-processing tool assumed that the name of the song is \"" + assumed_title + "\" " +
-                          "and that the name of the artist is \"" + assumed_artist + "\".\nYou can always change " +
-                          "these values, as well as other metadata information, by using the \"Modify_data " +
-                          str(new_id[0]) + "\" command.")
-                    return
+def create_loudness_columns(temp_connection):
+    """
+        Adds the columns storing the loudness and the peak measured for every media file to the "media" table (if
+        missing), along with the size and modification time of the file at the time it was analyzed. The gain applied
+        during the playback is derived from these columns, so media files are never analyzed while they are played.
 
-        else:  # The selected file already exists in the database; letting the user know
-            if gui_instance is not None:  # The method has been fired by a GUI widget
-                messagebox.showinfo("Media file already exists",
-                                    "The selected file already exists in the media folder.")
+        :param temp_connection: The connection to the database.
+        :return: None
+    """
 
-            else:  # The method has been fired by using CLI
-                print("There is already a song with this name in the media folder!")
+    cursor = temp_connection.cursor()
+    cursor.execute("PRAGMA table_info(media)")
 
-            return False
+    existing_columns = [column[1] for column in cursor.fetchall()]
 
-        if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
-            print("\nMedia file has been added successfully.")
+    for column, column_type in (("loudness", "real"), ("peak", "real"), ("loudness_size", "integer"),
+                                ("loudness_mtime", "integer")):
+        if column not in existing_columns:
+            cursor.execute("ALTER TABLE media ADD COLUMN " + column + " " + column_type)
 
-        return True
+    temp_connection.commit()
+    cursor.close()
 
 
-def play_media(media, allow_multiprocessing, gui_instance=None):
+def create_full_text_index(temp_connection):
     """
-        Plays the media file specified as parameter.
+        Creates the FTS5 full-text index of the "media" table, along with the triggers that keep it in sync with the
+        table. If the local SQLite library was compiled without FTS5, the searches fall back to scanning the table.
 
-        :param media: The media file to be played.
-        :param allow_multiprocessing: Checks whether application can spawn a new thread to play music in background.
-        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
-                             means the method will process some GUI-related elements such as widgets or windows.
+        :param temp_connection: The connection to the database.
         :return: None
     """
 
-    cursor = connection.cursor()
+    global fts5_available  # Using the global variable that specifies whether the full-text index can be used
 
-    # CLI-only method: The user has attempted to play the media file based on its ID in the database
-    if media.isnumeric():
-        cursor.execute("SELECT full_path FROM media WHERE id = " + media)
+    # The full-text index only stores the tokens of the indexed columns; the contents are read from the "media" table
+    create_index = """ CREATE VIRTUAL TABLE IF NOT EXISTS media_fts USING fts5(
+                       title, artist, album, release_date, tags,
+                       content='media', content_rowid='id', prefix='2 3'
+                       ); """
 
-        full_path = cursor.fetchone()
+    # The triggers which mirror every change of the "media" table into the full-text index. The update trigger only
+    # fires when an indexed column changes, since background analyses update other columns of every media item; it is
+    # re-created, since older versions of the application fired it on every column.
+    create_triggers = """ CREATE TRIGGER IF NOT EXISTS media_fts_insert AFTER INSERT ON media BEGIN
+                              INSERT INTO media_fts(rowid, title, artist, album, release_date, tags)
+                              VALUES (new.id, new.title, new.artist, new.album, new.release_date, new.tags);
+                          END;
 
-        if full_path is None:  # The system couldn't find the specified ID
-            print("\nError: The specified ID does not exist in the database.")
-            return
+                          CREATE TRIGGER IF NOT EXISTS media_fts_delete AFTER DELETE ON media BEGIN
+                              INSERT INTO media_fts(media_fts, rowid, title, artist, album, release_date, tags)
+                              VALUES ('delete', old.id, old.title, old.artist, old.album, old.release_date, old.tags);
+                          END;
 
-        full_path = full_path[0]
+                          DROP TRIGGER IF EXISTS media_fts_update;
 
-    else:  # The method is fired by the GUI or the user has attempted to play the media file by using its name
-        full_path = os.path.join(media_folder, os.path.basename(media)).replace("\\", "/")
+                          CREATE TRIGGER media_fts_update
+                          AFTER UPDATE OF title, artist, album, release_date, tags ON media BEGIN
+                              INSERT INTO media_fts(media_fts, rowid, title, artist, album, release_date, tags)
+                              VALUES ('delete', old.id, old.title, old.artist, old.album, old.release_date, old.tags);
+                              INSERT INTO media_fts(rowid, title, artist, album, release_date, tags)
+                              VALUES (new.id, new.title, new.artist, new.album, new.release_date, new.tags);
+                          END; """
 
-        if not path.exists(full_path):  # (CLI-only) The user has provided an invalid filename
-            print("\nError: The specified media file does not exist.")
-            return
+    cursor = temp_connection.cursor()
 
-    # Attempting to play the media file
-    if full_path.endswith(".mp3"):  # The target file is an .mp3 media file
-        try:
-            media_file = AudioSegment.from_mp3(full_path)
+    # The index needs to be rebuilt if it was just created, or if the triggers were dropped by a previous session that
+    # could not use FTS5 (in which case the index might be out of date)
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'media_fts_insert'")
+    rebuild_index = not cursor.fetchone()[0]
 
-            if allow_multiprocessing:  # If the application runs in loop mode, we can use multithreading
-                _thread.start_new_thread(play, (media_file,))
+    try:
+        cursor.execute(create_index)
+        cursor.executescript(create_triggers)
 
-            else:  # The application runs in only one iteration, no multithreading is possible
-                play(media_file)
+        if rebuild_index:
+            cursor.execute("INSERT INTO media_fts(media_fts) VALUES ('rebuild')")
 
-        except FileNotFoundError:  # Could not play the media file
-            if gui_instance is not None:  # Application is running in GUI-mode
-                messagebox.showerror("Unable to play file", "Unable to play media file. Please make sure that you have "
-                                     "ffmpeg installed (https://ffmpeg.org/) and that the files \"ffmpeg.exe\", "
-                                     "\"ffplay.exe\" and \"ffprobe.exe\" are also copied in the current folder of the "
-                                     "application.")
+        temp_connection.commit()
 
-            # Application is running in CLI or debugging mode
-            if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
-                print("\nError: Unable to play media file. Please make sure that you have ffmpeg installed "
-                      "(https://ffmpeg.org/) and that the files \"ffmpeg.exe\", \"ffplay.exe\" and \"ffprobe.exe\" are "
-                      "also copied in the current folder of the application.")
+        fts5_available = True
 
-            return
+    except Error:  # The SQLite library does not support FTS5
+        temp_connection.rollback()
 
-    elif full_path.endswith(".wav"):  # The target file is a .wav media file
-        try:
-            media_file = AudioSegment.from_wav(full_path)
+        # Triggers created by a previous session would make every change of the "media" table fail
+        cursor.executescript(""" DROP TRIGGER IF EXISTS media_fts_insert;
+                                 DROP TRIGGER IF EXISTS media_fts_delete;
+                                 DROP TRIGGER IF EXISTS media_fts_update; """)
+
+        fts5_available = False
 
-            if allow_multiprocessing:  # If the application runs in loop mode, we can use multithreading
-                _thread.start_new_thread(play, (media_file,))
+    cursor.close()
 
-            else:  # The application runs in only one iteration, no multithreading is possible
-                play(media_file)
+    if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+        if fts5_available:
+            print("\nThe full-text index is available.")
+        else:
+            print("\nThe SQLite library does not support FTS5; searches will scan the media table.")
 
-        except FileNotFoundError:  # Could not play the media file
-            if gui_instance is not None:  # Application is running in GUI-mode
-                messagebox.showerror("Unable to play file", "Unable to play media file. Please make sure that you have "
-                                     "ffmpeg installed (https://ffmpeg.org/) and that the files \"ffmpeg.exe\", "
-                                     "\"ffplay.exe\" and \"ffprobe.exe\" are also copied in the current folder of the "
-                                     "application.")
 
-            # Application is running in CLI or debugging mode
-            if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
-                print("\nError: Unable to play media file. Please make sure that you have ffmpeg installed "
-                      "(https://ffmpeg.org/) and that the files \"ffmpeg.exe\", \"ffplay.exe\" and \"ffprobe.exe\" are "
-                      "also copied in the current folder of the application.")
+def parse_tags(tags):
+    """
+        Splits a comma-separated list of tags into the individual tags, ignoring whitespaces, quotes, empty tags and
+        duplicates (tags are not case-sensitive).
 
-            return
+        :param tags: The comma-separated list of tags.
+        :return: The list of tags, in the order they were given.
+    """
+
+    tag_names = {}
+
+    for tag in tags.split(","):
+        tag = tag.replace("\"", "").strip()
+
+        if tag != "":
+            tag_names.setdefault(tag.casefold(), tag)
+
+    return list(tag_names.values())
+
+
+def set_media_tags(cursor, media_id, tags):
+    """
+        Replaces the tags of a media item. The changes are not committed.
+
+        :param cursor: The cursor used for writing to the database.
+        :param media_id: The ID of the media item.
+        :param tags: The comma-separated list of the new tags.
+
+        :return: The tags of the media item, in the form they are displayed.
+    """
+
+    tag_names = parse_tags(tags)
+
+    cursor.execute("DELETE FROM media_tags WHERE media_id = ?", (media_id,))
+
+    cursor.executemany("INSERT OR IGNORE INTO tags (name) VALUES (?)", [(tag,) for tag in tag_names])
+    cursor.executemany("INSERT INTO media_tags (media_id, tag_id) SELECT ?, id FROM tags WHERE name = ?",
+                       [(media_id, tag) for tag in tag_names])
+
+    display_tags = ", ".join(tag_names)
+
+    cursor.execute("UPDATE media SET tags = ? WHERE id = ?", (display_tags, media_id))
+
+    return display_tags
+
+
+def rebuild_media_tags(temp_connection):
+    """
+        Fills the tag tables using the comma-separated tags stored in the "media" table (eg. when migrating a database
+        created by an older version of the application).
+
+        :param temp_connection: The connection to the database.
+        :return: None
+    """
+
+    cursor = temp_connection.cursor()
+
+    cursor.execute("SELECT id, tags FROM media WHERE tags IS NOT NULL AND tags != ''")
+
+    for media_id, tags in cursor.fetchall():
+        set_media_tags(cursor, media_id, tags)
+
+    temp_connection.commit()
+    cursor.close()
 
     if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
-        print("\nThe media file is playing.")
+        print("\nThe tags of the media items have been indexed.")
 
 
-def remove_media(media, window=None, gui_instance=None):
+def compile_tags_filter(value):
     """
-        Removes the media given as parameter from the database and from the media folder.
+        Compiles the value of a tags criterion into a SQL condition using the tag tables. Tags separated by commas are
+        alternatives, while tags joined by "+" are all required (eg. "rock+live,jazz" matches the media items tagged
+        with both "rock" and "live", as well as the ones tagged with "jazz").
 
-        :param media: The path to the media file to be removed.
-        :param window: The window which will need to close after database update.
-        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
-                             means the method will process some GUI-related elements such as widgets.
+        :param value: The value of the tags criterion.
+        :return: A tuple containing the SQL condition (or None if no tags were given) and its parameters.
+    """
 
-        :return True: The method has successfully removed the media file from the media folder and the database.
-        :return False: There was an error when trying to remove the media file.
+    conditions = []
+    parameters = []
+
+    for alternative in value.split(","):
+        tag_names = parse_tags(alternative.replace("+", ","))
+
+        if not tag_names:
+            continue
+
+        # Looking up the media items having every tag of the alternative using the index of the join table
+        conditions.append("media.id IN (SELECT media_tags.media_id FROM tags JOIN media_tags ON media_tags.tag_id = "
+                          "tags.id WHERE tags.name IN (" + ", ".join(["?"] * len(tag_names)) + ") "
+                          "GROUP BY media_tags.media_id HAVING COUNT(*) = ?)")
+        parameters.extend(tag_names)
+        parameters.append(len(tag_names))
+
+    if not conditions:
+        return None, parameters
+
+    return "(" + " OR ".join(conditions) + ")", parameters
+
+
+def build_match_expression(text, column=None):
     """
+        Converts a search query into an FTS5 match expression. Every word of the query becomes a prefix query, and all
+        of them need to match.
 
-    cursor = connection.cursor()
+        :param text: The search query.
+        :param column: Optional column of the full-text index the search is restricted to.
+
+        :return: The match expression, or None if the query does not contain any words.
+    """
+
+    words = re.findall(r"\w+", text)
+
+    if not words:
+        return None
+
+    expression = " ".join("\"" + word + "\"*" for word in words)
+
+    if column is not None:
+        expression = column + " : (" + expression + ")"
+
+    return expression
+
+
+def is_media_file(filename):
+    """
+        Checks whether the file specified as parameter is a media file supported by the application.
+
+        :param filename: The name (or path) of the file to be checked.
+        :return True: The file is an .mp3 or a .wav media file.
+        :return False: The file is not supported by the application.
+    """
+
+    return filename.endswith('.mp3') or filename.endswith('.wav')
+
+
+def guess_media_metadata(basename_file):
+    """
+        Attempts to 'guess' the title and the artist of a media file based on its filename.
+
+        :param basename_file: The name of the media file (without the path to its folder).
+        :return: A tuple containing the assumed title and the assumed artist of the media file.
+    """
+
+    assumed_artist = ""  # This variable will store the artist of the media
+
+    if "-" in basename_file:
+
+        """ 
+            Usually, media files use a '-' character to split the title of the media and the artist.
+            This algorithm will attempt to automatically 'guess' the title and artist of the media if this
+            character is present.
+        """
+
+        # If there is a whitespace before the '-' character, we remove it
+        if basename_file.split("-")[0].endswith(" "):
+            assumed_artist = basename_file.split("-")[0][:-1]  # The auto-processed artist name
+        else:
+            assumed_artist = basename_file.split("-")[0]
+
+        # If there is a whitespace after the '-' character, we remove it
+        if basename_file.split("-")[1].startswith(" "):
+            assumed_title = basename_file.split("-")[1][1:-4]  # The auto-processed media title
+        else:
+            assumed_title = basename_file.split("-")[1][:-4]
+
+    else:  # If no "-" character is present in the title of the file, assuming the title is the name of the file
+        assumed_title = os.path.splitext(basename_file)[0]
+
+    return assumed_title, assumed_artist
+
+
+def is_in_media_folder(full_path):
+    """
+        Checks whether the media file specified as parameter belongs to the current media folder. If recursive
+        scanning is enabled in the configuration file, media files located in subdirectories also belong to it.
+
+        :param full_path: The path of the media file (using the app-level convention for slashes).
+        :return True: The media file belongs to the media folder.
+        :return False: The media file is located elsewhere.
+    """
+
+    if config_var.get('SCAN', 'recursive', fallback="0") == "1":
+        return full_path.startswith(media_folder.rstrip("/") + "/")
+
+    return os.path.dirname(full_path) == media_folder
+
+
+def resolve_media_path(media):
+    """
+        Gets the full path of a media file provided either by its filename or by its full path (the GUI refers to
+        media files located in subdirectories of the media folder using their full path).
+
+        :param media: The filename or the full path of the media file.
+        :return: The full path of the media file (using an app-level convention for slashes).
+    """
+
+    full_path = media.replace("\\", "/")
+
+    if os.path.isabs(full_path) and is_in_media_folder(full_path):
+        return full_path
+
+    return os.path.join(media_folder, os.path.basename(media)).replace("\\", "/")
+
+
+def get_media_folder_filter(use_index=True):
+    """
+        Builds the SQL condition that restricts a query on the "media" table to the items of the current media folder.
+        The media folder is filtered using a range of the (indexed) "full_path" column.
+
+        :param use_index: Specifies whether SQLite may use the index of the "full_path" column. Queries having other,
+                          cheaper conditions are faster when scanning the table in the order of the IDs instead.
+
+        :return: A tuple containing the SQL condition and the list of its parameters.
+    """
+
+    # Every path in the media folder starts with the folder followed by a slash; the character following the slash in
+    # the ASCII table ('0') marks the end of the range
+    folder_prefix = media_folder.rstrip("/") + "/"
+
+    condition = "media.full_path >= ? AND media.full_path < ?"
+
+    if not use_index:  # The unary "+" operator prevents SQLite from using the index for the range
+        condition = "+media.full_path >= ? AND +media.full_path < ?"
+    parameters = [folder_prefix, folder_prefix[:-1] + "0"]
+
+    if config_var.get('SCAN', 'recursive', fallback="0") != "1":  # Excluding the subdirectories of the media folder
+        condition += " AND INSTR(SUBSTR(media.full_path, ?), '/') = 0"
+        parameters.append(len(folder_prefix) + 1)
+
+    return condition, parameters
+
+
+def load_media_rows(condition=None, parameters=(), limit=-1, offset=0, match=None, database_connection=None):
+    """
+        Loads the media items of the current media folder using a single query, streaming the rows from the cursor into
+        the model.
+
+        :param condition: Optional SQL condition restricting the media items to be loaded (eg. a search query). Columns
+                          need to be qualified with the name of the "media" table when a match expression is given.
+        :param parameters: The parameters of the SQL condition.
+        :param limit: The maximum number of media items to be loaded (negative values mean no limit).
+        :param offset: The number of media items to be skipped.
+        :param match: Optional FTS5 match expression; the media items are then ranked by relevance.
+        :param database_connection: Optional connection to be used instead of the global one (eg. by other threads).
+
+        :return: A list of MediaRow records, ordered by their ID (or by relevance).
+    """
+
+    if media_folder == "":  # No media folder is configured
+        return []
+
+    # Comparing paths is expensive; if another condition is given, it is evaluated first and the table is scanned in
+    # the order of the IDs, sparing both the comparisons and the sorting of the results
+    folder_condition, folder_parameters = get_media_folder_filter(use_index=not condition)
+
+    sql_command = ("SELECT media.id, media.full_path, media.mode, media.artist, media.title, media.album, "
+                   "media.release_date, media.tags FROM media")
+    sql_parameters = []
+    order = " ORDER BY media.id"
+
+    if match is not None:  # Searching the full-text index
+        sql_command += " JOIN media_fts ON media_fts.rowid = media.id WHERE media_fts MATCH ? AND "
+        sql_parameters.append(match)
+        order = " ORDER BY media_fts.rank"
+    else:
+        sql_command += " WHERE "
+
+    if condition:
+        sql_command += "(" + condition + ") AND "
+        sql_parameters.extend(parameters)
+
+    sql_command += folder_condition
+    sql_parameters.extend(folder_parameters)
+
+    cursor = (database_connection or connection).cursor()
+    cursor.execute(sql_command + order + " LIMIT ? OFFSET ?", sql_parameters + [limit, offset])
+
+    media_rows = [MediaRow(*entry) for entry in cursor]
+
+    cursor.close()
+
+    return media_rows
+
+
+def get_media_path_by_position(position):
+    """
+        Gets the full path of the media item displayed under the specified number by the "List_media" command.
+        The IDs of the database are never re-numbered; the sequential numbers presented to the user are the positions of
+        the media items of the media folder, ordered by their ID.
+
+        :param position: The sequential number of the media item (as a string).
+        :return: The full path of the media item, or None if there is no media item with the specified number.
+    """
+
+    if not position.isnumeric() or int(position) < 1:
+        return None
+
+    media_rows = load_media_rows(limit=1, offset=int(position) - 1)
+
+    return media_rows[0].full_path if media_rows else None
+
+
+def get_media_position(full_path):
+    """
+        Gets the sequential number under which the "List_media" command displays the specified media item.
+
+        :param full_path: The full path of the media item.
+        :return: The sequential number of the media item.
+    """
+
+    folder_condition, sql_parameters = get_media_folder_filter()
+
+    cursor = connection.cursor()
+    cursor.execute("SELECT COUNT(*) FROM media WHERE " + folder_condition +
+                   " AND media.id <= (SELECT id FROM media WHERE full_path = ?)", sql_parameters + [full_path])
+
+    position = cursor.fetchone()[0]
+
+    cursor.close()
+
+    return position
+
+
+def hash_file(full_path):
+    """
+        Computes the BLAKE2b hash of the contents of a file. The file is read in fixed-size blocks, so that files of any
+        size can be hashed using a constant amount of memory; the hash function releases the GIL while processing each
+        block, allowing several files to be hashed in parallel by worker threads.
+
+        :param full_path: The full path of the file.
+        :return: The hexadecimal digest of the file, or None if the file could not be read.
+    """
+
+    content_hash = hashlib.blake2b(digest_size=CONTENT_HASH_DIGEST_SIZE)
+    buffer = bytearray(CONTENT_HASH_CHUNK_SIZE)
+    buffer_view = memoryview(buffer)
+
+    try:
+        with open(full_path, "rb") as file:
+            while True:
+                read_size = file.readinto(buffer)
+
+                if not read_size:  # The whole file has been read
+                    break
+
+                content_hash.update(buffer_view[:read_size])
+
+    except OSError:  # The file was removed or cannot be read
+        return None
+
+    return content_hash.hexdigest()
+
+
+def get_file_signature(full_path):
+    """
+        Gets the size and the modification time of a file, which validate its stored content hash.
+
+        :param full_path: The full path of the file.
+        :return: A tuple containing the size (in bytes) and the modification time (in nanoseconds) of the file, or None
+                 if the file does not exist.
+    """
+
+    try:
+        file_stat = os.stat(full_path)
+    except OSError:
+        return None
+
+    return file_stat.st_size, file_stat.st_mtime_ns
+
+
+def update_content_hashes(candidate_sizes=None, gui_instance=None):
+    """
+        Brings the stored content hashes of the media files of the media folder up to date. The files are examined and
+        hashed by a bounded pool of worker threads; a file is only hashed again if its size or modification time
+        changed since its hash was stored. Since files of different sizes cannot be identical, only the files that
+        share their size with another media file are hashed.
+
+        :param candidate_sizes: If specified, only the media files of these sizes (and the ones whose size is not
+                                known yet) are examined, and all of them are hashed. This is used when importing files.
+        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
+                             means the method will process some GUI-related elements such as widgets or windows.
+
+        :return True: The content hashes have been updated.
+        :return False: The database could not be updated.
+    """
+
+    cursor = connection.cursor()
+
+    sql_command = "SELECT id, full_path, file_size, file_mtime, content_hash FROM media"
+
+    if candidate_sizes is not None:
+        candidate_sizes = set(candidate_sizes)
+        media_entries = []
+
+        cursor.execute(sql_command + " WHERE file_size IS NULL")
+        media_entries.extend(cursor.fetchall())
+
+        # The sizes are looked up in batches, keeping the number of parameters of every query within SQLite's limits
+        sizes = sorted(candidate_sizes)
+
+        for index in range(0, len(sizes), 500):
+            cursor.execute(sql_command + " WHERE file_size IN (" + ", ".join("?" * len(sizes[index:index + 500])) +
+                           ")", sizes[index:index + 500])
+            media_entries.extend(cursor.fetchall())
+
+    else:
+        cursor.execute(sql_command)
+        media_entries = cursor.fetchall()
+
+    media_entries = [entry for entry in media_entries if is_in_media_folder(entry[1])]
+
+    worker_count = config_var.getint('IMPORT', 'workers', fallback=4)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
+        signatures = list(executor.map(get_file_signature, [entry[1] for entry in media_entries]))
+
+        # The number of media files of every size
+        size_counts = {}
+
+        for signature in signatures:
+            if signature is not None:
+                size_counts[signature[0]] = size_counts.get(signature[0], 0) + 1
+
+        hashed_entries = []  # The media files whose hash needs to be computed, along with their signature
+        updated_entries = []  # The new values of the hash columns of the media files that changed
+
+        for entry, signature in zip(media_entries, signatures):
+            if signature is None:  # The media file no longer exists
+                continue
+
+            if tuple(entry[2:4]) == signature and entry[4] is not None:  # The stored hash is still valid
+                continue
+
+            if candidate_sizes is not None:
+                needs_hash = signature[0] in candidate_sizes
+            else:
+                needs_hash = size_counts[signature[0]] > 1
+
+            if needs_hash:
+                hashed_entries.append((entry[0], entry[1], signature))
+
+            elif tuple(entry[2:4]) != signature:  # The file changed; its previous hash (if any) is discarded
+                updated_entries.append((signature[0], signature[1], None, entry[0]))
+
+        for (media_id, full_path, signature), content_hash in zip(
+                hashed_entries, executor.map(hash_file, [entry[1] for entry in hashed_entries])):
+            updated_entries.append((signature[0], signature[1], content_hash, media_id))
+
+    try:
+        cursor.executemany("UPDATE media SET file_size = ?, file_mtime = ?, content_hash = ? WHERE id = ?",
+                           updated_entries)
+        connection.commit()
+
+    except Error:  # Database is locked
+        connection.rollback()
+
+        # Application is running in GUI-mode
+        if gui_instance is not None:
+            messagebox.showerror("Database is locked", "Error when trying to commit changes to database. Make "
+                                 "sure another application is not using the database.")
+
+        # Application is running in CLI or debugging mode
+        if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+            print("\nError when trying to commit changes to database. Make sure another application is not "
+                  "using the database.")
+
+        return False
+
+    finally:
+        cursor.close()
+
+    if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+        print("\nContent hashes updated: " + str(len(media_entries)) + " media files examined, " +
+              str(len(hashed_entries)) + " media files hashed.")
+
+    return True
+
+
+def find_identical_media(file, gui_instance=None):
+    """
+        Looks for a media file of the media folder whose contents are identical to the specified file. The file is only
+        hashed if the media folder contains another file of the same size.
+
+        :param file: The full path of the file.
+        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
+                             means the method will process some GUI-related elements such as widgets or windows.
+
+        :return: A tuple containing the content hash of the file (None if it was not computed) and the full path of the
+                 identical media file (None if there is no such file).
+    """
+
+    signature = get_file_signature(file)
+
+    if signature is None or not update_content_hashes({signature[0]}, gui_instance):
+        return None, None
+
+    cursor = connection.cursor()
+    cursor.execute("SELECT full_path, content_hash FROM media WHERE file_size = ? AND content_hash IS NOT NULL",
+                   (signature[0],))
+
+    candidates = [entry for entry in cursor.fetchall() if is_in_media_folder(entry[0])]
+
+    cursor.close()
+
+    if not candidates:  # No media file has the same size
+        return None, None
+
+    content_hash = hash_file(file)
+
+    for full_path, candidate_hash in candidates:
+        if candidate_hash == content_hash:
+            return content_hash, full_path
+
+    return content_hash, None
+
+
+def find_duplicate_media(gui_instance=None):
+    """
+        Finds the clusters of byte-identical media files of the media folder, based on their content hashes.
+
+        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
+                             means the method will process some GUI-related elements such as widgets or windows.
+
+        :return: A list of clusters (lists of at least two full paths, sorted alphabetically) along with the size of
+                 their files, or None if the database could not be updated.
+    """
+
+    if not update_content_hashes(None, gui_instance):
+        return None
+
+    cursor = connection.cursor()
+    cursor.execute(""" SELECT content_hash, file_size, full_path FROM media
+                       WHERE content_hash IN (SELECT content_hash FROM media WHERE content_hash IS NOT NULL
+                                              GROUP BY content_hash HAVING COUNT(*) > 1)
+                       ORDER BY content_hash, full_path """)
+
+    clusters = OrderedDict()
+
+    for content_hash, file_size, full_path in cursor:
+        if is_in_media_folder(full_path):
+            clusters.setdefault((content_hash, file_size), []).append(full_path)
+
+    cursor.close()
+
+    return sorted([(paths, file_size) for (content_hash, file_size), paths in clusters.items() if len(paths) > 1],
+                  key=lambda cluster: cluster[0])
+
+
+def decode_id3_text(frame_data):
+    """
+        Decodes the value of an ID3v2 text frame.
+
+        :param frame_data: The contents of the frame (the encoding byte followed by the text).
+        :return: The first value of the frame, without surrounding whitespaces.
+    """
+
+    if not frame_data:
+        return ""
+
+    encoding = ID3_TEXT_ENCODINGS.get(frame_data[0], "latin-1")
+
+    # Values are terminated (or separated, in ID3v2.4) by null characters
+    return frame_data[1:].decode(encoding, errors="replace").split("\x00")[0].strip()
+
+
+def parse_id3v2_tag(file):
+    """
+        Reads the text frames of an ID3v2 tag (versions 2.2 to 2.4) starting at the current position of the file. The
+        frames that are not needed (eg. embedded pictures) are skipped without being read.
+
+        :param file: The file, opened in binary mode.
+        :return: A tuple containing the dictionary of metadata found in the tag and the position of the end of the tag
+                 (the current position of the file if there is no tag).
+    """
+
+    tag_start = file.tell()
+    header = file.read(10)
+
+    if len(header) < 10 or header[:3] != b"ID3" or header[3] not in (2, 3, 4):
+        return {}, tag_start
+
+    major_version, tag_flags = header[3], header[5]
+    tag_size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]  # A "syncsafe" integer
+    tag_end = tag_start + 10 + tag_size + (10 if major_version == 4 and tag_flags & 0x10 else 0)  # Optional footer
+
+    if tag_flags & 0x80 and major_version < 4:  # The whole tag is unsynchronised; it needs to be decoded first
+        reader = io.BytesIO(file.read(tag_size).replace(b"\xff\x00", b"\xff"))
+        frames_end = len(reader.getvalue())
+    else:
+        reader = file
+        frames_end = tag_start + 10 + tag_size
+
+    if tag_flags & 0x40 and major_version > 2:  # Skipping the extended header
+        extended_header = reader.read(4)
+
+        if len(extended_header) < 4:  # The tag is truncated
+            return {}, tag_end
+
+        if major_version == 3:  # The size does not include the size field itself
+            reader.seek(struct.unpack(">I", extended_header)[0], 1)
+        else:
+            reader.seek(((extended_header[0] << 21) | (extended_header[1] << 14) | (extended_header[2] << 7) |
+                         extended_header[3]) - 4, 1)
+
+    frame_header_size = 6 if major_version == 2 else 10
+    metadata = {}
+
+    while reader.tell() + frame_header_size <= frames_end:
+        frame_header = reader.read(frame_header_size)
+
+        # The padding of the tag has been reached, or the file is truncated
+        if len(frame_header) < frame_header_size or not frame_header[:3].isalnum():
+            break
+
+        if major_version == 2:
+            frame_id, frame_size, frame_flags = frame_header[:3], int.from_bytes(frame_header[3:6], "big"), 0
+        elif major_version == 3:
+            frame_id, frame_size, frame_flags = frame_header[:4], struct.unpack(">I", frame_header[4:8])[0], \
+                frame_header[9]
+        else:
+            frame_id, frame_size, frame_flags = frame_header[:4], (frame_header[4] << 21) | (frame_header[5] << 14) | \
+                (frame_header[6] << 7) | frame_header[7], frame_header[9]
+
+        if frame_size <= 0 or reader.tell() + frame_size > frames_end:  # The frame is invalid
+            break
+
+        key = ID3_TEXT_FRAMES.get(frame_id.decode("latin-1"))
+
+        # Compressed and encrypted frames are not supported
+        if key is None or key in metadata or frame_flags & (0xC0 if major_version == 3 else 0x0C):
+            reader.seek(frame_size, 1)
+            continue
+
+        frame_data = reader.read(frame_size)
+
+        if len(frame_data) < frame_size:  # The file is truncated
+            break
+
+        if major_version == 4:
+            if frame_flags & 0x02:  # The frame is unsynchronised
+                frame_data = frame_data.replace(b"\xff\x00", b"\xff")
+
+            # Skipping the group identifier and the data length indicator
+            frame_data = frame_data[(1 if frame_flags & 0x40 else 0) + (4 if frame_flags & 0x01 else 0):]
+
+        value = decode_id3_text(frame_data)
+
+        if value:
+            metadata[key] = value
+
+    return metadata, tag_end
+
+
+def parse_id3v1_tag(file):
+    """
+        Reads the ID3v1 tag located in the last 128 bytes of a file.
+
+        :param file: The file, opened in binary mode.
+        :return: The dictionary of metadata found in the tag, or None if there is no tag.
+    """
+
+    file.seek(0, 2)
+
+    if file.tell() < 128:
+        return None
+
+    file.seek(-128, 2)
+    tag = file.read(128)
+
+    if tag[:3] != b"TAG":
+        return None
+
+    metadata = {}
+
+    for key, start, end in (("title", 3, 33), ("artist", 33, 63), ("album", 63, 93), ("release_date", 93, 97)):
+        value = tag[start:end].split(b"\x00")[0].decode("latin-1").strip()
+
+        if value:
+            metadata[key] = value
+
+    return metadata
+
+
+def parse_mpeg_audio(file, audio_start, audio_end):
+    """
+        Computes the duration and the bitrate of an MPEG audio stream (eg. an MP3 file) from the header of its first
+        frame, without decoding it. The frame counts stored by encoders of variable bitrate streams (Xing, Info and VBRI
+        headers) are used when present; otherwise, the stream is assumed to have a constant bitrate.
+
+        :param file: The file, opened in binary mode.
+        :param audio_start: The position of the beginning of the audio stream (after the ID3v2 tag).
+        :param audio_end: The position of the end of the audio stream (before the ID3v1 tag).
+
+        :return: A tuple containing the duration (in seconds) and the bitrate (in kbps), or None if no valid frame was
+                 found.
+    """
+
+    file.seek(audio_start)
+    data = file.read(65536)
+
+    position = data.find(b"\xff")
+
+    while 0 <= position < len(data) - 4:
+        header = struct.unpack(">I", data[position:position + 4])[0]
+
+        version_bits, layer_bits = (header >> 19) & 3, (header >> 17) & 3
+        bitrate_index, sample_rate_index = (header >> 12) & 15, (header >> 10) & 3
+
+        if header >> 21 == 0x7FF and version_bits != 1 and layer_bits and bitrate_index not in (0, 15) and \
+                sample_rate_index != 3:
+            mpeg1 = version_bits == 3
+            layer = 4 - layer_bits
+
+            bitrate = MPEG_BITRATES[(mpeg1, min(layer, 2) if not mpeg1 else layer)][bitrate_index]
+            sample_rate = MPEG_SAMPLE_RATES[version_bits][sample_rate_index]
+            samples_per_frame = 384 if layer == 1 else (1152 if mpeg1 or layer == 2 else 576)
+            padding = (header >> 9) & 1
+
+            if layer == 1:
+                frame_length = (12000 * bitrate // sample_rate + padding) * 4
+            else:
+                frame_length = samples_per_frame // 8 * 1000 * bitrate // sample_rate + padding
+
+            # The header of the next frame confirms that a frame has been found (and not random data)
+            next_header = data[position + frame_length:position + frame_length + 2]
+
+            if len(next_header) < 2 or (next_header[0] == 0xFF and next_header[1] & 0xE0 == 0xE0):
+                mono = (header >> 6) & 3 == 3
+                xing_offset = position + 4 + ((17 if mono else 32) if mpeg1 else (9 if mono else 17))
+
+                frame_count = None
+
+                if data[xing_offset:xing_offset + 4] in (b"Xing", b"Info"):
+                    if struct.unpack(">I", data[xing_offset + 4:xing_offset + 8])[0] & 1:
+                        frame_count = struct.unpack(">I", data[xing_offset + 8:xing_offset + 12])[0]
+
+                elif data[position + 36:position + 40] == b"VBRI":
+                    frame_count = struct.unpack(">I", data[position + 50:position + 54])[0]
+
+                audio_size = audio_end - (audio_start + position)
+
+                if frame_count:
+                    duration = frame_count * samples_per_frame / sample_rate
+                    return duration, int(audio_size * 8 / duration / 1000) if duration else bitrate
+
+                return audio_size * 8 / (bitrate * 1000), bitrate
+
+        position = data.find(b"\xff", position + 1)
+
+    return None
+
+
+def parse_riff_file(file):
+    """
+        Reads the format, the length and the tags (RIFF INFO list and ID3v2 chunk) of a WAV file.
+
+        :param file: The file, opened in binary mode.
+        :return: The dictionary of metadata found in the file (empty if the file is not a WAV file).
+    """
+
+    file.seek(0, 2)
+    file_size = file.tell()
+    file.seek(0)
+
+    header = file.read(12)
+
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return {}
+
+    metadata = {}
+    id3_metadata = {}
+    byte_rate = None
+    data_size = None
+
+    while file.tell() + 8 <= file_size:
+        chunk_id, chunk_size = struct.unpack("<4sI", file.read(8))
+        chunk_start = file.tell()
+
+        if chunk_id == b"fmt " and chunk_size >= 16:
+            format_data = file.read(12)
+
+            if len(format_data) == 12:  # Otherwise, the file is truncated
+                byte_rate = struct.unpack("<HHII", format_data)[3]
+
+        elif chunk_id == b"data":
+            data_size = min(chunk_size, file_size - chunk_start)  # Streamed files may not specify the actual size
+
+        elif chunk_id == b"LIST" and file.read(4) == b"INFO":
+            info_end = chunk_start + min(chunk_size, file_size - chunk_start)
+
+            while file.tell() + 8 <= info_end:
+                info_id, info_size = struct.unpack("<4sI", file.read(8))
+                key = RIFF_INFO_FIELDS.get(info_id)
+
+                if key is None:  # Chunks are padded to an even size
+                    file.seek(info_size + (info_size & 1), 1)
+                    continue
+
+                value = file.read(info_size).split(b"\x00")[0]
+                file.seek(info_size & 1, 1)
+
+                try:
+                    value = value.decode("utf-8").strip()
+                except UnicodeDecodeError:
+                    value = value.decode("latin-1").strip()
+
+                if value:
+                    metadata.setdefault(key, value)
+
+        elif chunk_id in (b"id3 ", b"ID3 "):
+            id3_metadata = parse_id3v2_tag(file)[0]
+
+        if chunk_id == b"data" and chunk_size >= file_size - chunk_start:  # The data chunk ends the file
+            break
+
+        file.seek(chunk_start + chunk_size + (chunk_size & 1))
+
+    for key, value in id3_metadata.items():
+        metadata.setdefault(key, value)
+
+    metadata.pop("length", None)
+
+    if byte_rate and data_size is not None:
+        metadata["duration"] = data_size / byte_rate
+        metadata["bitrate"] = byte_rate * 8 // 1000
+
+    return metadata
+
+
+def read_embedded_metadata(full_path):
+    """
+        Reads the metadata embedded in a media file (ID3v2, ID3v1 and RIFF INFO tags), along with its duration and
+        bitrate. Only the headers of the file are read; the audio is not decoded.
+
+        :param full_path: The full path of the media file.
+        :return: A dictionary containing the metadata found in the file ("title", "artist", "album", "release_date",
+                 "duration" and "bitrate"); missing values are omitted.
+    """
+
+    with open(full_path, "rb") as file:
+        if full_path.lower().endswith(".wav"):
+            return parse_riff_file(file)
+
+        metadata, audio_start = parse_id3v2_tag(file)
+
+        id3v1_metadata = parse_id3v1_tag(file)
+
+        # The audio stream ends where the ID3v1 tag (if any) begins
+        audio_end = file.seek(0, 2) - (128 if id3v1_metadata is not None else 0)
+
+        for key, value in (id3v1_metadata or {}).items():
+            metadata.setdefault(key, value)  # The ID3v2 tag takes precedence
+
+        audio_info = parse_mpeg_audio(file, audio_start, audio_end)
+
+        length = metadata.pop("length", "")
+
+        if audio_info is not None:
+            metadata["duration"], metadata["bitrate"] = audio_info
+
+        elif length.isdigit():  # The length stored in the tag (in milliseconds)
+            metadata["duration"] = int(length) / 1000
+
+    return metadata
+
+
+def extract_media_metadata(full_path, known_signature=None):
+    """
+        Extracts the metadata embedded in a media file, unless the file did not change since its metadata was last
+        extracted. This method runs in the worker processes of the metadata extraction.
+
+        :param full_path: The full path of the media file.
+        :param known_signature: The size and modification time of the file when its metadata was last extracted.
+
+        :return: A tuple containing the signature of the file (see "get_file_signature") and the dictionary of metadata
+                 (empty if the file could not be parsed), or None if the file is missing or did not change.
+    """
+
+    signature = get_file_signature(full_path)
+
+    if signature is None or signature == known_signature:
+        return None
+
+    try:
+        metadata = read_embedded_metadata(full_path)
+
+    except (OSError, ValueError, IndexError, struct.error):  # The file is damaged or cannot be read
+        metadata = {}
+
+    return signature, metadata
+
+
+def extract_metadata_batch(full_paths, known_signatures=None):
+    """
+        Extracts the metadata embedded in several media files. Large batches are spread over a pool of worker
+        processes, since parsing the headers of many files is bound by the interpreter; small batches are processed
+        in the calling thread, which avoids the cost of starting the processes.
+
+        :param full_paths: The full paths of the media files.
+        :param known_signatures: The signatures the metadata of every file was last extracted for (see
+                                 "extract_media_metadata").
+
+        :return: The list of results of "extract_media_metadata", in the order of the files.
+    """
+
+    if known_signatures is None:
+        known_signatures = [None] * len(full_paths)
+
+    worker_count = config_var.getint('METADATA', 'workers', fallback=4)
+
+    if len(full_paths) >= METADATA_POOL_THRESHOLD and worker_count > 1:
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=worker_count) as executor:
+                return list(executor.map(extract_media_metadata, full_paths, known_signatures, chunksize=32))
+
+        except (OSError, RuntimeError):  # Worker processes cannot be started on this system
+            pass
+
+    return list(map(extract_media_metadata, full_paths, known_signatures))
+
+
+def get_media_metadata(full_path, metadata):
+    """
+        Gets the metadata of a new media item from the metadata embedded in its media file, falling back to the title
+        and artist guessed from the filename.
+
+        :param full_path: The full path of the media file.
+        :param metadata: The metadata embedded in the media file (see "read_embedded_metadata").
+
+        :return: A tuple containing the title, the artist, the album and the release date of the media item.
+    """
+
+    assumed_title, assumed_artist = guess_media_metadata(os.path.basename(full_path))
+
+    return (metadata.get("title") or assumed_title, metadata.get("artist") or assumed_artist,
+            metadata.get("album", ""), metadata.get("release_date", ""))
+
+
+def update_embedded_metadata(full_paths, gui_instance=None, database_connection=None):
+    """
+        Extracts the metadata embedded in the specified media files and stores it in the database. The duration and
+        the bitrate are always updated, while the title, artist, album and release date are only replaced for media
+        items whose metadata is still the one guessed from the filename (metadata edited by the user is kept). Files
+        that did not change since their metadata was last extracted are skipped.
+
+        :param full_paths: The full paths of the media files.
+        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
+                             means the method will process some GUI-related elements such as widgets or windows.
+        :param database_connection: Optional connection to be used instead of the global one (eg. by other threads).
+
+        :return True: The database has been updated.
+        :return False: The database could not be updated.
+    """
+
+    database_connection = database_connection or connection
+    cursor = database_connection.cursor()
+
+    media_entries = []
+
+    # The media items are looked up in batches, keeping the number of parameters of every query within SQLite's limits
+    for index in range(0, len(full_paths), 500):
+        cursor.execute("SELECT id, full_path, title, artist, album, release_date, metadata_size, metadata_mtime " +
+                       "FROM media WHERE full_path IN (" + ", ".join("?" * len(full_paths[index:index + 500])) + ")",
+                       full_paths[index:index + 500])
+        media_entries.extend(cursor.fetchall())
+
+    results = extract_metadata_batch([entry[1] for entry in media_entries],
+                                     [tuple(entry[6:8]) for entry in media_entries])
+
+    updated_entries = []
+
+    for entry, result in zip(media_entries, results):
+        if result is None:  # The media file is missing or did not change
+            continue
+
+        (file_size, file_mtime), metadata = result
+        title, artist, album, release_date = entry[2:6]
+
+        if (title, artist) == guess_media_metadata(os.path.basename(entry[1])) and not album and not release_date:
+            title, artist, album, release_date = get_media_metadata(entry[1], metadata)
+
+        updated_entries.append((title, artist, album, release_date, metadata.get("duration"), metadata.get("bitrate"),
+                                file_size, file_mtime, entry[0]))
+
+    try:
+        cursor.executemany("UPDATE media SET title = ?, artist = ?, album = ?, release_date = ?, duration = ?, " +
+                           "bitrate = ?, metadata_size = ?, metadata_mtime = ? WHERE id = ?", updated_entries)
+        database_connection.commit()
+
+    except Error:  # Database is locked
+        database_connection.rollback()
+
+        # Application is running in GUI-mode
+        if gui_instance is not None:
+            messagebox.showerror("Database is locked", "Error when trying to commit changes to database. Make "
+                                 "sure another application is not using the database.")
+
+        # Application is running in CLI or debugging mode
+        if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+            print("\nError when trying to commit changes to database. Make sure another application is not "
+                  "using the database.")
+
+        return False
+
+    finally:
+        cursor.close()
+
+    if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+        print("\nEmbedded metadata extracted from " + str(len(updated_entries)) + " of " + str(len(media_entries)) +
+              " media files (the other ones did not change).")
+
+    return True
+
+
+def copy_media_file(file, full_path, identical_path=None):
+    """
+        Copies a source file to the media folder.
+
+        :param file: The full path of the source file.
+        :param full_path: The full path of the new media file.
+        :param identical_path: The full path of a media file having the same contents as the source file. If specified,
+                               the new media file is created as a hard link of it (whenever the file system supports
+                               hard links), sharing its data instead of duplicating it. Otherwise, the file is copied
+                               using the fastest method supported by the file systems (see "copy_file_data").
+
+        :return: None
+        :raises OSError: The file could not be copied.
+    """
+
+    if identical_path is not None:
+        try:
+            os.link(identical_path, full_path)
+            return
+
+        except OSError:  # Hard links are not supported by the file system; the file will be copied instead
+            pass
+
+    copy_file_data(file, full_path)
+
+
+def expand_media_sources(sources):
+    """
+        Expands the sources passed to the "Add_song" command into the list of media files to be added. Every source can
+        be a file, a directory (whose media files are added, including the ones of its subdirectories) or a glob
+        pattern (eg. "~/Music/*.mp3").
+
+        :param sources: The list of sources.
+        :return: A tuple containing the list of media files (in the order they were found, without duplicates) and the
+                 list of sources that did not match any file.
+    """
+
+    media_files = OrderedDict()
+    unmatched_sources = []
+
+    for source in sources:
+        source = os.path.expanduser(source)
+
+        if os.path.isfile(source):
+            matched_paths = [source]
+
+        elif os.path.isdir(source):
+            matched_paths = []
+
+            for directory, subdirectories, filenames in os.walk(source):
+                subdirectories.sort()
+                matched_paths.extend(os.path.join(directory, filename) for filename in sorted(filenames))
+
+        else:  # The source is treated as a glob pattern
+            matched_paths = sorted(full_path for full_path in glob.glob(source, recursive=True)
+                                   if os.path.isfile(full_path))
+
+        matched_paths = [full_path.replace("\\", "/") for full_path in matched_paths
+                         if is_media_file(os.path.basename(full_path))]
+
+        if not matched_paths:
+            unmatched_sources.append(source)
+
+        for full_path in matched_paths:
+            media_files[full_path] = None
+
+    return list(media_files), unmatched_sources
+
+
+def add_media(file, mode, gui_instance=None):
+    """
+        Adds the file specified as parameter to the database.
+
+        :param file: the file to be added to the database
+        :param mode: the mode in which the algorithm runs.
+                     '0' means the user is trying to copy a media file from another source folder.
+                     '1' means the current file is already present in the media folder, but it's not indexed by the
+                     database (this can happen if, for example, the user has manually placed a media file inside
+                     the media folder).
+        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
+                             means the method will process some GUI-related elements such as widgets or windows.
+
+        :return True: The method has successfully added the media file both to the media folder and to the database.
+        :return False: There was an error when trying to add the media file, or the file already exists.
+    """
+
+    global option  # Using the global variable that specifies user choice (typically "Yes" or "No" choices)
+    global config_var  # Using the global variable that reads and modifies the configuration file
+
+    basename_file = os.path.basename(file)
+
+    # Checking if the specified file is a valid media file
+    if is_media_file(basename_file):
+        assumed_title, assumed_artist = guess_media_metadata(basename_file)
+
+        if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+            print("\nAssumed title: " + assumed_title)
+            print("Assumed artist: " + assumed_artist)
+
+        # Getting the full path of the file (using an app-level convention for slashes)
+        full_path = os.path.join(media_folder, os.path.basename(file)).replace("\\", "/")
+
+        content_hash = None  # The content hash of the media file, if computed while looking for duplicates
+
+        if not mode:  # The user is attempting to add media files from another directory
+            # Specifies what happens to files identical to a media file of the media folder: "reject", "link" or
+            # "allow"
+            duplicates = config_var.get('IMPORT', 'duplicates', fallback="reject")
+            identical_path = None
+
+            if duplicates in ("reject", "link"):
+                content_hash, identical_path = find_identical_media(file, gui_instance)
+
+            if identical_path is not None and duplicates == "reject":
+                # Application is running in GUI-mode
+                if gui_instance is not None:
+                    messagebox.showinfo("Duplicate media file", "The selected file is identical to \"" +
+                                        identical_path + "\", which is already in the media folder.")
+
+                # Application is running in CLI or debugging mode
+                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+                    print("\nThe selected file is identical to \"" + identical_path + "\", which is already in the "
+                          "media folder.")
+
+                return False
+
+            try:
+                copy_media_file(file, full_path, identical_path)  # Copying the source file to the media folder
+
+            except PermissionError:  # Application does not have permission to write in the media folder
+                # Application is running in GUI-mode
+                if gui_instance is not None:
+                    messagebox.showerror("Unable to copy file", "Unable to copy file to media folder. Make sure you "
+                                         "haven't selected a write-protected folder.")
+
+                # Application is running in CLI or debugging mode
+                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+                    print("\nError: Unable to copy file to media folder. Make sure you haven't selected a "
+                          "write-protected folder.")
+
+                return False
+
+        # Updating the database
+        cursor = connection.cursor()
+
+        cursor.execute("SELECT COUNT(1) FROM media WHERE full_path = \"" + full_path + "\"")
+        result = int(str(cursor.fetchone())[1])
+
+        if not result:  # The selected file is not present in the database
+            sql_command = ''' INSERT INTO media(title, artist, album, release_date, tags, full_path, content_hash,
+                                                file_size, file_mtime, duration, bitrate, metadata_size,
+                                                metadata_mtime)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '''
+
+            # The content hash is only stored along with the signature of the file it was computed for
+            signature = get_file_signature(full_path) if content_hash is not None else None
+
+            # Reading the metadata embedded in the media file (the title and artist guessed from the filename are used
+            # for the missing values)
+            metadata_signature, metadata = extract_media_metadata(full_path) or ((None, None), {})
+            assumed_title, assumed_artist, album, release_date = get_media_metadata(full_path, metadata)
+
+            values = (assumed_title, assumed_artist, album, release_date, '', full_path, content_hash) + \
+                (signature or (None, None)) + (metadata.get("duration"), metadata.get("bitrate")) + metadata_signature
+
+            try:  # Attempting to add the media file to the database
+                cursor.execute(sql_command, values)
+
+                connection.commit()
+
+            except Error:  # Database is locked
+                # Application is running in GUI-mode
+                if gui_instance is not None:
+                    messagebox.showerror("Database is locked", "Error when trying to commit changes to database. Make "
+                                         "sure another application is not using the database.")
+
+                # Application is running in CLI or debugging mode
+                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+                    print("\nError when trying to commit changes to database. Make sure another application is not "
+                          "using the database.")
+
+                return False
+
+            if gui_instance is not None:  # The method has been fired by a GUI widget
+                gui_instance.display_media()  # Updating the media list
+
+            else:  # The method has been fired by using CLI
+                new_id = get_media_position(full_path)  # The number displayed for the song by "List_media"
+
+                print("\nThe song was added successfully!\n\nThe ID of the song is: " + str(new_id) +
+                      "\nDo you want to configure the song metadata now? (Y/N)")
+
+                option = input()  # Getting user response
+                if option.lower() == "y":  # The user has responded affirmatively
+                    SongStorageCLI.configure_media(full_path)
+
+                else:  # The user has responded negatively
+                    print("\nThe auto-processing tool assumed that the name of the song is \"" + assumed_title + "\" " +
+                          "and that the name of the artist is \"" + assumed_artist + "\".\nYou can always change " +
+                          "these values, as well as other metadata information, by using the \"Modify_data " +
+                          str(new_id) + "\" command.")
+                    return
+
+        else:  # The selected file already exists in the database; letting the user know
+            if gui_instance is not None:  # The method has been fired by a GUI widget
+                messagebox.showinfo("Media file already exists",
+                                    "The selected file already exists in the media folder.")
+
+            else:  # The method has been fired by using CLI
+                print("There is already a song with this name in the media folder!")
+
+            return False
+
+        if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+            print("\nMedia file has been added successfully.")
+
+        return True
+
+
+def add_media_bulk(sources, gui_instance=None):
+    """
+        Adds every media file matched by the specified sources to the media folder and to the database.
+        The source files are hashed (if required to detect duplicates) and copied by a bounded pool of worker threads,
+        while the records of the new media files are added to the database using a single transaction. Unlike
+        "add_media", the user is not prompted to configure the metadata of every media file; a single summary is
+        displayed at the end instead.
+
+        :param sources: The list of files, directories and glob patterns to be added (see "expand_media_sources").
+        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
+                             means the method will process some GUI-related elements such as widgets or windows.
+
+        :return: A tuple containing the list of full paths of the new media files and the list of source files that
+                 were skipped (along with the reason), or None if the database could not be updated (the files that
+                 were already copied are then removed from the media folder).
+    """
+
+    start_time = time.perf_counter()
+
+    files, unmatched_sources = expand_media_sources(sources)
+
+    skipped_files = [(source, "no media files found") for source in unmatched_sources]
+
+    cursor = connection.cursor()
+    cursor.execute("SELECT full_path FROM media")
+
+    indexed_paths = {entry[0] for entry in cursor}
+
+    cursor.close()
+
+    # The source file of every new media file, indexed by the full path of the media file
+    imported_files = OrderedDict()
+
+    for file in files:
+        full_path = os.path.join(media_folder, os.path.basename(file)).replace("\\", "/")
+
+        if full_path in indexed_paths or full_path in imported_files:
+            skipped_files.append((file, "a media file with the same name already exists"))
+        else:
+            imported_files[full_path] = file
+
+    # Specifies what happens to files identical to a media file of the media folder: "reject", "link" or "allow"
+    duplicates = config_var.get('IMPORT', 'duplicates', fallback="reject")
+
+    identical_paths = {}  # The media files whose contents are identical to another media file
+    content_hashes = {}
+    signatures = {}
+
+    worker_count = config_var.getint('IMPORT', 'workers', fallback=4)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
+        for full_path, signature in zip(list(imported_files),
+                                        executor.map(get_file_signature, imported_files.values())):
+            if signature is None:  # The source file was removed since it was found
+                skipped_files.append((imported_files.pop(full_path), "the file could not be read"))
+            else:
+                signatures[full_path] = signature
+
+        if duplicates in ("reject", "link") and imported_files:
+            size_counts = {}
+
+            for full_path in imported_files:
+                size_counts[signatures[full_path][0]] = size_counts.get(signatures[full_path][0], 0) + 1
+
+            if not update_content_hashes(size_counts, gui_instance):
+                return None
+
+            # The media files of the media folder whose size matches a source file, indexed by their content hash
+            known_hashes = {}
+            library_sizes = set()
+            sizes = sorted(size_counts)
+
+            cursor = connection.cursor()
+
+            for index in range(0, len(sizes), 500):
+                cursor.execute("SELECT content_hash, file_size, full_path FROM media WHERE content_hash IS NOT NULL " +
+                               "AND file_size IN (" + ", ".join("?" * len(sizes[index:index + 500])) + ")",
+                               sizes[index:index + 500])
+
+                for content_hash, file_size, full_path in cursor:
+                    if is_in_media_folder(full_path):
+                        known_hashes.setdefault(content_hash, full_path)
+                        library_sizes.add(file_size)
+
+            cursor.close()
+
+            # Only the source files sharing their size with another file can be identical to it
+            candidate_sizes = library_sizes | {size for size in size_counts if size_counts[size] > 1}
+
+            hashed_paths = [full_path for full_path in imported_files if signatures[full_path][0] in candidate_sizes]
+
+            for full_path, content_hash in zip(hashed_paths, executor.map(
+                    hash_file, [imported_files[full_path] for full_path in hashed_paths])):
+                content_hashes[full_path] = content_hash
+
+            for full_path in list(imported_files):
+                content_hash = content_hashes.get(full_path)
+
+                if content_hash is None:
+                    continue
+
+                if content_hash not in known_hashes:  # The first file having these contents
+                    known_hashes[content_hash] = full_path
+
+                elif duplicates == "reject":
+                    skipped_files.append((imported_files.pop(full_path), "identical to \"" +
+                                          known_hashes[content_hash] + "\""))
+                else:
+                    identical_paths[full_path] = known_hashes[content_hash]
+
+        # The files identical to another new media file are linked once the latter has been copied
+        copied_paths = [full_path for full_path in imported_files if identical_paths.get(full_path) not in
+                        imported_files]
+        linked_paths = [full_path for full_path in imported_files if identical_paths.get(full_path) in imported_files]
+
+        def import_file(full_path):  # Copies a source file, returning the error that occurred (if any)
+            try:
+                copy_media_file(imported_files[full_path], full_path, identical_paths.get(full_path))
+            except OSError as error:
+                return error
+
+            return None
+
+        copy_errors = list(executor.map(import_file, copied_paths)) + [import_file(full_path)
+                                                                        for full_path in linked_paths]
+
+    added_paths = []
+
+    for full_path, copy_error in zip(copied_paths + linked_paths, copy_errors):
+        if copy_error is not None:
+            skipped_files.append((imported_files[full_path], "the file could not be copied (" +
+                                  (copy_error.strerror or str(copy_error)) + ")"))
+        else:
+            added_paths.append(full_path)
+
+    values = []
+
+    # Reading the metadata embedded in the new media files (using a pool of worker processes for large imports)
+    for full_path, extraction in zip(added_paths, extract_metadata_batch(added_paths)):
+        metadata_signature, metadata = extraction or ((None, None), {})
+
+        # The content hash is only stored along with the signature of the file it was computed for
+        content_hash = content_hashes.get(full_path)
+        signature = get_file_signature(full_path) if content_hash is not None else None
+
+        values.append(get_media_metadata(full_path, metadata) + ('', full_path, content_hash) +
+                      (signature or (None, None)) + (metadata.get("duration"), metadata.get("bitrate")) +
+                      metadata_signature)
+
+    cursor = connection.cursor()
+
+    try:  # Attempting to add every media file to the database in one transaction
+        cursor.executemany(''' INSERT INTO media(title, artist, album, release_date, tags, full_path, content_hash,
+                                                 file_size, file_mtime, duration, bitrate, metadata_size,
+                                                 metadata_mtime)
+                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ''', values)
+
+        connection.commit()
+
+    except Error:  # Database is locked
+        connection.rollback()
+
+        # Removing the media files that were copied, so that the media folder does not hold files without records
+        leftover_paths = []
+
+        for full_path in added_paths:
+            try:
+                os.remove(full_path)
+
+            except OSError:  # The media folder is write-protected; the next scan of the media folder will index it
+                leftover_paths.append(full_path)
+
+        # Application is running in GUI-mode
+        if gui_instance is not None:
+            messagebox.showerror("Database is locked", "Error when trying to commit changes to database. Make "
+                                 "sure another application is not using the database.")
+
+        # Application is running in CLI or debugging mode
+        if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+            print("\nError when trying to commit changes to database. Make sure another application is not "
+                  "using the database.")
+
+            if leftover_paths:
+                print("\nThe following files were copied to the media folder but could not be removed; they will be "
+                      "indexed by the next scan of the media folder:")
+
+                for full_path in leftover_paths:
+                    print(full_path)
+
+        return None
+
+    finally:
+        cursor.close()
+
+    duration = max(time.perf_counter() - start_time, 1e-6)
+    added_size = sum(signatures[full_path][0] for full_path in added_paths)
+
+    if gui_instance is None:  # The method has been fired by using CLI
+        print("\n" + str(len(added_paths)) + " media files have been added in " + "{:.2f}".format(duration) +
+              " seconds (" + "{:.1f}".format(len(added_paths) / duration) + " files/s, " +
+              "{:.1f}".format(added_size / (1024 * 1024) / duration) + " MB/s).")
+
+        if skipped_files:
+            print("\nThe following files were skipped:")
+
+            for file, reason in skipped_files:
+                print(file + " - " + reason)
+
+    if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+        print("\nBulk import completed: " + str(len(added_paths)) + " media files added, " + str(len(skipped_files)) +
+              " skipped, " + str(len(identical_paths)) + " hard-linked to identical media files.")
+
+    return added_paths, skipped_files
+
+
+class PCMRingBuffer:  # Fixed-size ring buffer carrying the decoded audio from the decoder to the audio output
+    def __init__(self, capacity):
+        """
+            Initialization method of the class.
+
+            :param capacity: The size of the buffer (in bytes).
+            :return: None
+        """
+
+        self.buffer = bytearray(capacity)
+        self.capacity = capacity
+        self.read_position = 0
+        self.size = 0  # The number of bytes waiting to be read
+        self.closed = False  # The writer has finished; the remaining data can still be read
+        self.aborted = False  # The playback has been stopped; the remaining data is discarded
+        self.condition = threading.Condition()
+
+    def write(self, data):
+        """
+            Writes data to the buffer, waiting for the reader to free some space whenever the buffer is full. This keeps
+            the memory used by the playback constant, no matter how long the media file is.
+
+            :param data: The data to be written.
+
+            :return True: The data has been written.
+            :return False: The buffer has been aborted.
+        """
+
+        data_view = memoryview(data)
+
+        with self.condition:
+            while data_view:
+                while self.size == self.capacity and not self.aborted:
+                    self.condition.wait()
+
+                if self.aborted:
+                    return False
+
+                write_position = (self.read_position + self.size) % self.capacity
+                length = min(len(data_view), self.capacity - self.size, self.capacity - write_position)
+
+                self.buffer[write_position:write_position + length] = data_view[:length]
+                self.size += length
+                data_view = data_view[length:]
+
+                self.condition.notify_all()
+
+        return True
+
+    def read(self, max_size):
+        """
+            Reads data from the buffer, waiting for the writer whenever the buffer is empty.
+
+            :param max_size: The maximum number of bytes to be read.
+            :return: The data, or an empty bytes object once the buffer has been closed and emptied (or aborted).
+        """
+
+        with self.condition:
+            while not self.size and not self.closed and not self.aborted:
+                self.condition.wait()
+
+            if self.aborted or not self.size:
+                return b""
+
+            length = min(max_size, self.size, self.capacity - self.read_position)
+            data = bytes(self.buffer[self.read_position:self.read_position + length])
+
+            self.read_position = (self.read_position + length) % self.capacity
+            self.size -= length
+
+            self.condition.notify_all()
+
+        return data
+
+    def close(self):
+        """
+            Marks the end of the data; the reader receives the remaining data, then an empty bytes object.
+
+            :return: None
+        """
+
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def abort(self):
+        """
+            Discards the remaining data and releases both the reader and the writer.
+
+            :return: None
+        """
+
+        with self.condition:
+            self.aborted = True
+            self.condition.notify_all()
+
+
+class PyAudioSink:  # Audio output writing the decoded audio to the sound card through PyAudio
+    def __init__(self):
+        """
+            Initialization method of the class. Opens an output stream using the format of the decoded audio.
+
+            :return: None
+        """
+
+        self.audio = pyaudio.PyAudio()
+        self.stream = self.audio.open(format=self.audio.get_format_from_width(PLAYBACK_SAMPLE_WIDTH),
+                                      channels=PLAYBACK_CHANNELS, rate=PLAYBACK_SAMPLE_RATE, output=True)
+
+    def write(self, data):
+        """
+            Plays a block of decoded audio, returning once the sound card has accepted it.
+
+            :param data: The decoded audio (a whole number of frames).
+            :return: None
+        """
+
+        self.stream.write(data)
+
+    def close(self):
+        """
+            Waits for the remaining audio to be played, then releases the sound card.
+
+            :return: None
+        """
+
+        self.stream.stop_stream()
+        self.stream.close()
+        self.audio.terminate()
+
+    def stop(self):
+        """
+            Stops the playback. The stream cannot be closed while another thread is writing to it; the playback stops
+            as soon as the block being played ends.
+
+            :return: True, since the audio output can still be used.
+        """
+
+        return True
+
+
+class FFplaySink:  # Audio output piping the decoded audio to an ffplay process (used when PyAudio is not installed)
+    def __init__(self):
+        """
+            Initialization method of the class. Starts ffplay, which reads a WAV stream of unknown length from its
+            standard input.
+
+            :return: None
+        """
+
+        self.process = subprocess.Popen([get_player_name(), "-nodisp", "-autoexit", "-hide_banner", "-loglevel",
+                                         "quiet", "-i", "-"], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+
+        byte_rate = PLAYBACK_SAMPLE_RATE * PLAYBACK_CHANNELS * PLAYBACK_SAMPLE_WIDTH
+        block_align = PLAYBACK_CHANNELS * PLAYBACK_SAMPLE_WIDTH
+
+        # The sizes of the header are set to their maximum, since the length of the stream is not known in advance
+        self.process.stdin.write(struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 0xFFFFFFFF, b"WAVE", b"fmt ", 16, 1,
+                                             PLAYBACK_CHANNELS, PLAYBACK_SAMPLE_RATE, byte_rate, block_align,
+                                             PLAYBACK_SAMPLE_WIDTH * 8, b"data", 0xFFFFFFFF))
+
+    def write(self, data):
+        """
+            Plays a block of decoded audio, returning once ffplay has accepted it.
+
+            :param data: The decoded audio (a whole number of frames).
+            :return: None
+        """
+
+        self.process.stdin.write(data)
+
+    def close(self):
+        """
+            Waits for ffplay to play the remaining audio and exit.
+
+            :return: None
+        """
+
+        try:
+            self.process.stdin.close()
+        except OSError:  # ffplay has already exited
+            pass
+
+        self.process.wait()
+
+    def stop(self):
+        """
+            Stops the playback immediately, discarding the audio buffered by ffplay.
+
+            :return: False, since the audio output can no longer be used.
+        """
+
+        self.process.kill()
+
+        return False
+
+
+class DecodedAudioCache:  # LRU cache of the decoded audio of recently played media files
+    def __init__(self, capacity):
+        """
+            Initialization method of the class.
+
+            :param capacity: The maximum size (in bytes) of the decoded audio kept in the cache. A capacity of 0
+                             disables the cache.
+            :return: None
+        """
+
+        self.capacity = capacity
+        # (full path, modification time, gain) -> decoded audio, ordered from the least recently played media file
+        self.entries = OrderedDict()
+        self.size = 0  # The size (in bytes) of the decoded audio currently kept in the cache
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # The cache is shared by every playback thread
+
+    def get(self, key):
+        """
+            Looks up the decoded audio of a media file.
+
+            :param key: A tuple containing the full path, the modification time and the playback gain of the media
+                        file.
+            :return: The decoded audio, or None if it is not cached.
+        """
+
+        with self.lock:
+            decoded_audio = self.entries.get(key)
+
+            if decoded_audio is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+            print("\nDecoded audio cache " + ("hit" if decoded_audio is not None else "miss") + ": " +
+                  str(self.hits) + " hits, " + str(self.misses) + " misses, " +
+                  "{:.1f}".format(self.size / (1024 * 1024)) + " MB used.")
+
+        return decoded_audio
+
+    def put(self, key, decoded_audio):
+        """
+            Stores the decoded audio of a media file, evicting the least recently played media files whenever the
+            capacity of the cache is exceeded. The audio decoded from previous versions of the file is discarded.
+
+            :param key: A tuple containing the full path, the modification time and the playback gain of the media
+                        file.
+            :param decoded_audio: The decoded audio of the whole media file.
+            :return: None
+        """
+
+        if len(decoded_audio) > self.capacity:  # The media file is too long to be cached
+            return
+
+        with self.lock:
+            for cached_key in [cached_key for cached_key in self.entries if cached_key[0] == key[0]]:
+                self.size -= len(self.entries.pop(cached_key))
+
+            self.entries[key] = decoded_audio
+            self.size += len(decoded_audio)
+
+            while self.size > self.capacity:
+                self.size -= len(self.entries.popitem(last=False)[1])
+
+
+# The decoded audio of the recently played media files (the budget is specified in MB by the configuration file)
+decoded_audio_cache = DecodedAudioCache(config_var.getint('PLAYBACK', 'cache_size', fallback=256) * 1024 * 1024)
+
+
+class StreamingPlayback:  # Playback of a media file, decoded by ffmpeg while it is being played
+    def __init__(self, full_path, sink, start_position=0, on_finished=None, buffer_size=PLAYBACK_BUFFER_SIZE,
+                 gain=0.0):
+        """
+            Initialization method of the class.
+
+            :param full_path: The full path of the media file.
+            :param sink: The audio output the media file is played on (owned by the playback engine). It can be set
+                         later on, before the playback is started.
+            :param start_position: The position (in seconds) the playback starts from.
+            :param on_finished: The function called by the output thread (with the playback as argument) once the
+                                playback has ended or has been stopped.
+            :param buffer_size: The size (in bytes) of the ring buffer, which is the amount of audio decoded ahead of
+                                the playback.
+            :param gain: The gain (in dB) applied by ffmpeg while decoding the media file (see "get_playback_gain").
+            :return: None
+        """
+
+        self.full_path = full_path
+        self.sink = sink
+        self.start_position = start_position
+        self.on_finished = on_finished
+        self.gain = gain
+        self.ring_buffer = PCMRingBuffer(buffer_size)
+        self.cache_key = None  # The key of the decoded audio of the media file in the decoded audio cache
+        self.cached_audio = None  # The decoded audio of the media file, if it was found in the cache
+        self.decoder = None
+        self.decoding = False  # Specifies whether the decoding has been started
+        self.played_size = 0  # The size (in bytes) of the decoded audio passed to the audio output
+        self.resumed = threading.Event()  # Cleared while the playback is paused
+        self.resumed.set()
+        self.decoder_thread = threading.Thread(target=self.decode, daemon=True)
+        self.output_thread = threading.Thread(target=self.output, daemon=True)
+
+    def start(self):
+        """
+            Starts decoding and playing the media file. The audio starts playing as soon as the first block has been
+            decoded, while ffmpeg keeps decoding the file ahead of the playback (up to the size of the ring buffer).
+
+            :return: None
+            :raises FileNotFoundError: ffmpeg could not be found.
+        """
+
+        self.prefetch()
+        self.output_thread.start()
+
+    def prefetch(self):
+        """
+            Starts decoding the media file without playing it: the ring buffer is filled with the beginning of the
+            file, which is ready to be played as soon as the playback is started. Recently played media files are
+            played from the decoded audio cache instead, without running ffmpeg.
+
+            :return: None
+            :raises FileNotFoundError: ffmpeg could not be found.
+        """
+
+        if self.decoding:  # The media file has already been prefetched
+            return
+
+        try:
+            self.cache_key = (self.full_path, os.stat(self.full_path).st_mtime_ns, self.gain)
+            self.cached_audio = decoded_audio_cache.get(self.cache_key)
+
+        except OSError:  # The media file does not exist; ffmpeg will report the error
+            pass
+
+        if self.cached_audio is None:
+            # The loudness gain (if any) is applied by ffmpeg while decoding, so playing is not slowed down by it
+            volume_filter = ["-af", "volume=" + str(self.gain) + "dB"] if self.gain else []
+
+            self.decoder = subprocess.Popen([AudioSegment.converter, "-v", "quiet", "-ss", str(self.start_position),
+                                             "-i", self.full_path, "-vn"] + volume_filter +
+                                            ["-f", "s16le", "-acodec", "pcm_s16le", "-ac", str(PLAYBACK_CHANNELS),
+                                             "-ar", str(PLAYBACK_SAMPLE_RATE), "-"],
+                                            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                            stderr=subprocess.DEVNULL)
+
+        self.decoding = True
+        self.decoder_thread.start()
+
+    def decode(self):
+        """
+            Decoder thread: copies the audio decoded by ffmpeg to the ring buffer, in blocks containing whole frames.
+            Once the whole file has been decoded, its audio is stored in the decoded audio cache (unless it exceeds the
+            capacity of the cache).
+
+            :return: None
+        """
+
+        frame_size = PLAYBACK_CHANNELS * PLAYBACK_SAMPLE_WIDTH
+
+        if self.cached_audio is not None:  # The media file is played from the decoded audio cache
+            cached_view = memoryview(self.cached_audio)
+
+            start_offset = int(self.start_position * PLAYBACK_SAMPLE_RATE) * frame_size
+
+            for offset in range(start_offset, len(cached_view), PLAYBACK_CHUNK_SIZE):
+                if not self.ring_buffer.write(cached_view[offset:offset + PLAYBACK_CHUNK_SIZE]):
+                    break
+
+            self.ring_buffer.close()
+            return
+
+        remainder = b""  # The beginning of an incomplete frame, completed by the next block
+
+        # The decoded audio, kept for the cache as long as it fits in it (only whole media files are cached)
+        decoded_blocks = [] if not self.start_position else None
+        decoded_size = 0
+        completed = False  # Specifies whether the whole file has been decoded
+
+        while True:
+            block = self.decoder.stdout.read1(PLAYBACK_CHUNK_SIZE)
+
+            if not block:  # The whole file has been decoded
+                completed = True
+                break
+
+            block = remainder + block
+            length = len(block) - len(block) % frame_size
+            remainder = block[length:]
+
+            if decoded_blocks is not None:
+                decoded_size += length
+
+                if decoded_size <= decoded_audio_cache.capacity:
+                    decoded_blocks.append(block[:length])
+                else:  # The media file is too long to be cached
+                    decoded_blocks = None
+
+            if not self.ring_buffer.write(block[:length]):  # The playback has been stopped
+                break
+
+        self.ring_buffer.close()
+
+        self.decoder.stdout.close()
+        self.decoder.wait()
+
+        if completed and decoded_blocks is not None and self.decoder.returncode == 0 and self.cache_key is not None:
+            decoded_audio_cache.put(self.cache_key, b"".join(decoded_blocks))
+
+    def output(self):
+        """
+            Output thread: plays the audio stored in the ring buffer until the whole file has been played or the
+            playback is stopped.
+
+            :return: None
+        """
+
+        try:
+            while True:
+                self.resumed.wait()  # Waiting while the playback is paused
+
+                block = self.ring_buffer.read(PLAYBACK_CHUNK_SIZE)
+
+                if not block:
+                    break
+
+                self.sink.write(block)
+                self.played_size += len(block)
+
+        except (OSError, ValueError):  # The audio output has been closed
+            pass
+
+        finally:
+            self.ring_buffer.abort()  # Stopping the decoder if the audio output failed
+
+            if self.on_finished is not None:
+                self.on_finished(self)
+
+    def pause(self):
+        """
+            Pauses the playback once the block being played ends.
+
+            :return: None
+        """
+
+        self.resumed.clear()
+
+    def resume(self):
+        """
+            Resumes the paused playback.
+
+            :return: None
+        """
+
+        self.resumed.set()
+
+    def get_position(self):
+        """
+            Gets the position of the playback.
+
+            :return: The position (in seconds) of the audio passed to the audio output.
+        """
+
+        return self.start_position + self.played_size / (PLAYBACK_SAMPLE_RATE * PLAYBACK_CHANNELS *
+                                                         PLAYBACK_SAMPLE_WIDTH)
+
+    def stop(self):
+        """
+            Stops the playback, discarding the audio that has not been played yet.
+
+            :return: None
+        """
+
+        self.ring_buffer.abort()
+        self.resumed.set()
+
+        if self.decoder is not None and self.decoder.poll() is None:
+            self.decoder.kill()
+
+    def wait(self):
+        """
+            Waits for the playback to end.
+
+            :return: None
+        """
+
+        self.output_thread.join()
+
+
+class PlaybackEngine:  # The single playback worker of the application, driven by commands sent over a queue
+    def __init__(self):
+        """
+            Initialization method of the class. The worker thread is started by the first command.
+
+            :return: None
+        """
+
+        self.commands = queue.Queue()  # The (command, argument) tuples waiting to be processed by the worker thread
+        self.play_queue = deque()  # The full paths of the media files to be played after the current one
+        self.playback = None  # The current playback (None if no media file is playing)
+        self.prefetched_playback = None  # The playback of the next media file of the queue, decoded in advance
+        self.sink = None  # The audio output, opened while media files are playing
+        self.idle = threading.Event()  # Set while no media file is playing or waiting to be played
+        self.idle.set()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.worker_connection = None  # The connection to the database used by the worker thread (opened on start)
+
+    def submit(self, command, argument=None):
+        """
+            Sends a command to the worker thread.
+
+            :param command: The command ("play", "play_list", "enqueue", "stop", "pause", "seek" or "next").
+            :param argument: The full path of the media file ("play" and "enqueue"), the list of full paths of the
+                             media files to be played in sequence ("play_list") or the position to be played, in
+                             seconds ("seek").
+            :return: None
+        """
+
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+            if command in ("play", "play_list", "enqueue"):
+                self.idle.clear()
+
+            self.commands.put((command, argument))
+
+    def wait(self):
+        """
+            Waits until every media file has been played (or the playback has been stopped).
+
+            :return: None
+        """
+
+        while not self.idle.wait(0.1):  # Waiting in short intervals keeps the wait interruptible
+            pass
+
+    def run(self):
+        """
+            Worker thread: processes the commands one at a time. Since a single media file is played at any time, the
+            number of decoders and threads used by the playback is bounded, no matter how many commands are sent.
+
+            :return: None
+        """
+
+        # SQLite connections cannot be shared between threads; the worker uses a connection of its own
+        self.worker_connection = sqlite3.connect('Resources/media.db', timeout=30)
+
+        while True:
+            command, argument = self.commands.get()
+
+            try:
+                if command == "play":  # Playing a media file immediately, discarding the play queue
+                    self.play_queue.clear()
+                    self.start_track(argument)
+
+                elif command == "play_list" and argument:  # Playing a list of media files in sequence
+                    self.play_queue = deque(argument[1:])
+                    self.start_track(argument[0])
+
+                elif command == "enqueue":  # Playing a media file once the previous ones have been played
+                    if self.playback is None:
+                        self.start_track(argument)
+                    else:
+                        self.play_queue.append(argument)
+
+                elif command == "stop":
+                    self.play_queue.clear()
+                    self.stop_track()
+
+                elif command == "pause" and self.playback is not None:  # Pausing or resuming the playback
+                    if self.playback.resumed.is_set():
+                        self.playback.pause()
+                    else:
+                        self.playback.resume()
+
+                elif command == "seek" and self.playback is not None:  # Playing the media file from another position
+                    self.start_track(self.playback.full_path, max(argument, 0))
+
+                elif command == "next" or (command == "finished" and argument is self.playback):
+                    if command == "next":
+                        self.stop_track()
+                    else:  # The whole media file has been played; the audio output is kept for the next one
+                        self.playback = None
+
+                    if self.play_queue:
+                        self.start_track(self.play_queue.popleft())
+
+            except (OSError, ValueError) as error:  # The media file could not be played
+                self.stop_track()
+
+                if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                    print("\nError: Unable to play media file (" + str(error) + ").")
+
+            try:
+                self.update_prefetch()
+
+            except (OSError, ValueError) as error:  # The next media file could not be decoded
+                self.prefetched_playback = None
+
+                if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                    print("\nError: Unable to decode the next media file (" + str(error) + ").")
+
+            with self.lock:
+                if self.playback is None and not self.play_queue:
+                    if self.sink is not None:  # Releasing the audio output until the next media file is played
+                        self.sink.close()
+                        self.sink = None
+
+                    if self.commands.empty():
+                        self.idle.set()
+
+    def start_track(self, full_path, start_position=0):
+        """
+            Stops the current playback, then starts playing the specified media file on the audio output of the
+            engine.
+
+            :param full_path: The full path of the media file.
+            :param start_position: The position (in seconds) the playback starts from.
+            :return: None
+        """
+
+        self.stop_track()
+
+        if self.sink is None:
+            self.sink = PyAudioSink() if pyaudio is not None else FFplaySink()
+
+        if not start_position and self.prefetched_playback is not None and \
+                self.prefetched_playback.full_path == full_path:  # The beginning of the file is already decoded
+            playback = self.prefetched_playback
+            self.prefetched_playback = None
+        else:
+            playback = StreamingPlayback(full_path, None, start_position, self.post_finished,
+                                         gain=self.get_gain(full_path))
+
+        playback.sink = self.sink
+        playback.start()
+
+        self.playback = playback
+
+    def get_gain(self, full_path):
+        """
+            Gets the gain (in dB) the specified media file is played with (see "get_playback_gain").
+
+            :param full_path: The full path of the media file.
+            :return: The gain, or 0 if it could not be read from the database.
+        """
+
+        try:
+            return get_playback_gain(full_path, self.worker_connection)
+
+        except Error:  # Database is locked; the media file is played as it is
+            return 0.0
+
+    def post_finished(self, playback):
+        """
+            Notifies the worker thread that a playback has ended (called by the output thread of the playback).
+
+            :param playback: The playback that has ended.
+            :return: None
+        """
+
+        self.commands.put(("finished", playback))
+
+    def update_prefetch(self):
+        """
+            Starts decoding the next media file of the play queue while the current one is playing, so that it can be
+            played right after it, without a gap. Only the beginning of the file is decoded in advance; its size is
+            capped by the "prefetch_size" option of the configuration file (in MB).
+
+            :return: None
+        """
+
+        next_path = self.play_queue[0] if self.playback is not None and self.play_queue else None
+
+        if self.prefetched_playback is not None and self.prefetched_playback.full_path != next_path:
+            self.prefetched_playback.stop()  # The queue has changed since the media file was prefetched
+            self.prefetched_playback = None
+
+        if next_path is not None and self.prefetched_playback is None:
+            prefetch_size = config_var.getint('PLAYBACK', 'prefetch_size', fallback=8) * 1024 * 1024
+
+            self.prefetched_playback = StreamingPlayback(next_path, None, 0, self.post_finished,
+                                                         max(prefetch_size, PLAYBACK_BUFFER_SIZE),
+                                                         self.get_gain(next_path))
+            self.prefetched_playback.prefetch()
+
+    def stop_track(self):
+        """
+            Stops the current playback (if any), waiting for its output thread to release the audio output.
+
+            :return: None
+        """
+
+        if self.playback is None:
+            return
+
+        self.playback.stop()
+
+        if not self.sink.stop():  # The audio output had to be closed in order to stop the playback immediately
+            self.sink = None
+
+        self.playback.wait()
+        self.playback = None
+
+
+# The playback engine shared by the GUI and the CLI
+playback_engine = PlaybackEngine()
+
+
+def find_playback_tools():
+    """
+        Checks whether the programs required for playing media files can be found.
+
+        :return: True if ffmpeg (and ffplay, if PyAudio is not installed) can be found, False otherwise.
+    """
+
+    return shutil.which(AudioSegment.converter) is not None and (pyaudio is not None or
+                                                                 shutil.which(get_player_name()) is not None)
+
+
+def play_media(media, allow_multiprocessing, gui_instance=None, enqueue=False):
+    """
+        Plays the media file specified as parameter, using the playback engine.
+
+        :param media: The media file to be played.
+        :param allow_multiprocessing: Checks whether application can spawn a new thread to play music in background.
+        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
+                             means the method will process some GUI-related elements such as widgets or windows.
+        :param enqueue: Specifies whether the media file is added to the play queue instead of being played
+                        immediately.
+        :return: None
+    """
+
+    # CLI-only method: The user has attempted to play the media file based on its ID in the database
+    if media.isnumeric():
+        full_path = get_media_path_by_position(media)
+
+        if full_path is None:  # The system couldn't find the specified ID
+            print("\nError: The specified ID does not exist in the database.")
+            return
+
+    else:  # The method is fired by the GUI or the user has attempted to play the media file by using its name
+        full_path = resolve_media_path(media)
+
+        if not path.exists(full_path):  # (CLI-only) The user has provided an invalid filename
+            print("\nError: The specified media file does not exist.")
+            return
+
+    # Attempting to play the media file. It is decoded by ffmpeg while it is being played, so the playback starts
+    # immediately and only a few seconds of decoded audio are held in memory.
+    if full_path.endswith((".mp3", ".wav")):
+        if not find_playback_tools():  # Could not play the media file
+            if gui_instance is not None:  # Application is running in GUI-mode
+                messagebox.showerror("Unable to play file", "Unable to play media file. Please make sure that you have "
+                                     "ffmpeg installed (https://ffmpeg.org/) and that the files \"ffmpeg.exe\", "
+                                     "\"ffplay.exe\" and \"ffprobe.exe\" are also copied in the current folder of the "
+                                     "application.")
+
+            # Application is running in CLI or debugging mode
+            if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+                print("\nError: Unable to play media file. Please make sure that you have ffmpeg installed "
+                      "(https://ffmpeg.org/) and that the files \"ffmpeg.exe\", \"ffplay.exe\" and \"ffprobe.exe\" are "
+                      "also copied in the current folder of the application.")
+
+            return
+
+        playback_engine.submit("enqueue" if enqueue else "play", full_path)
+
+        if not allow_multiprocessing:  # The application runs in only one iteration; waiting for the playback to end
+            try:
+                playback_engine.wait()
+
+            except KeyboardInterrupt:  # The user has stopped the playback
+                playback_engine.submit("stop")
+                playback_engine.wait()
+
+    if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+        print("\nThe media file is playing.")
+
+
+def play_media_list(full_paths, allow_multiprocessing, gui_instance=None):
+    """
+        Plays the specified media files in sequence, using the play queue of the playback engine. Every media file is
+        decoded in advance while the previous one is playing, so the media files are played without gaps.
+
+        :param full_paths: The full paths of the media files to be played.
+        :param allow_multiprocessing: Checks whether application can play the media files in background.
+        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
+                             means the method will process some GUI-related elements such as widgets or windows.
+        :return: None
+    """
+
+    full_paths = [full_path for full_path in full_paths if full_path.endswith((".mp3", ".wav"))]
+
+    if not full_paths:
+        if gui_instance is None:  # The method has been fired by using CLI
+            print("\nNo media files to be played.")
+
+        return
+
+    if not find_playback_tools():  # Could not play the media files
+        if gui_instance is not None:  # Application is running in GUI-mode
+            messagebox.showerror("Unable to play file", "Unable to play media file. Please make sure that you have "
+                                 "ffmpeg installed (https://ffmpeg.org/) and that the files \"ffmpeg.exe\", "
+                                 "\"ffplay.exe\" and \"ffprobe.exe\" are also copied in the current folder of the "
+                                 "application.")
+
+        # Application is running in CLI or debugging mode
+        if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+            print("\nError: Unable to play media file. Please make sure that you have ffmpeg installed "
+                  "(https://ffmpeg.org/) and that the files \"ffmpeg.exe\", \"ffplay.exe\" and \"ffprobe.exe\" are "
+                  "also copied in the current folder of the application.")
+
+        return
+
+    playback_engine.submit("play_list", full_paths)
+
+    if gui_instance is None:  # The method has been fired by using CLI
+        print("\nPlaying " + str(len(full_paths)) + " media files.")
+
+    if not allow_multiprocessing:  # The application runs in only one iteration; waiting for the playback to end
+        try:
+            playback_engine.wait()
+
+        except KeyboardInterrupt:  # The user has stopped the playback
+            playback_engine.submit("stop")
+            playback_engine.wait()
+
+
+def compute_waveform_peaks(full_path):
+    """
+        Computes the waveform of a media file. The file is decoded once by ffmpeg, and every block of samples is reduced
+        to its minimum and maximum while the file is being decoded, so only the reduced blocks are held in memory. Once
+        the whole file has been decoded, the blocks are reduced to WAVEFORM_BUCKETS (minimum, maximum) pairs.
+
+        :param full_path: The full path of the media file.
+
+        :return: The waveform, as interleaved (minimum, maximum) pairs of signed bytes (empty if the media file could
+                 not be decoded).
+        :raises FileNotFoundError: ffmpeg could not be found.
+    """
+
+    decoder = subprocess.Popen([AudioSegment.converter, "-v", "quiet", "-i", full_path, "-vn", "-f", "s16le",
+                                "-acodec", "pcm_s16le", "-ac", "1", "-ar", str(WAVEFORM_SAMPLE_RATE), "-"],
+                               stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    block_minimums = []
+    block_maximums = []
+
+    with decoder.stdout:
+        while True:
+            chunk = decoder.stdout.read(WAVEFORM_CHUNK_SIZE)
+
+            if len(chunk) < 2:  # The whole file has been decoded
+                break
+
+            samples = numpy.frombuffer(chunk, dtype="<i2", count=len(chunk) // 2)
+            length = len(samples) - len(samples) % WAVEFORM_BLOCK_SIZE
+
+            blocks = samples[:length].reshape(-1, WAVEFORM_BLOCK_SIZE)
+            block_minimums.append(blocks.min(axis=1))
+            block_maximums.append(blocks.max(axis=1))
+
+            if length < len(samples):  # Only the last chunk can end with an incomplete block, reduced on its own
+                block_minimums.append(samples[length:].min(keepdims=True))
+                block_maximums.append(samples[length:].max(keepdims=True))
+
+    decoder.wait()
+
+    if not block_minimums:  # The media file could not be decoded
+        return b""
+
+    minimums = numpy.concatenate(block_minimums)
+    maximums = numpy.concatenate(block_maximums)
+
+    # The index of the first block of every bucket; the blocks of short files are repeated over several buckets
+    bounds = numpy.arange(WAVEFORM_BUCKETS) * len(minimums) // WAVEFORM_BUCKETS
+
+    peaks = numpy.empty((WAVEFORM_BUCKETS, 2), dtype=numpy.int8)
+    peaks[:, 0] = numpy.minimum.reduceat(minimums, bounds) >> 8
+    peaks[:, 1] = numpy.maximum.reduceat(maximums, bounds) >> 8
+
+    return peaks.tobytes()
+
+
+def get_waveform_peaks(full_path, database_connection=None):
+    """
+        Gets the stored waveform of a media file.
+
+        :param full_path: The full path of the media file.
+        :param database_connection: Optional connection to be used instead of the global one (eg. by other threads).
+
+        :return: The waveform (see "compute_waveform_peaks"), or None if it has not been computed yet.
+    """
+
+    cursor = (database_connection or connection).cursor()
+    cursor.execute("SELECT waveforms.peaks FROM media JOIN waveforms ON waveforms.content_hash = media.content_hash "
+                   "WHERE media.full_path = ?", (full_path,))
+
+    entry = cursor.fetchone()
+
+    cursor.close()
+
+    return entry[0] if entry is not None else None
+
+
+def draw_waveform(canvas, peaks, width, height):
+    """
+        Draws a waveform on a canvas, replacing the waveform previously drawn on it. The waveform is drawn as a single
+        polygon, no matter how many buckets it contains.
+
+        :param canvas: The canvas.
+        :param peaks: The waveform (see "compute_waveform_peaks"), or None if it has not been computed yet.
+        :param width: The width (in pixels) of the waveform.
+        :param height: The height (in pixels) of the waveform.
+
+        :return: None
+    """
+
+    canvas.delete("waveform")
+
+    if not peaks:  # The waveform has not been computed yet, or the media file could not be decoded
+        return
+
+    values = memoryview(peaks).cast("b")  # Reading the bytes as signed values
+    bucket_count = len(values) // 2
+
+    middle = height / 2
+    scale = (height / 2 - 1) / 128
+    step = (width - 1) / max(bucket_count - 1, 1)
+
+    # The outline follows the maximums from left to right, then the minimums from right to left
+    points = []
+
+    for index in range(bucket_count):
+        points.extend((index * step, middle - values[2 * index + 1] * scale))
+
+    for index in reversed(range(bucket_count)):
+        points.extend((index * step, middle - values[2 * index] * scale))
+
+    canvas.create_polygon(points, fill=WAVEFORM_COLOR, outline=WAVEFORM_COLOR, tags="waveform")
+
+
+class WaveformAnalyzer:  # Background thread computing the waveforms of the media files of the media folder
+    def __init__(self, on_progress=None):
+        """
+            Initialization method of the class. The worker thread is started immediately, although the media folder is
+            only analyzed when requested.
+
+            :param on_progress: The function called by the worker thread (with the full path of the media file as
+                                argument) every time a waveform has been stored.
+            :return: None
+        """
+
+        self.on_progress = on_progress
+        self.requests = queue.Queue()  # The analysis requests; None stops the worker thread
+        self.stopped = threading.Event()
+        self.analyzed_hashes = set()  # The content hashes of the media files whose waveform is stored
+
+        self.thread = threading.Thread(target=self.run, name="WaveformAnalyzer", daemon=True)
+        self.thread.start()
+
+    def request(self):
+        """
+            Requests an analysis of the media folder. Requests received while an analysis is running are coalesced
+            into a single analysis.
+
+            :return: None
+        """
+
+        self.requests.put(True)
+
+    def stop(self):
+        """
+            Stops the worker thread; the media file being analyzed (if any) is completed first.
+
+            :return: None
+        """
+
+        self.stopped.set()
+        self.requests.put(None)
+
+    def run(self):
+        """
+            The body of the worker thread.
+
+            :return: None
+        """
+
+        # SQLite connections cannot be shared between threads; the worker uses a connection of its own
+        worker_connection = sqlite3.connect('Resources/media.db', timeout=30)
+
+        while not self.stopped.is_set():
+            request = self.requests.get()
+
+            while request is not None and not self.requests.empty():  # Coalescing the pending requests
+                request = self.requests.get_nowait()
+
+            if request is None:
+                break
+
+            try:
+                self.analyze(worker_connection)
+
+            except FileNotFoundError:  # ffmpeg could not be found
+                if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                    print("\nError: Unable to compute waveforms. Please make sure that you have ffmpeg installed "
+                          "(https://ffmpeg.org/).")
+
+            except Error as e:  # Database is locked; the remaining waveforms are computed by the next analysis
+                worker_connection.rollback()
+
+                if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                    print("\nError: Unable to store waveforms.")
+                    print(e)
+
+        worker_connection.close()
+
+    def analyze(self, worker_connection):
+        """
+            Computes the waveforms of the media files of the media folder that do not have one yet, or that changed
+            since their waveform was computed. Every media file is decoded once; since waveforms are identified by the
+            content hash of the media files, identical media files share a single waveform. Waveforms whose media files
+            no longer exist are removed.
+
+            :param worker_connection: The connection to the database owned by the worker thread.
+            :return: None
+        """
+
+        cursor = worker_connection.cursor()
+
+        cursor.execute("SELECT id, full_path, file_size, file_mtime, content_hash FROM media")
+        media_entries = [entry for entry in cursor.fetchall() if is_in_media_folder(entry[1])]
+
+        cursor.execute("SELECT content_hash FROM waveforms")
+        self.analyzed_hashes = {entry[0] for entry in cursor}
+
+        pending_entries = []  # The media files to be analyzed, along with their signature and their valid content hash
+
+        for media_id, full_path, file_size, file_mtime, content_hash in media_entries:
+            signature = get_file_signature(full_path)
+
+            if signature is None:  # The media file no longer exists
+                continue
+
+            if (file_size, file_mtime) != signature:  # The stored content hash (if any) is out of date
+                content_hash = None
+
+            elif content_hash in self.analyzed_hashes:  # The waveform of the media file is up to date
+                continue
+
+            pending_entries.append((media_id, full_path, signature, content_hash))
+
+        worker_count = config_var.getint('WAVEFORM', 'workers', fallback=2)
+
+        # ffmpeg runs in processes of its own and NumPy releases the GIL, so several media files are analyzed at once
+        with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
+            for (media_id, full_path, signature, content_hash), result in zip(
+                    pending_entries, executor.map(self.analyze_file, pending_entries)):
+                if result is None:  # The media file could not be read, or the analyzer has been stopped
+                    continue
+
+                if result[0] != content_hash:  # Storing the content hash computed by the analysis
+                    cursor.execute("UPDATE media SET file_size = ?, file_mtime = ?, content_hash = ? WHERE id = ?",
+                                   (signature[0], signature[1], result[0], media_id))
+
+                if result[1] is not None:
+                    cursor.execute("INSERT OR REPLACE INTO waveforms (content_hash, peaks) VALUES (?, ?)", result)
+                    self.analyzed_hashes.add(result[0])
+
+                worker_connection.commit()
+
+                if self.on_progress is not None:
+                    self.on_progress(full_path)
+
+        if not self.stopped.is_set():  # Removing the waveforms of the media files that no longer exist
+            cursor.execute("DELETE FROM waveforms WHERE content_hash NOT IN "
+                           "(SELECT content_hash FROM media WHERE content_hash IS NOT NULL)")
+            worker_connection.commit()
+
+        cursor.close()
+
+        if config_var['RUN-MODE']['run_mode'] == "2" and pending_entries:  # Debugging mode
+            print("\nWaveforms updated: " + str(len(pending_entries)) + " media files analyzed.")
+
+    def analyze_file(self, entry):
+        """
+            Computes the content hash (if unknown) and the waveform (if not stored yet) of a media file. This method
+            runs in the worker threads of the analysis.
+
+            :param entry: A tuple containing the ID, the full path, the signature and the content hash of the media
+                          file.
+
+            :return: A tuple containing the content hash and the waveform of the media file (None if the waveform of an
+                     identical media file is already stored), or None if the media file could not be read.
+            :raises FileNotFoundError: ffmpeg could not be found.
+        """
+
+        if self.stopped.is_set():
+            return None
+
+        full_path, content_hash = entry[1], entry[3]
+
+        if content_hash is None:
+            content_hash = hash_file(full_path)
+
+            if content_hash is None:  # The media file was removed or cannot be read
+                return None
+
+        if content_hash in self.analyzed_hashes:  # An identical media file has already been analyzed
+            return content_hash, None
+
+        return content_hash, compute_waveform_peaks(full_path)
+
+
+def get_k_weighting_response():
+    """
+        Computes the impulse response of the K-weighting filter of ITU-R BS.1770 (a high-shelf filter followed by a
+        high-pass filter) at 48 kHz. The response is computed once per analysis; the audio itself is filtered using the
+        FFT, which is vectorized.
+
+        :return: The first LOUDNESS_FILTER_LENGTH samples of the impulse response, as a NumPy array.
+    """
+
+    response = [1.0] + [0.0] * (LOUDNESS_FILTER_LENGTH - 1)
+
+    for (b0, b1, b2), (a1, a2) in K_WEIGHTING_STAGES:
+        x1 = x2 = y1 = y2 = 0.0
+        filtered = []
+
+        for x in response:
+            y = b0 * x + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+            x1, x2, y1, y2 = x, x1, y, y1
+            filtered.append(y)
+
+        response = filtered
+
+    return numpy.array(response)
+
+
+def measure_loudness(full_path):
+    """
+        Measures the integrated loudness (ITU-R BS.1770) and the sample peak of a media file. The file is decoded by
+        ffmpeg and processed in chunks of a few seconds: every chunk is K-weighted using the FFT (the end of the
+        response of the filter is carried over to the next chunk), then reduced to the mean square of every 100 ms step.
+        Only the steps are kept in memory; the gated 400 ms blocks are derived from them once the file has been decoded.
+
+        :param full_path: The full path of the media file.
+
+        :return: A tuple containing the integrated loudness (in LUFS) and the sample peak (1.0 being full scale). The
+                 loudness is None if the media file is silent or too short to be measured; both values are None if
+                 the media file could not be decoded.
+        :raises FileNotFoundError: ffmpeg could not be found.
+    """
+
+    decoder = subprocess.Popen([AudioSegment.converter, "-v", "quiet", "-i", full_path, "-vn", "-f", "f32le",
+                                "-acodec", "pcm_f32le", "-ac", str(LOUDNESS_CHANNELS), "-ar",
+                                str(LOUDNESS_SAMPLE_RATE), "-"],
+                               stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    frame_size = LOUDNESS_CHANNELS * 4
+    fft_size = 1 << (LOUDNESS_CHUNK_FRAMES + LOUDNESS_FILTER_LENGTH - 2).bit_length()
+
+    filter_spectrum = numpy.fft.rfft(get_k_weighting_response(), fft_size)[:, None]
+    tail = numpy.zeros((LOUDNESS_FILTER_LENGTH - 1, LOUDNESS_CHANNELS))  # The response carried over to the next chunk
+
+    step_powers = []  # The mean square of every channel over every 100 ms step
+    peak = None
+
+    with decoder.stdout:
+        while True:
+            chunk = decoder.stdout.read(LOUDNESS_CHUNK_FRAMES * frame_size)
+            frame_count = len(chunk) // frame_size
+
+            if not frame_count:  # The whole file has been decoded
+                break
+
+            samples = numpy.frombuffer(chunk, dtype="<f4", count=frame_count * LOUDNESS_CHANNELS)
+            samples = samples.reshape(-1, LOUDNESS_CHANNELS).astype(numpy.float64)
+
+            peak = max(peak or 0.0, float(numpy.abs(samples).max()))
+
+            filtered = numpy.fft.irfft(numpy.fft.rfft(samples, fft_size, axis=0) * filter_spectrum, fft_size,
+                                       axis=0)[:frame_count + LOUDNESS_FILTER_LENGTH - 1]
+            filtered[:LOUDNESS_FILTER_LENGTH - 1] += tail
+            tail = filtered[frame_count:].copy()
+
+            # An incomplete step can only occur at the end of the file; it is not measured
+            step_count = frame_count // LOUDNESS_STEP_SIZE
+
+            step_powers.append(numpy.square(filtered[:step_count * LOUDNESS_STEP_SIZE]).reshape(
+                step_count, LOUDNESS_STEP_SIZE, LOUDNESS_CHANNELS).mean(axis=1))
+
+    decoder.wait()
+
+    if peak is None:  # The media file could not be decoded
+        return None, None
+
+    steps = numpy.concatenate(step_powers)
+
+    if len(steps) < 4:  # The media file is shorter than a single block
+        return None, peak
+
+    # The mean square of every 400 ms block (4 consecutive steps), summed over the channels
+    block_powers = (steps[:-3] + steps[1:-2] + steps[2:-1] + steps[3:]).sum(axis=1) / 4
+    block_loudness = -0.691 + 10 * numpy.log10(numpy.maximum(block_powers, 1e-20))
+
+    # The absolute gate discards the silent blocks
+    gated = block_loudness > LOUDNESS_ABSOLUTE_GATE
+
+    if not gated.any():  # The media file is silent
+        return None, peak
+
+    # The relative gate discards the blocks more than 10 LU quieter than the loudness of the remaining blocks
+    relative_gate = -0.691 + 10 * numpy.log10(block_powers[gated].mean()) + LOUDNESS_RELATIVE_GATE
+    gated &= block_loudness > relative_gate
+
+    return float(-0.691 + 10 * numpy.log10(block_powers[gated].mean())), peak
+
+
+def analyze_media_loudness(full_path, known_signature=None):
+    """
+        Measures the loudness of a media file, unless the file did not change since its loudness was last measured.
+        This method runs in the worker processes of the loudness analysis.
+
+        :param full_path: The full path of the media file.
+        :param known_signature: The size and modification time of the file when its loudness was last measured.
+
+        :return: A tuple containing the signature of the file (see "get_file_signature"), its loudness and its peak
+                 (see "measure_loudness"), or None if the file is missing or did not change.
+        :raises FileNotFoundError: ffmpeg could not be found.
+    """
+
+    signature = get_file_signature(full_path)
+
+    if signature is None or signature == known_signature:
+        return None
+
+    return (signature,) + measure_loudness(full_path)
+
+
+def update_loudness(full_paths=None, on_progress=None, database_connection=None):
+    """
+        Measures the loudness of the specified media files and stores it in the database, along with their peak. The
+        media files are spread over a pool of worker processes, each of them decoding a single media file at a time;
+        files that did not change since their loudness was last measured are skipped.
+
+        :param full_paths: The full paths of the media files (by default, every media file of the media folder).
+        :param on_progress: Optional function called after every media file, with the number of media files processed
+                            and the total number of media files as arguments.
+        :param database_connection: Optional connection to be used instead of the global one (eg. by other threads).
+
+        :return: The number of media files whose loudness has been measured, or None if the analysis failed (the error
+                 has already been displayed).
+    """
+
+    if numpy is None:
+        if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+            print("\nError: NumPy is required for analyzing the loudness of media files (pip install numpy).")
+
+        return None
+
+    database_connection = database_connection or connection
+    cursor = database_connection.cursor()
+
+    sql_command = "SELECT id, full_path, loudness_size, loudness_mtime FROM media"
+
+    if full_paths is None:
+        cursor.execute(sql_command)
+        media_entries = [entry for entry in cursor.fetchall() if is_in_media_folder(entry[1])]
+
+    else:
+        media_entries = []
+
+        # The media items are looked up in batches, keeping the number of parameters of every query within SQLite's
+        # limits
+        for index in range(0, len(full_paths), 500):
+            cursor.execute(sql_command + " WHERE full_path IN (" + ", ".join("?" * len(full_paths[index:index + 500]))
+                           + ")", full_paths[index:index + 500])
+            media_entries.extend(cursor.fetchall())
+
+    arguments = ([entry[1] for entry in media_entries], [tuple(entry[2:4]) for entry in media_entries])
+
+    worker_count = config_var.getint('LOUDNESS', 'workers', fallback=4)
+    executor = None
+    analyzed_count = 0
+
+    try:
+        try:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=worker_count)
+            results = executor.map(analyze_media_loudness, *arguments)
+
+        except (OSError, RuntimeError):  # Worker processes cannot be started on this system
+            results = map(analyze_media_loudness, *arguments)
+
+        for processed_count, (entry, result) in enumerate(zip(media_entries, results), 1):
+            if result is not None:  # Storing the measurements as soon as they are available
+                (file_size, file_mtime), loudness, peak = result
+
+                cursor.execute("UPDATE media SET loudness = ?, peak = ?, loudness_size = ?, loudness_mtime = ? " +
+                               "WHERE id = ?", (loudness, peak, file_size, file_mtime, entry[0]))
+                database_connection.commit()
+
+                analyzed_count += 1
+
+            if on_progress is not None:
+                on_progress(processed_count, len(media_entries))
+
+    except FileNotFoundError:  # ffmpeg could not be found
+        if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+            print("\nError: Unable to analyze media files. Please make sure that you have ffmpeg installed "
+                  "(https://ffmpeg.org/).")
+
+        return None
+
+    except Error:  # Database is locked
+        database_connection.rollback()
+
+        if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+            print("\nError when trying to commit changes to database. Make sure another application is not "
+                  "using the database.")
+
+        return None
+
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+        cursor.close()
+
+    if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+        print("\nLoudness analysis: " + str(len(media_entries)) + " media files examined, " + str(analyzed_count) +
+              " media files analyzed.")
+
+    return analyzed_count
+
+
+def start_loudness_analysis(full_paths=None, on_finished=None):
+    """
+        Runs the loudness analysis (see "update_loudness") in the background.
+
+        :param full_paths: The full paths of the media files (by default, every media file of the media folder).
+        :param on_finished: Optional function called by the background thread once the analysis has ended, with the
+                            result of "update_loudness" as argument.
+
+        :return: The background thread.
+    """
+
+    def run_analysis():
+        # SQLite connections cannot be shared between threads; the analysis uses a connection of its own
+        worker_connection = sqlite3.connect('Resources/media.db', timeout=30)
+
+        try:
+            result = update_loudness(full_paths, database_connection=worker_connection)
+        finally:
+            worker_connection.close()
+
+        if on_finished is not None:
+            on_finished(result)
+
+    thread = threading.Thread(target=run_analysis, name="LoudnessAnalysis", daemon=True)
+    thread.start()
+
+    return thread
+
+
+def get_playback_gain(full_path, database_connection=None):
+    """
+        Gets the gain applied while playing a media file, bringing its measured loudness to the target loudness of the
+        configuration file. The gain is lowered whenever it would make the peaks of the media file clip. Media files
+        whose loudness has not been measured (or that changed since then) are played as they are.
+
+        :param full_path: The full path of the media file.
+        :param database_connection: Optional connection to be used instead of the global one (eg. by other threads).
+
+        :return: The gain, in dB.
+    """
+
+    if not config_var.getboolean('LOUDNESS', 'normalize', fallback=True):
+        return 0.0
+
+    cursor = (database_connection or connection).cursor()
+    cursor.execute("SELECT loudness, peak, loudness_size, loudness_mtime FROM media WHERE full_path = ?",
+                   (full_path,))
+
+    entry = cursor.fetchone()
+
+    cursor.close()
+
+    if entry is None or entry[0] is None or tuple(entry[2:4]) != get_file_signature(full_path):
+        return 0.0
+
+    gain = config_var.getfloat('LOUDNESS', 'target', fallback=-18.0) - entry[0]
+
+    if entry[1]:  # Preventing the peaks from clipping
+        gain = min(gain, -20 * math.log10(entry[1]))
+
+    return round(gain, 2)
+
+
+def remove_media(media, window=None, gui_instance=None):
+    """
+        Removes the media given as parameter from the database and from the media folder.
+
+        :param media: The path to the media file to be removed.
+        :param window: The window which will need to close after database update.
+        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
+                             means the method will process some GUI-related elements such as widgets.
+
+        :return True: The method has successfully removed the media file from the media folder and the database.
+        :return False: There was an error when trying to remove the media file.
+    """
+
+    cursor = connection.cursor()
+
+    if media.isnumeric():  # CLI-only: The user has attempted to delete the media file based on its ID in the database
+        full_path = get_media_path_by_position(media)
+
+        if full_path is None:  # The system couldn't find the specified ID
+            print("Error: The specified ID does not exist in the database.")
+            return
+
+        # Attempting to remove the media file record from the database
+        try:
+            # Deleting the record from the database; the IDs of the other records remain unchanged
+            cursor.execute("DELETE FROM media WHERE full_path = ?", (full_path,))
+
+            connection.commit()  # Writing the changes to the database
+
+        except Error:  # Database is locked
+            print("\nError when trying to commit changes to database. Make sure another application is not using the "
+                  "database.")
+
+            return False
+
+        cursor.close()
+
+        try:
+            os.remove(full_path)  # Removes the media file from the media folder
+
+        except FileNotFoundError:
+            print("\nError: Could not remove the file from the media folder: The file does not exist.")
+            return False
+
+        except PermissionError:
+            print("\nError: Unable to remove file from the media folder. Make sure you haven't selected a "
+                  "write-protected folder. If the issue persists, try changing the media folder and manually removing"
+                  " the media file from the current media folder.")
+            return False
+
+        print("\nThe media file has been removed.")
+
+    else:  # The user is either using the GUI or has provided the filename as parameter
+        # Getting the full path of the file (using an app-level convention for slashes)
+        full_path = resolve_media_path(media)
+
+        if path.exists(full_path):  # (CLI-only) Checking if the provided filename exists
+
+            # Attempting to remove the media file record from the database
+            try:
+                # Deleting the record from the database; the IDs of the other records remain unchanged
+                cursor.execute("DELETE FROM media WHERE full_path = ?", (full_path,))
+
+                connection.commit()  # Writing the changes to the database
+
+            except Error:  # Database is locked
+                # Application is running in GUI-mode
+                if gui_instance is not None:
+                    messagebox.showerror("Database is locked", "Error when trying to commit changes to database. Make "
+                                                               "sure another application is not using the database.")
+
+                # Application is running in CLI or debugging mode
+                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+                    print("\nError when trying to commit changes to database. Make sure another application is not "
+                          "using the database.")
+
+                return False
+
+            cursor.close()
+
+            try:
+                os.remove(full_path)  # Removes the media file from the media folder
+
+            except FileNotFoundError:
+                # Application is running in GUI-mode
+                if gui_instance is not None:
+                    messagebox.showerror("File not found", "The file does not exist.")
+
+                # Application is running in CLI or debugging mode
+                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+                    print("\nError: Could not remove the file from the media folder: The file does not exist.")
+
+                return False
+
+            except PermissionError:
+                # Application is running in GUI-mode
+                if gui_instance is not None:
+                    messagebox.showerror("Unable to remove file", "Unable to remove file from the media folder. Make "
+                                         "sure you haven't selected a write-protected folder. If the issue persists, "
+                                         "try changing the media folder and manually removing the media file from the "
+                                         "current media folder.")
+
+                # Application is running in CLI or debugging mode
+                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+                    print("\nError: Unable to remove file from the media folder. Make sure you haven't selected a "
+                          "write-protected folder. If the issue persists, try changing the media folder and manually "
+                          "removing the media file from the current media folder.")
+
+                return False
+
+            if gui_instance is not None:  # The method has been fired by a GUI widget
+                window.destroy()  # Closes the removal window
+
+                # Reloading the media list of the root window
+                gui_instance.display_media()
+
+            else:  # The method has been fired by using CLI
+                print("\nThe media file has been removed.")
+
+        else:  # (CLI-only) The user has provided an invalid filename
+            print("\nError: The specified media file does not exist.")
+            return False
+
+    return True
+
+
+def select_media_files(arguments):
+    """
+        CLI-only method. Resolves the media files specified by the arguments of a command.
+
+        :param arguments: Any combination of IDs ("3"), ranges of IDs ("3-7"), filenames and search criteria using the
+                          syntax of the "Search" command (eg. "artist=...").
+
+        :return: The list of full paths of the media files, in the order they were specified (without duplicates), or
+                 None if an argument does not match any media file (the error has already been displayed).
+    """
+
+    selected_paths = {}  # The full paths of the selected media files (a dictionary preserves their order)
+    criteria = []
+    media_rows = None  # The media list, loaded only if IDs need to be resolved
+
+    for argument in arguments:
+        range_match = re.fullmatch(r"(\d+)-(\d+)", argument)
+
+        if argument.startswith(SEARCH_CRITERIA):  # A search criterion
+            criteria.append(argument)
+
+        elif range_match or argument.isnumeric():  # An ID or a range of IDs
+            if media_rows is None:  # Every ID is resolved against the media list as it is before the command
+                media_rows = load_media_rows()
+
+            first, last = (int(range_match.group(1)), int(range_match.group(2))) if range_match else \
+                (int(argument), int(argument))
+
+            if first < 1 or last > len(media_rows) or first > last:  # The system couldn't find the specified ID
+                print("\nError: The specified ID \"" + argument + "\" does not exist in the database.")
+                return None
+
+            for media_row in media_rows[first - 1:last]:
+                selected_paths[media_row.full_path] = None
+
+        else:  # A filename
+            full_path = resolve_media_path(argument)
+
+            if not load_media_rows("media.full_path = ?", (full_path,)):  # The user has provided an invalid filename
+                print("\nError: The specified media file \"" + argument + "\" does not exist.")
+                return None
+
+            selected_paths[full_path] = None
+
+    if criteria:
+        for full_path in find_media_by_criteria(criteria):
+            selected_paths[full_path] = None
+
+    return list(selected_paths)
+
+
+def remove_media_bulk(arguments):
+    """
+        CLI-only method. Removes every media file specified by the arguments from the database and from the media
+        folder. The records are deleted using a single transaction; the media files are removed from the media folder
+        afterwards, and a single summary is displayed at the end.
+
+        :param arguments: Any combination of IDs ("3"), ranges of IDs ("3-7"), filenames and search criteria using the
+                          syntax of the "Search" command (eg. "artist=...").
+
+        :return True: The database was updated (some files might still have failed to be removed from the disk).
+        :return False: No media file was removed.
+    """
+
+    global option  # Using the global variable that specifies user choice (typically "Yes" or "No" choices)
+
+    selected_paths = select_media_files(arguments)
+
+    if selected_paths is None:  # The error has already been displayed
+        return False
+
+    if not selected_paths:
+        print("\nNo media files match the specified arguments.")
+        return False
+
+    if len(selected_paths) > 1:  # Asking for confirmation before removing multiple media files
+        print("\n" + str(len(selected_paths)) + " media files will be removed:")
+
+        for full_path in selected_paths:
+            print(os.path.basename(full_path))
+
+        print("\nDo you want to continue? (Y/N)")
+
+        option = input()  # Getting user response
+        if option.lower() != "y":  # The user has responded negatively
+            print("\nNo media files were removed.")
+            return False
+
+    cursor = connection.cursor()
+
+    # Attempting to remove every record from the database in one transaction
+    try:
+        cursor.executemany("DELETE FROM media WHERE full_path = ?", [(full_path,) for full_path in selected_paths])
+
+        connection.commit()  # Writing the changes to the database
+
+    except Error:  # Database is locked
+        connection.rollback()
+
+        print("\nError when trying to commit changes to database. Make sure another application is not using the "
+              "database.")
+
+        return False
+
+    cursor.close()
+
+    # Removing the media files from the media folder once the database has been updated
+    failed_paths = []
+
+    for full_path in selected_paths:
+        try:
+            os.remove(full_path)
+
+        except OSError:  # The file does not exist or the media folder is write-protected
+            failed_paths.append(full_path)
+
+    print("\n" + str(len(selected_paths)) + " media files have been removed from the database, " +
+          str(len(selected_paths) - len(failed_paths)) + " of which were removed from the media folder.")
+
+    if failed_paths:
+        print("\nThe following files could not be removed from the media folder. Make sure the files exist and that "
+              "you haven't selected a write-protected folder:")
+
+        for full_path in failed_paths:
+            print(full_path)
+
+    return True
+
+
+def scan_directory(directory, known_mtime, known_subdirectories, include_patterns, exclude_patterns):
+    """
+        Scans a single directory of the media folder. This method is executed by the worker threads of the folder scan.
+
+        :param directory: The directory to be scanned (using an app-level convention for slashes).
+        :param known_mtime: The modification time of the directory recorded by the folder manifest (or None).
+        :param known_subdirectories: The subdirectories of the directory recorded by the folder manifest.
+        :param include_patterns: Glob patterns of the files to be scanned. If empty, every media file is scanned.
+        :param exclude_patterns: Glob patterns of the files and directories to be ignored.
+
+        :return: A tuple containing the directory, its modification time, the list of its files (each one given as a
+                 tuple of full path, size, modification time and inode) and the list of its subdirectories. The list of
+                 files is None if the directory has not changed since the previous scan.
+    """
+
+    try:
+        directory_mtime = os.stat(directory).st_mtime_ns
+    except OSError:  # The directory was removed in the meantime
+        return directory, None, [], []
+
+    if directory_mtime == known_mtime:  # The directory is unchanged; its contents do not need to be listed
+        return directory, directory_mtime, None, known_subdirectories
+
+    files = []
+    subdirectories = []
+
+    try:
+        with os.scandir(directory) as directory_entries:
+            for directory_entry in directory_entries:
+                # Getting the full path of the entry (using an app-level convention for slashes)
+                entry_path = os.path.join(directory, directory_entry.name).replace("\\", "/")
+
+                if directory_entry.is_dir(follow_symlinks=False):
+                    if is_scanned_directory(entry_path, exclude_patterns):
+                        subdirectories.append(entry_path)
+
+                elif is_scanned_file(entry_path, include_patterns, exclude_patterns) and directory_entry.is_file():
+                    file_stat = directory_entry.stat()
+                    files.append((entry_path, file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino))
+
+    except OSError:  # The directory cannot be read (eg. a disconnected network share)
+        return directory, None, [], []
+
+    return directory, directory_mtime, files, subdirectories
+
+
+def matches_patterns(full_path, patterns):
+    """
+        Checks whether a path of the media folder matches any of the glob patterns given as parameter. The patterns
+        are matched both against the name of the file and against its path relative to the media folder.
+
+        :param full_path: The path to be checked (using the app-level convention for slashes).
+        :param patterns: The list of glob patterns.
+
+        :return True: The path matches at least one of the patterns.
+        :return False: The path does not match any of the patterns.
+    """
+
+    relative_path = full_path[len(media_folder.rstrip("/")) + 1:]
+
+    for pattern in patterns:
+        if fnmatch.fnmatch(relative_path, pattern) or fnmatch.fnmatch(os.path.basename(full_path), pattern):
+            return True
+
+    return False
+
+
+def is_scanned_file(full_path, include_patterns, exclude_patterns):
+    """
+        Checks whether a file of the media folder needs to be indexed by the folder scan.
+
+        :param full_path: The path of the file (using the app-level convention for slashes).
+        :param include_patterns: Glob patterns of the files to be scanned. If empty, every media file is scanned.
+        :param exclude_patterns: Glob patterns of the files to be ignored.
+
+        :return True: The file is a media file matching the scan patterns.
+        :return False: The file needs to be ignored.
+    """
+
+    return is_media_file(full_path) and (not include_patterns or matches_patterns(full_path, include_patterns)) \
+        and not matches_patterns(full_path, exclude_patterns)
+
+
+def is_scanned_directory(directory, exclude_patterns):
+    """
+        Checks whether a subdirectory of the media folder needs to be visited by the folder scan.
+
+        :param directory: The path of the directory (using the app-level convention for slashes).
+        :param exclude_patterns: Glob patterns of the files and directories to be ignored.
+
+        :return True: The directory needs to be scanned.
+        :return False: The directory is excluded, or it is a savelist folder.
+    """
+
+    # Savelist folders only contain links to media files that are already indexed
+    return not matches_patterns(directory, exclude_patterns) and \
+        not os.path.exists(os.path.join(directory, SAVELIST_MARKER))
+
+
+def get_scan_patterns(option_name):
+    """
+        Reads a comma-separated list of glob patterns from the "SCAN" section of the configuration file.
+
+        :param option_name: The name of the option ("include" or "exclude").
+        :return: The list of glob patterns.
+    """
+
+    return [pattern.strip() for pattern in config_var.get('SCAN', option_name, fallback="").split(",")
+            if pattern.strip()]
+
+
+def reconcile_media_folder(gui_instance=None, full_rescan=False):
+    """
+        Reconciles the database with the contents of the media folder.
+        The directories of the media folder are walked concurrently by a bounded pool of worker threads (subdirectories
+        are only visited if recursive scanning is enabled in the configuration file), while the discovered files are
+        streamed to the calling thread, which is the only one writing to the database.
+        The folder manifest stores the modification time of every directory and the size, modification time and inode
+        of every file found by the previous scan. Directories that did not change since then are not listed again, and
+        only the entries that changed are processed. Every media file that is not indexed yet is added to the database
+        using a single transaction, and every indexed media file that no longer exists on disk is reported. The metadata
+        embedded in the new and changed media files is then extracted by a pool of worker processes.
+
+        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
+                             means the method will process some GUI-related elements such as widgets or windows.
+        :param full_rescan: Discards the folder manifest, forcing every file of the media folder to be checked again.
+
+        :return: A tuple containing the list of newly indexed paths and the list of indexed paths that are missing from
+                 the media folder, or None if the database could not be updated.
+    """
+
+    recursive = config_var.get('SCAN', 'recursive', fallback="0") == "1"
+    include_patterns = get_scan_patterns('include')
+    exclude_patterns = get_scan_patterns('exclude')
+
+    cursor = connection.cursor()
+
+    # The manifest only describes the media folder as seen with the scan settings it was recorded with (eg. a manifest
+    # recorded without recursive scanning does not know any subdirectory); it is discarded when they change
+    scan_settings = {"recursive": "1" if recursive else "0", "include": ",".join(include_patterns),
+                     "exclude": ",".join(exclude_patterns)}
+
+    cursor.execute("SELECT name, value FROM manifest_settings")
+
+    if dict(cursor.fetchall()) != scan_settings:
+        full_rescan = True
+
+    if full_rescan:  # The manifest is discarded; every entry of the media folder will be processed
+        cursor.execute("DELETE FROM directory_manifest")
+        cursor.execute("DELETE FROM file_manifest")
+
+    # Loading the state of every directory and file recorded by the previous scan of the media folder
+    cursor.execute("SELECT path, mtime FROM directory_manifest")
+    directory_manifest = {entry[0]: entry[1] for entry in cursor
+                          if entry[0] == media_folder or is_in_media_folder(entry[0] + "/")}
+
+    known_subdirectories = {}  # The subdirectories of every directory recorded by the manifest
+
+    for directory in directory_manifest:
+        if directory != media_folder:
+            known_subdirectories.setdefault(os.path.dirname(directory), []).append(directory)
+
+    cursor.execute("SELECT full_path, size, mtime, inode FROM file_manifest")
+    file_manifest = {entry[0]: entry[1:] for entry in cursor if is_in_media_folder(entry[0])}
+
+    # Loading every path indexed by the database that belongs to the current media folder and matches the scan patterns
+    cursor.execute("SELECT full_path FROM media")
+    indexed_paths = {entry[0] for entry in cursor if is_in_media_folder(entry[0])
+                     and is_scanned_file(entry[0], include_patterns, exclude_patterns)}
+
+    sql_command = ''' INSERT INTO media(title, artist, album, release_date, tags, full_path)
+                    VALUES (?, ?, ?, ?, ?, ?) '''
+
+    new_paths = []  # Media files that are not indexed by the database
+    missing_paths = []  # Indexed media files that no longer exist on disk
+    visited_directories = set()
+    changed_count = 0  # The number of entries processed by the scan
+    changed_paths = []  # The files that are new or changed since the previous scan
+
+    worker_count = config_var.getint('SCAN', 'workers', fallback=8)
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
+            def submit(directory):  # Queues a directory to be scanned by the worker threads
+                visited_directories.add(directory)
+
+                return executor.submit(scan_directory, directory, directory_manifest.get(directory),
+                                       known_subdirectories.get(directory, []), include_patterns, exclude_patterns)
+
+            pending = {submit(media_folder)}
+
+            while pending:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in done:
+                    directory, directory_mtime, files, subdirectories = future.result()
+
+                    if recursive:
+                        pending.update(submit(subdirectory) for subdirectory in subdirectories)
+
+                    if files is None:  # The directory is unchanged
+                        continue
+
+                    # Only the entries that are either unknown to the manifest or were modified need to be processed
+                    disk_paths = set()
+                    changed_entries = []
+
+                    for entry in files:
+                        disk_paths.add(entry[0])
+
+                        if file_manifest.get(entry[0]) != entry[1:] or entry[0] not in indexed_paths:
+                            changed_entries.append(entry)
+
+                    directory_new_paths = sorted(entry[0] for entry in changed_entries
+                                                 if entry[0] not in indexed_paths)
+                    removed_paths = [full_path for full_path in file_manifest
+                                     if os.path.dirname(full_path) == directory and full_path not in disk_paths]
+
+                    # Streaming the changes of the directory to the database (committed once the walk is completed)
+                    cursor.executemany(sql_command, [guess_media_metadata(os.path.basename(full_path)) +
+                                                     ('', '', '', full_path) for full_path in directory_new_paths])
+                    cursor.executemany("INSERT OR REPLACE INTO file_manifest(full_path, size, mtime, inode) "
+                                       "VALUES (?, ?, ?, ?)", changed_entries)
+                    cursor.executemany("DELETE FROM file_manifest WHERE full_path = ?",
+                                       [(full_path,) for full_path in removed_paths])
+
+                    if directory_mtime is not None and time.time_ns() - directory_mtime > MANIFEST_RACY_WINDOW_NS:
+                        cursor.execute("INSERT OR REPLACE INTO directory_manifest(path, mtime) VALUES (?, ?)",
+                                       (directory, directory_mtime))
+
+                    # The directory could not be read, or it was modified so recently that it could still change within
+                    # the same timestamp. It is marked as dirty rather than forgotten, so that it is listed again by the
+                    # next scan even if its parent directory does not change.
+                    else:
+                        cursor.execute("INSERT OR REPLACE INTO directory_manifest(path, mtime) VALUES (?, ?)",
+                                       (directory, MANIFEST_DIRTY_MTIME))
+
+                    new_paths.extend(directory_new_paths)
+                    missing_paths.extend(full_path for full_path in indexed_paths
+                                         if os.path.dirname(full_path) == directory and full_path not in disk_paths)
+                    changed_count += len(changed_entries)
+                    changed_paths.extend(entry[0] for entry in changed_entries)
+
+        # Directories which were not visited by the walk no longer exist (or are excluded by the scan patterns)
+        for directory in directory_manifest.keys() - visited_directories:
+            cursor.execute("DELETE FROM directory_manifest WHERE path = ?", (directory,))
+
+        cursor.executemany("DELETE FROM file_manifest WHERE full_path = ?",
+                           [(full_path,) for full_path in file_manifest
+                            if os.path.dirname(full_path) not in visited_directories])
+
+        missing_paths.extend(full_path for full_path in indexed_paths
+                             if os.path.dirname(full_path) not in visited_directories
+                             and not os.path.isdir(os.path.dirname(full_path)))
+
+        cursor.executemany("INSERT OR REPLACE INTO manifest_settings(name, value) VALUES (?, ?)",
+                           scan_settings.items())
+
+        connection.commit()
+
+    except Error:  # Database is locked
+        connection.rollback()
+
+        # Application is running in GUI-mode
+        if gui_instance is not None:
+            messagebox.showerror("Database is locked", "Error when trying to commit changes to database. Make "
+                                 "sure another application is not using the database.")
+
+        # Application is running in CLI or debugging mode
+        if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
+            print("\nError when trying to commit changes to database. Make sure another application is not "
+                  "using the database.")
+
+        return None
+
+    cursor.close()
+
+    # Reading the metadata embedded in the new and changed media files (unchanged files are not read again)
+    update_embedded_metadata(changed_paths, gui_instance)
+
+    new_paths.sort()
+    missing_paths.sort()
+
+    if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+        print("\nMedia folder scanned: " + str(len(visited_directories)) + " directories visited, " +
+              str(changed_count) + " changed entries processed, " + str(len(new_paths)) + " new media files " +
+              "indexed, " + str(len(missing_paths)) + " indexed media files missing from the media folder.")
+
+        for full_path in missing_paths:
+            print("Missing: " + full_path)
+
+    return new_paths, missing_paths
+
+
+def folder_selector(folder_path=None, gui_instance=None):
+    """
+        Prompts the user to select the media folder.
+
+        :param folder_path: If the application is run in CLI-mode, the user can pass a path as an optional argument to
+                            specify the new location of the media folder.
+        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
+                             means the method will process some GUI-related elements such as widgets.
+
+        :return: True: The method has successfully updated the media folder.
+        :return False: The configuration file was already in use or was manually removed; the operation failed.
+    """
+
+    global config_var  # Using the global variable that reads and modifies the configuration file
+    global media_folder  # Using the global variable that stores the path of the media folder
+
+    if gui_instance is not None:  # The method has been fired by a GUI widget
+        folder = filedialog.askdirectory()  # We will use an OS-specific dialog box call to select the media folder
+
+        if folder != "":  # Checks to see if the user has canceled the operation
+            config_var.set('MEDIA FOLDER', 'folder', folder)  # Updating the value inside the configuration file
+
+            try:
+                with open('config.ini', 'w') as configfile_folder:
+                    config_var.write(configfile_folder)  # Writing the changes to the configuration file
+                    configfile_folder.close()
+
+            except IOError:
+                messagebox.showerror("Writing to file failed", "Failed to write new value to the configuration file."
+                                     " Please make sure no other applications are interacting with the configuration "
+                                     "file and that \"config.ini\" is located in the folder of the application.")
+
+                # Application is running in debugging mode
+                if config_var['RUN-MODE']['run_mode'] == "2":
+                    print("\nError: Failed to write new value to the configuration file. Please make sure no other "
+                          "applications are interacting with the configuration file and that \"config.ini\" is located "
+                          "in the folder of the application.")
+
+                return False
+
+            gui_instance.display_media_folder()  # Updating the media list
+
+            gui_instance.folder_scan()
+
+    else:  # The method has been fired by using CLI
+        if not os.path.exists(folder_path):  # The user has specified an invalid folder
+            print("\nError: The specified directory does not exist.")
+            return False
+
+        config_var.set('MEDIA FOLDER', 'folder', folder_path)  # Updating the value inside the configuration file
+
+        try:
+            with open('config.ini', 'w') as configfile_folder:
+                config_var.write(configfile_folder)  # Writing the changes to the configuration file
+                configfile_folder.close()
+
+        except IOError:
+            print("\nError: Failed to write new value to the configuration file. Please make sure no other "
+                  "applications are interacting with the configuration file and that \"config.ini\" is located "
+                  "in the folder of the application.")
+
+            return False
+
+        media_folder = folder_path.replace("\\", "/")
+
+        print("\nMedia folder updated.")
+
+        # Indexing the media files of the new media folder
+        scan_result = reconcile_media_folder()
+
+        if scan_result is not None:
+            print("\n" + str(len(scan_result[0])) + " new media files have been indexed.")
+
+    return True
+
+
+def search_media(query, database_connection=None):
+    """
+        Searches every metadata column of the media items of the media folder for the query given as parameter. The
+        full-text index is used whenever available, ranking the results by relevance; otherwise, every column of the
+        media table is scanned for the query.
+
+        :param query: The search query.
+        :param database_connection: Optional connection to be used instead of the global one (eg. by other threads).
+
+        :return: A list containing the MediaRow records of the matching media items.
+    """
+
+    if fts5_available:
+        match = build_match_expression(query)
+
+        return load_media_rows(match=match, database_connection=database_connection) if match is not None else []
+
+    # Looking up the search query in each of the database's columns
+    return load_media_rows("INSTR(title, ?) > 0 OR INSTR(artist, ?) > 0 OR INSTR(album, ?) > 0 OR "
+                           "INSTR(release_date, ?) > 0 OR INSTR(tags, ?) > 0", (query,) * 5,
+                           database_connection=database_connection)
+
+
+def fold_search_text(text):
+    """
+        Normalizes a string the same way the full-text index does, by removing diacritics and ignoring letter case.
+
+        :param text: The string to be normalized.
+        :return: The normalized string.
+    """
+
+    decomposed = unicodedata.normalize("NFKD", text)
+
+    return "".join(character for character in decomposed if not unicodedata.combining(character)).casefold()
+
+
+def media_row_matches(media_row, query):
+    """
+        Checks in memory whether a media item matches the search query given as parameter, following the same rules as
+        the "search_media" function. It allows narrowing down the cached results of a shorter query without accessing
+        the database.
+
+        :param media_row: The MediaRow record of the media item.
+        :param query: The search query.
+
+        :return: True if the media item matches the search query, False otherwise.
+    """
+
+    columns = [str(value) for value in (media_row.title, media_row.artist, media_row.album, media_row.release_date,
+                                        media_row.tags) if value is not None]
+
+    if fts5_available:  # Every word of the query needs to be the prefix of a word of the metadata
+        words = re.findall(r"\w+", fold_search_text(" ".join(columns)))
+
+        return all(any(word.startswith(prefix) for word in words)
+                   for prefix in re.findall(r"\w+", fold_search_text(query)))
+
+    return any(query in column for column in columns)
+
+
+def get_media_generation(database_connection=None):
+    """
+        Returns the write-generation counter of the "media" table, which changes every time the table is modified.
+
+        :param database_connection: Optional connection to be used instead of the global one (eg. by other threads).
+        :return: The current generation of the "media" table.
+    """
+
+    cursor = (database_connection or connection).cursor()
+    cursor.execute("SELECT generation FROM media_state WHERE id = 0")
+
+    generation = cursor.fetchone()[0]
+
+    cursor.close()
+
+    return generation
+
+
+def compile_media_criteria(criteria):
+    """
+        Compiles a set of search criteria into a single parameterized SQL condition, so that SQLite evaluates every
+        criterion in one pass over the "media" table. When the full-text index is available, the criteria become column
+        filters of a single match expression instead.
+
+        Criteria with an empty value are ignored, while the tags criterion is looked up in the tag tables (see the
+        "compile_tags_filter" function). Values starting with "=" (eg. "artist==Queen") are matched exactly, without
+        regard to letter case, using the indexes of the artist and album columns; release years can also be given as
+        ranges (see the "compile_release_year_filter" function).
+
+        :param criteria: The list of search criteria, using the syntax of the "Search" command (eg. "artist=...").
+
+        :return: A tuple containing the SQL condition (or None), its parameters and the match expression (or None).
+    """
+
+    conditions = []  # The SQL conditions, all of which need to be satisfied
+    parameters = []
+    expressions = []  # The column filters of the match expression, all of which need to be satisfied
+
+    for criterion in criteria:
+        if not criterion.startswith(SEARCH_CRITERIA):  # Unknown criteria are ignored
+            continue
+
+        column, value = criterion.split("=", 1)
+
+        if column == "release_year":
+            year_condition, year_parameters = compile_release_year_filter(value)
+
+            if year_condition is not None:  # The release year is looked up in the index of the release years
+                conditions.append(year_condition)
+                parameters.extend(year_parameters)
+
+                continue
+
+            column = "release_date"  # Other values are looked up in the release date of the media items
+
+        if column == "tags":  # Tags are matched exactly, using the tag tables
+            tags_condition, tags_parameters = compile_tags_filter(value)
+
+            if tags_condition is not None:
+                conditions.append(tags_condition)
+                parameters.extend(tags_parameters)
+
+            continue
+
+        if value.startswith("="):  # Exact match
+            if value != "=":
+                conditions.append("media." + column + " = ? COLLATE NOCASE")
+                parameters.append(value[1:])
+
+            continue
+
+        if value == "":  # The user did not specify a value for this criterion
+            continue
+
+        if fts5_available:
+            expression = build_match_expression(value, column)
+
+            # Values without any words (eg. punctuation) cannot be looked up in the full-text index
+            if expression is not None:
+                expressions.append(expression)
+                continue
+
+        conditions.append("INSTR(media." + column + ", ?) > 0")
+        parameters.append(value)
+
+    condition = " AND ".join(conditions) if conditions else None
+    match = " AND ".join(expressions) if expressions else None
+
+    return condition, parameters, match
+
+
+def compile_release_year_filter(value):
+    """
+        Compiles the value of a release year criterion into a SQL condition using the derived release year of the media
+        items. Both single years (eg. "1999") and ranges (eg. "1990..1999", "1990.." or "..1999") are supported.
+
+        :param value: The value of the release year criterion.
+        :return: A tuple containing the SQL condition (or None if the value is not a year) and its parameters.
+    """
+
+    year_range = re.fullmatch(r"\s*(\d*)\s*(\.\.)?\s*(\d*)\s*", value)
+
+    if year_range is None or not (year_range.group(1) or year_range.group(3)):
+        return None, []
+
+    first_year, last_year = year_range.group(1), year_range.group(3)
+
+    if year_range.group(2) is None:  # A single year
+        if last_year:  # Two numbers separated by whitespaces instead of ".."
+            return None, []
+
+        return release_year_column + " = ?", [int(first_year)]
+
+    conditions = []
+    parameters = []
+
+    if first_year:
+        conditions.append(release_year_column + " >= ?")
+        parameters.append(int(first_year))
+
+    if last_year:
+        conditions.append(release_year_column + " <= ?")
+        parameters.append(int(last_year))
+
+    return " AND ".join(conditions), parameters
+
+
+def find_media_by_criteria(criteria):
+    """
+        Searches the media folder for the media files matching every criterion specified as parameter.
+
+        :param criteria: The list of search criteria, using the syntax of the "Search" command (eg. "artist=...").
+        :return: A list containing the full paths of the matching media files.
+    """
+
+    condition, parameters, match = compile_media_criteria(criteria)
+
+    if condition is None and match is None:  # No criteria were specified
+        return []
+
+    return [media_row.full_path for media_row in load_media_rows(condition, parameters, match=match)]
+
+
+def load_cli(gui_instance):
+    """
+        Loads the application in command-line interface.
+
+        :param gui_instance: The graphical user interface instance to be hidden.
+        :return: None
+    """
+
+    gui_instance.stop_watcher()  # The CLI starts a media folder watcher of its own (if enabled)
+    gui_instance.stop_waveform_analyzer()
+    gui_instance.destroy()  # Destroying the application graphical window
+
+    SongStorageCLI(1)  # Loading the application in CLI, loop-mode
+
+
+def load_gui():
+    """
+        Loads the graphical user interface of the application.
+
+        :return: None
+    """
+
+    print("\nLoading graphical user interface...\n")
+    SongStorageGUI().mainloop()
+
+
+class MediaFolderWatcher:  # Background watcher that keeps the database in sync with the media folder
+    # The inotify events the watcher is interested in (see "man 7 inotify")
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+
+    def __init__(self, folder, backend="auto", poll_interval=2.0, on_change=None):
+        """
+            Initialization method of the class. The watcher will not run until the "start" method is called.
+
+            :param folder: The media folder to be watched.
+            :param backend: Specifies how changes are detected: "inotify" uses the inotify API of the operating system,
+                            "polling" periodically scans the media folder and "auto" uses inotify whenever available.
+            :param poll_interval: The interval (in seconds) between two scans of the polling backend.
+            :param on_change: Optional callable fired by the watcher thread every time the database was updated.
+
+            :return: None
+        """
+
+        self.folder = folder
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.on_change = on_change
+
+        # The watcher follows the same rules as the folder scan: subdirectories are only watched if recursive scanning
+        # is enabled, and the files and directories excluded by the scan patterns are ignored
+        self.recursive = config_var.get('SCAN', 'recursive', fallback="0") == "1"
+        self.include_patterns = get_scan_patterns('include')
+        self.exclude_patterns = get_scan_patterns('exclude')
+
+        self.libc = None  # The C library providing the inotify API
+        self.watches = {}  # The watched directories (relative to the media folder), indexed by their watch descriptor
+
+        self.stop_event = threading.Event()  # Signals the watcher thread to stop
+        self.thread = None
+
+    def start(self):
+        """
+            Starts watching the media folder on a background thread.
+
+            :return: None
+        """
+
+        self.thread = threading.Thread(target=self.run, name="MediaFolderWatcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+            Stops the watcher thread.
+
+            :return: None
+        """
+
+        self.stop_event.set()
+
+    def run(self):
+        """
+            The body of the watcher thread. Chooses a backend and feeds the detected changes to the database.
+
+            :return: None
+        """
+
+        # SQLite connections cannot be shared between threads; the watcher uses a connection of its own
+        self.watcher_connection = sqlite3.connect('Resources/media.db', timeout=30)
+
+        inotify_fd = None
+
+        if self.backend != "polling":
+            inotify_fd = self.open_inotify()
+
+        if inotify_fd is not None:
+            if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                print("\nWatching the media folder using inotify.")
+
+            self.run_inotify(inotify_fd)
+        else:
+            if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                print("\nWatching the media folder by polling every " + str(self.poll_interval) + " seconds.")
+
+            self.run_polling()
+
+        self.watcher_connection.close()
+
+    def to_full_path(self, relative_path):
+        """
+            Gets the full path of a file or directory of the media folder.
+
+            :param relative_path: The path relative to the media folder ("" for the media folder itself).
+            :return: The full path (using an app-level convention for slashes).
+        """
+
+        if relative_path == "":
+            return self.folder
+
+        return os.path.join(self.folder, relative_path).replace("\\", "/")
+
+    def open_inotify(self):
+        """
+            Attempts to set up inotify watches on the media folder and (if recursive scanning is enabled) on its
+            subdirectories.
+
+            :return: The inotify file descriptor, or None if inotify is not available on the current platform.
+        """
+
+        libc_name = ctypes.util.find_library("c")
+
+        if libc_name is None:  # Not running on a Unix-like platform
+            return None
+
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+            inotify_fd = libc.inotify_init1(os.O_NONBLOCK)
+
+        except (OSError, AttributeError):  # The C library does not provide the inotify API
+            return None
+
+        if inotify_fd < 0:
+            return None
+
+        self.libc = libc
+        self.add_watches(inotify_fd, "")
+
+        if not self.watches:  # Not even the media folder itself could be watched
+            os.close(inotify_fd)
+            return None
+
+        return inotify_fd
+
+    def add_watches(self, inotify_fd, relative_directory):
+        """
+            Adds an inotify watch on a directory of the media folder and (if recursive scanning is enabled) on every
+            subdirectory visited by the folder scan. Directories that are already watched keep their watch descriptor.
+
+            :param inotify_fd: The inotify file descriptor.
+            :param relative_directory: The directory, relative to the media folder ("" for the media folder itself).
+
+            :return: The list of the media files found in the watched directories (relative to the media folder).
+        """
+
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+        files, directories = self.scan(relative_directory)
+
+        for directory in directories:
+            watch_descriptor = self.libc.inotify_add_watch(inotify_fd, os.fsencode(self.to_full_path(directory)), mask)
+
+            if watch_descriptor >= 0:
+                self.watches[watch_descriptor] = directory
+
+        return list(files)
+
+    def remove_watches(self, inotify_fd, relative_directory):
+        """
+            Removes the inotify watches of a directory of the media folder and of its subdirectories.
+
+            :param inotify_fd: The inotify file descriptor.
+            :param relative_directory: The directory, relative to the media folder.
+
+            :return: None
+        """
+
+        for watch_descriptor, directory in list(self.watches.items()):
+            if directory == relative_directory or directory.startswith(relative_directory + "/"):
+                self.libc.inotify_rm_watch(inotify_fd, watch_descriptor)
+                del self.watches[watch_descriptor]
+
+    def is_watched_directory(self, relative_directory):
+        """
+            Checks whether a directory of the media folder needs to be watched, following the rules of the folder scan.
+
+            :param relative_directory: The directory, relative to the media folder.
+            :return True: The directory is watched.
+            :return False: The directory is ignored.
+        """
+
+        return self.recursive and os.path.isdir(self.to_full_path(relative_directory)) and \
+            is_scanned_directory(self.to_full_path(relative_directory), self.exclude_patterns)
+
+    def run_inotify(self, inotify_fd):
+        """
+            Reads inotify events until the watcher is stopped. Events arriving close to each other are coalesced, and
+            moves within the media folder are paired by their cookie in order to be recorded as renames.
+
+            :param inotify_fd: The inotify file descriptor.
+            :return: None
+        """
+
+        dirty_paths = set()  # Paths of the files that were created, modified or removed
+        moved_from = {}  # Pending "moved from" events, indexed by their cookie
+        renames = []  # Pairs of (old path, new path) of the files that were renamed
+        directory_renames = []  # Pairs of (old path, new path) of the directories that were renamed
+        new_directories = set()  # Paths of the directories that were created or moved into the media folder
+        removed_directories = set()  # Paths of the directories that were removed or moved out of the media folder
+        resync = False  # Set when the kernel event queue has overflowed
+        deadline = None  # The moment the coalesced events will be applied
+
+        while not self.stop_event.is_set():
+            timeout = 0.5 if deadline is None else max(0.0, deadline - time.monotonic())
+            readable = select.select([inotify_fd], [], [], timeout)[0]
+
+            if readable:
+                try:
+                    buffer = os.read(inotify_fd, 64 * 1024)
+                except BlockingIOError:
+                    buffer = b""
+
+                offset = 0
+
+                while offset + 16 <= len(buffer):  # Parsing every "struct inotify_event" in the buffer
+                    watch_descriptor, mask, cookie, length = struct.unpack_from("iIII", buffer, offset)
+                    name = os.fsdecode(buffer[offset + 16:offset + 16 + length].rstrip(b"\0"))
+                    offset += 16 + length
+
+                    if mask & self.IN_Q_OVERFLOW:
+                        resync = True
+                        continue
+
+                    if mask & self.IN_IGNORED:  # The watched directory was removed
+                        self.watches.pop(watch_descriptor, None)
+                        continue
+
+                    if watch_descriptor not in self.watches:  # An event of a watch that was removed in the meantime
+                        continue
+
+                    # Getting the path of the entry relative to the media folder
+                    directory = self.watches[watch_descriptor]
+                    relative_path = (directory + "/" + name) if directory else name
+
+                    if mask & self.IN_ISDIR:
+                        if not self.recursive:  # Subdirectories are not part of the media folder
+                            continue
+
+                        if mask & self.IN_MOVED_FROM:
+                            moved_from[cookie] = (relative_path, True)
+
+                        elif mask & self.IN_MOVED_TO and cookie in moved_from and moved_from[cookie][1]:
+                            directory_renames.append((moved_from.pop(cookie)[0], relative_path))
+
+                        elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                            new_directories.add(relative_path)
+
+                        elif mask & self.IN_DELETE:
+                            removed_directories.add(relative_path)
+
+                    elif not is_scanned_file(self.to_full_path(relative_path), self.include_patterns,
+                                             self.exclude_patterns) or mask & self.IN_CREATE:
+                        continue  # Created files are indexed once they are written and closed
+
+                    elif mask & self.IN_MOVED_FROM:
+                        moved_from[cookie] = (relative_path, False)
+
+                    elif mask & self.IN_MOVED_TO and cookie in moved_from and not moved_from[cookie][1]:
+                        renames.append((moved_from.pop(cookie)[0], relative_path))
+
+                    else:
+                        dirty_paths.add(relative_path)
+
+                if deadline is None:
+                    deadline = time.monotonic() + WATCHER_COALESCE_DELAY
+
+            if deadline is not None and time.monotonic() >= deadline:
+                # Entries moved out of the media folder have no matching "moved to" event; they were removed
+                for relative_path, is_directory in moved_from.values():
+                    if is_directory:
+                        removed_directories.add(relative_path)
+                    else:
+                        dirty_paths.add(relative_path)
+
+                for old_directory, new_directory in directory_renames:
+                    if old_directory not in self.watches.values():  # The directory was excluded by the scan patterns
+                        new_directories.add(new_directory)
+
+                    elif self.is_watched_directory(new_directory):  # The watches follow the renamed directory
+                        for watch_descriptor, directory in self.watches.items():
+                            if directory == old_directory or directory.startswith(old_directory + "/"):
+                                self.watches[watch_descriptor] = new_directory + directory[len(old_directory):]
+
+                    else:  # The directory was renamed to a name that is excluded by the scan patterns
+                        removed_directories.add(old_directory)
+
+                for directory in removed_directories:
+                    self.remove_watches(inotify_fd, directory)
+
+                for directory in new_directories:
+                    if self.is_watched_directory(directory):
+                        # The files created before the watch was added did not generate any event
+                        dirty_paths.update(self.add_watches(inotify_fd, directory))
+
+                if resync:
+                    self.add_watches(inotify_fd, "")  # Watching the directories whose events were lost
+                    self.resync()
+                else:
+                    directory_renames = [(old_directory, new_directory)
+                                         for old_directory, new_directory in directory_renames
+                                         if new_directory not in new_directories
+                                         and old_directory not in removed_directories]
+                    self.apply_changes(dirty_paths, renames, directory_renames, removed_directories)
+
+                dirty_paths, moved_from, renames, resync, deadline = set(), {}, [], False, None
+                directory_renames, new_directories, removed_directories = [], set(), set()
+
+        os.close(inotify_fd)
+
+    def run_polling(self):
+        """
+            Scans the media folder periodically until the watcher is stopped. Files that disappeared and reappeared
+            under another path with the same inode between two scans are recorded as renames.
+
+            :return: None
+        """
+
+        snapshot = self.scan("")[0]
+
+        while not self.stop_event.wait(self.poll_interval):
+            new_snapshot = self.scan("")[0]
+
+            if new_snapshot == snapshot:
+                continue
+
+            removed_paths = snapshot.keys() - new_snapshot.keys()
+            added_paths = new_snapshot.keys() - snapshot.keys()
+
+            # Pairing removed and added files using their inode
+            removed_inodes = {snapshot[path][2]: path for path in removed_paths}
+            renames = [(removed_inodes[new_snapshot[path][2]], path) for path in added_paths
+                       if new_snapshot[path][2] in removed_inodes]
+            renamed_paths = {path for rename in renames for path in rename}
+
+            # Paths of the files that were created, modified or removed
+            dirty_paths = {path for path in new_snapshot.keys() & snapshot.keys()
+                           if new_snapshot[path] != snapshot[path]}
+            dirty_paths.update((removed_paths | added_paths) - renamed_paths)
+
+            self.apply_changes(dirty_paths, renames)
+
+            snapshot = new_snapshot
+
+    def scan(self, relative_directory):
+        """
+            Lists the media files of a directory of the media folder and (if recursive scanning is enabled) of its
+            subdirectories, skipping the files and directories that are ignored by the folder scan.
+
+            :param relative_directory: The directory, relative to the media folder ("" for the media folder itself).
+
+            :return: A tuple containing a dictionary mapping the path of every media file (relative to the media folder)
+                     to its size, modification time and inode, and the list of the directories that were listed.
+        """
+
+        snapshot = {}
+        directories = []
+        pending_directories = [relative_directory]
+
+        while pending_directories:
+            directory = pending_directories.pop()
+
+            try:
+                with os.scandir(self.to_full_path(directory)) as directory_entries:
+                    directories.append(directory)
+
+                    for directory_entry in directory_entries:
+                        relative_path = (directory + "/" + directory_entry.name) if directory else directory_entry.name
+
+                        if directory_entry.is_dir(follow_symlinks=False):
+                            if self.is_watched_directory(relative_path):
+                                pending_directories.append(relative_path)
+
+                        elif is_scanned_file(self.to_full_path(relative_path), self.include_patterns,
+                                             self.exclude_patterns) and directory_entry.is_file():
+                            file_stat = directory_entry.stat()
+                            snapshot[relative_path] = (file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino)
+
+            except OSError:  # The directory was removed or is temporarily unavailable
+                pass
+
+        return snapshot, directories
+
+    def resync(self):
+        """
+            Compares the entire media folder with the database. Used when individual events were lost.
+
+            :return: None
+        """
+
+        cursor = self.watcher_connection.cursor()
+        cursor.execute("SELECT full_path FROM media")
+
+        indexed_paths = {entry[0][len(self.folder.rstrip("/")) + 1:] for entry in cursor
+                         if is_in_media_folder(entry[0])
+                         and is_scanned_file(entry[0], self.include_patterns, self.exclude_patterns)}
+
+        self.apply_changes(indexed_paths | self.scan("")[0].keys(), [])
+
+    def apply_changes(self, dirty_paths, renames, directory_renames=(), removed_directories=()):
+        """
+            Writes a batch of coalesced changes to the database in a single transaction. For every dirty path, the
+            media file is indexed if it exists on disk and removed from the database otherwise. The metadata embedded
+            in the new and modified media files is then extracted, like the folder scan does. All the paths are
+            relative to the media folder.
+
+            :param dirty_paths: Paths of the files that were created, modified or removed.
+            :param renames: Pairs of (old path, new path) for the files that were renamed inside the media folder.
+            :param directory_renames: Pairs of (old path, new path) for the directories that were renamed inside the
+                                      media folder.
+            :param removed_directories: Paths of the directories that were removed or moved out of the media folder.
+
+            :return: None
+        """
+
+        cursor = self.watcher_connection.cursor()
+        changed = False
+        dirty_paths = set(dirty_paths)
+        existing_paths = []  # Full paths of the media files that were created or modified
+
+        try:
+            for old_directory, new_directory in directory_renames:
+                # Keeping the metadata of the media files of the renamed directory
+                old_prefix = self.to_full_path(old_directory) + "/"
+
+                cursor.execute("UPDATE OR IGNORE media SET full_path = ? || substr(full_path, ?) "
+                               "WHERE substr(full_path, 1, ?) = ?",
+                               (self.to_full_path(new_directory) + "/", len(old_prefix) + 1, len(old_prefix),
+                                old_prefix))
+                changed = changed or cursor.rowcount > 0
+
+            for directory in removed_directories:
+                # Every media file of the directory needs to be checked; some of them may have been moved elsewhere
+                directory_prefix = self.to_full_path(directory) + "/"
+
+                cursor.execute("SELECT full_path FROM media WHERE substr(full_path, 1, ?) = ?",
+                               (len(directory_prefix), directory_prefix))
+                dirty_paths.update(entry[0][len(self.folder.rstrip("/")) + 1:] for entry in cursor.fetchall())
+
+            for old_path, new_path in renames:
+                # Keeping the metadata of the renamed media file
+                cursor.execute("UPDATE OR IGNORE media SET full_path = ? WHERE full_path = ?",
+                               (self.to_full_path(new_path), self.to_full_path(old_path)))
+
+                if cursor.rowcount:
+                    changed = True
+                else:  # The old path was not indexed, or the new path already was; both paths need to be checked
+                    dirty_paths.update((old_path, new_path))
+
+            for relative_path in dirty_paths:
+                full_path = self.to_full_path(relative_path)
+
+                if os.path.isfile(full_path):  # The media file exists; indexing it if necessary
+                    existing_paths.append(full_path)
+                    cursor.execute(''' INSERT OR IGNORE INTO media(title, artist, album, release_date, tags, full_path)
+                                   VALUES (?, ?, ?, ?, ?, ?) ''',
+                                   guess_media_metadata(os.path.basename(full_path)) + ('', '', '', full_path))
+                    changed = changed or cursor.rowcount > 0
+
+                else:  # The media file no longer exists; removing it from the database
+                    cursor.execute("DELETE FROM media WHERE full_path = ?", (full_path,))
+                    changed = changed or cursor.rowcount > 0
+
+            self.watcher_connection.commit()
+
+        except Error:  # Database is locked; the changes will be picked up by the next scan of the media folder
+            self.watcher_connection.rollback()
+
+            if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                print("\nError: The media folder watcher could not commit changes to the database.")
+
+            return
+
+        cursor.close()
+
+        if existing_paths:
+            # The titles guessed from the filenames are only a fallback for the media files without embedded metadata;
+            # files that did not change since their metadata was last extracted are skipped
+            changed = update_embedded_metadata(existing_paths, database_connection=self.watcher_connection) or changed
+
+        if changed:
+            if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                print("\nThe media folder watcher has updated the database.")
+
+            if self.on_change is not None:
+                self.on_change()
+
+
+def start_media_watcher(on_change=None):
+    """
+        Starts the media folder watcher if it is enabled in the configuration file.
+
+        :param on_change: Optional callable fired by the watcher thread every time the database was updated.
+        :return: The running watcher, or None if the watcher is disabled or no media folder is selected.
+    """
+
+    if config_var.get('WATCHER', 'enabled', fallback="0") != "1" or media_folder == "":
+        return None
+
+    watcher = MediaFolderWatcher(media_folder, config_var.get('WATCHER', 'backend', fallback="auto"),
+                                 config_var.getfloat('WATCHER', 'poll_interval', fallback=2.0), on_change)
+    watcher.start()
+
+    return watcher
+
+
+def reflink_file(source, destination):
+    """
+        Creates a reflink (a copy sharing the data blocks of the original file until either of them is modified) using
+        the FICLONE ioctl. Only file systems supporting it (eg. Btrfs, XFS) can create reflinks.
+
+        :param source: The path of the original file.
+        :param destination: The path of the reflink to be created.
+
+        :return: None
+    """
+
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this operating system.")
+
+    with open(source, 'rb') as source_file, open(destination, 'xb') as destination_file:
+        try:
+            fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+
+        except OSError:
+            destination_file.close()
+            os.remove(destination)
+
+            raise
+
+
+def copy_file_range_file(source, destination):
+    """
+        Copies a file using the "copy_file_range" system call, which copies the data within the kernel (and lets file
+        systems supporting it share the data blocks or copy them on the server side).
+
+        :param source: The path of the original file.
+        :param destination: The path of the copy to be created.
+
+        :return: None
+    """
+
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "The copy_file_range system call is not supported on this operating system.")
+
+    with open(source, 'rb') as source_file, open(destination, 'xb') as destination_file:
+        try:
+            remaining_size = os.fstat(source_file.fileno()).st_size
+
+            while remaining_size > 0:
+                copied_size = os.copy_file_range(source_file.fileno(), destination_file.fileno(), remaining_size)
+
+                if not copied_size:  # Some file systems report an empty file instead of an error
+                    raise OSError(errno.EINVAL, "The file system does not support the copy_file_range system call.")
+
+                remaining_size -= copied_size
+
+        except OSError:
+            destination_file.close()
+            os.remove(destination)
+
+            raise
+
+
+# The functions implementing the copy methods that can be selected by the "copy_method" option of the configuration file
+COPY_FUNCTIONS = {"reflink": reflink_file, "copy_file_range": copy_file_range_file, "hardlink": os.link}
+
+
+def copy_file_data(source, destination):
+    """
+        Copies a file using the fastest safe method supported by the source and destination file systems, preserving
+        its modification time like "shutil.copy2". The methods are tried in order (a reflink, then the
+        "copy_file_range" system call, then a buffered copy) the first time a file is copied between two file systems,
+        and the first one that succeeds is used for every following copy between them. Hard links are only used if
+        requested by the "copy_method" option of the configuration file, since changing the new file would change the
+        source file as well.
+
+        :param source: The path of the original file.
+        :param destination: The path of the copy to be created.
+
+        :return: None
+        :raises OSError: The file could not be copied.
+    """
+
+    copy_method = config_var.get('IMPORT', 'copy_method', fallback="auto")
+
+    try:
+        file_systems = (os.stat(source).st_dev, os.stat(os.path.dirname(destination) or ".").st_dev)
+    except OSError:
+        file_systems = None
+
+    with copy_method_lock:
+        cached_method = copy_method_cache.get((copy_method, file_systems))
+
+    if cached_method is not None:
+        copy_methods = [cached_method]
+
+    elif copy_method == "auto":
+        copy_methods = ["reflink", "copy_file_range"]
+
+    else:
+        copy_methods = [copy_method] if copy_method in COPY_FUNCTIONS else []
+
+    if file_systems is None or file_systems[0] != file_systems[1]:  # Data cannot be shared between file systems
+        copy_methods = [method for method in copy_methods if method not in ("reflink", "hardlink")]
+
+    for method in copy_methods:
+        if method == "copy":
+            break
+
+        try:
+            COPY_FUNCTIONS[method](source, destination)
+
+        except OSError as error:
+            if error.errno not in COPY_UNSUPPORTED_ERRORS:  # The file itself could not be copied using this method
+                break
+
+            continue
+
+        if method != "hardlink":  # Hard links share the modification time of the source file already
+            shutil.copystat(source, destination)
+
+        if cached_method is None:  # The method is remembered for the following copies between these file systems
+            with copy_method_lock:
+                copy_method_cache[(copy_method, file_systems)] = method
+
+            if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                print("\nMedia files will be copied using the \"" + method + "\" method.")
+
+        return
+
+    else:  # None of the methods is supported; a buffered copy is used for every following copy
+        if cached_method is None:
+            with copy_method_lock:
+                copy_method_cache[(copy_method, file_systems)] = "copy"
+
+    shutil.copy2(source, destination)
+
+
+def remove_savelist_path(savelist_path):
+    """
+        Removes a savelist (an archive, a playlist or a folder). Folders are only removed if they contain the marker of
+        savelist folders, so that no other folder is ever deleted.
+
+        :param savelist_path: The path of the savelist.
+        :return: None
+    """
+
+    if os.path.isdir(savelist_path):
+        if not os.path.exists(os.path.join(savelist_path, SAVELIST_MARKER)):
+            raise FileExistsError("\"" + savelist_path + "\" already exists and is not a savelist folder.")
+
+        shutil.rmtree(savelist_path)
+
+    elif os.path.lexists(savelist_path):
+        os.remove(savelist_path)
+
+
+class SavelistBuilder:  # Builds savelists on a background thread, reading files ahead in parallel
+    # The compression methods that can be chosen for the archive
+    COMPRESSION_METHODS = {"stored": zipfile.ZIP_STORED, "deflated": zipfile.ZIP_DEFLATED,
+                           "bzip2": zipfile.ZIP_BZIP2}
+
+    # The kinds of savelists that can be created, along with the extension of their path. Besides archives, savelists
+    # can be playlists referencing the media files or folders linking to them, neither of which copies any audio data.
+    OUTPUT_FORMATS = {"zip": ".zip", "m3u": ".m3u", "m3u8": ".m3u8", "hardlinks": "", "reflinks": ""}
+
+    CHUNK_SIZE = 1024 * 1024  # The size of the chunks the media files are read in (in bytes)
+    QUEUED_CHUNKS = 8  # The maximum number of chunks of a media file waiting to be written to the archive
+
+    def __init__(self, archive_path, files, method="stored", level=None, workers=4, on_progress=None, output="zip"):
+        """
+            Initialization method of the class. The savelist will not be built until the "start" method is called.
+
+            :param archive_path: The path of the savelist to be created (an archive, a playlist or a folder).
+            :param files: The full paths of the media files to be added to the savelist.
+            :param method: The compression method of the archive (one of the keys of "COMPRESSION_METHODS"); audio
+                           files barely compress, so storing them uncompressed is usually the fastest.
+            :param level: Optional compression level (0-9 for "deflated", 1-9 for "bzip2").
+            :param workers: The number of media files read ahead at the same time.
+            :param on_progress: Optional callable fired by the builder thread after each chunk is written, receiving
+                                the number of bytes written so far, the total number of bytes, the number of files
+                                written so far and the total number of files.
+            :param output: The kind of savelist to be created (one of the keys of "OUTPUT_FORMATS").
+
+            :return: None
+        """
+
+        if method not in self.COMPRESSION_METHODS:
+            raise ValueError("Unknown compression method \"" + method + "\".")
+
+        if output not in self.OUTPUT_FORMATS:
+            raise ValueError("Unknown savelist output \"" + output + "\".")
+
+        self.archive_path = archive_path
+        self.files = list(files)
+        self.compress_type = self.COMPRESSION_METHODS[method]
+        self.level = level
+        self.workers = max(1, workers)
+        self.on_progress = on_progress
+        self.output = output
+
+        self.cancel_event = threading.Event()  # Signals the builder to stop and discard the savelist
+        self.thread = None
+
+        self.error = None  # The exception that caused the build to fail (if any)
+        self.cancelled = False
+        self.completed = False
+
+    def start(self):
+        """
+            Starts building the savelist on a background thread.
+
+            :return: None
+        """
+
+        self.thread = threading.Thread(target=self.run, name="SavelistBuilder", daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        """
+            Stops building the savelist; the partially written savelist is deleted.
+
+            :return: None
+        """
+
+        self.cancel_event.set()
+
+    def run(self):
+        """
+            The body of the builder thread. The savelist is written to a temporary path that replaces the savelist only
+            once every media file has been written, so that a cancelled or failed build leaves no partial savelist.
+
+            :return: None
+        """
+
+        temporary_path = self.archive_path + ".part"
+
+        total_bytes = sum(os.path.getsize(full_path) for full_path in self.files if os.path.isfile(full_path))
+        progress = [0, total_bytes, 0, len(self.files)]
+
+        try:
+            remove_savelist_path(temporary_path)  # Left behind by a build that was interrupted
+
+            if self.output == "zip":
+                self.write_archive(temporary_path, progress)
+
+            elif self.output in ("m3u", "m3u8"):
+                self.write_playlist(temporary_path, progress)
+
+            else:
+                self.write_link_folder(temporary_path, progress)
+
+            if os.path.isdir(self.archive_path):  # Replacing a folder created by a previous build
+                remove_savelist_path(self.archive_path)
+
+            os.replace(temporary_path, self.archive_path)
+
+            self.completed = True
+
+        except Exception as e:
+            if self.error is None and self.cancel_event.is_set():  # The build was cancelled by the user
+                self.cancelled = True
+            elif self.error is None:
+                self.error = e
+
+            self.cancel_event.set()  # Stopping the workers
+
+            try:
+                remove_savelist_path(temporary_path)
+            except OSError:
+                pass
+
+    def write_archive(self, temporary_path, progress):
+        """
+            Writes the media files to a .zip archive. The media files are read ahead by a worker pool, while the
+            current thread compresses them and writes them to the archive in order. The compression is deliberately
+            serial: "ZipFile" offers no public way of writing data compressed elsewhere, and audio files barely
+            compress anyway, so the workers only hide the latency of the reads.
+
+            :param temporary_path: The path the archive is written to.
+            :param progress: The progress of the build, updated in place.
+
+            :return: None
+        """
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers)
+
+        try:
+            with zipfile.ZipFile(temporary_path, 'w', compression=self.compress_type,
+                                 compresslevel=self.level) as savelist_zip:
+                streams = []  # The chunk queues of the media files being read, in the order they are written
+
+                for index in range(min(self.workers, len(self.files))):  # Every worker reads a media file ahead
+                    streams.append(self.submit(executor, self.files[index]))
+
+                for index, full_path in enumerate(self.files):
+                    self.write_entry(savelist_zip, full_path, streams.pop(0), progress)
+
+                    if index + self.workers < len(self.files):
+                        streams.append(self.submit(executor, self.files[index + self.workers]))
+
+        except Exception as e:
+            # The build failed on its own (eg. a media file has been removed since it was selected); the error is
+            # recorded before stopping the workers, so that it is not mistaken for a cancellation
+            if not self.cancel_event.is_set():
+                self.error = e
+
+            self.cancel_event.set()  # Stopping the workers before waiting for them
+            raise
+
+        finally:
+            executor.shutdown(wait=True)
+
+    def write_playlist(self, temporary_path, progress):
+        """
+            Writes an extended M3U playlist referencing the media files. The paths are relative to the media folder, so
+            the playlist remains valid if the media folder is moved. M3U8 playlists are encoded using UTF-8, while M3U
+            playlists use the Latin-1 encoding expected by older players.
+
+            :param temporary_path: The path the playlist is written to.
+            :param progress: The progress of the build, updated in place.
+
+            :return: None
+        """
+
+        encoding = "utf-8" if self.output == "m3u8" else "latin-1"
+
+        try:
+            with open(temporary_path, 'w', encoding=encoding, newline="\n") as playlist:
+                playlist.write("#EXTM3U\n")
+
+                for full_path in self.files:
+                    if self.cancel_event.is_set():
+                        raise InterruptedError("The savelist was cancelled.")
+
+                    playlist.write(self.get_savelist_name(full_path) + "\n")
+
+                    self.report_file(full_path, progress)
+
+        except UnicodeEncodeError:
+            raise ValueError("Some media files have names that M3U playlists cannot store; please use the M3U8 "
+                             "format instead.")
+
+    def write_link_folder(self, temporary_path, progress):
+        """
+            Creates a folder containing a hard link or a reflink of every media file. Neither kind of link copies the
+            audio data (reflinks share it until one of the files is modified). The folder contains a marker file, so
+            that scanning the media folder skips it.
+
+            :param temporary_path: The path of the folder to be created.
+            :param progress: The progress of the build, updated in place.
+
+            :return: None
+        """
+
+        os.mkdir(temporary_path)
+
+        with open(os.path.join(temporary_path, SAVELIST_MARKER), 'w') as marker:
+            marker.write("This folder is a savelist created by Song Storage; it is skipped when scanning the media "
+                         "folder.\n")
+
+        for full_path in self.files:
+            if self.cancel_event.is_set():
+                raise InterruptedError("The savelist was cancelled.")
+
+            link_path = os.path.join(temporary_path, self.get_savelist_name(full_path))
+            os.makedirs(os.path.dirname(link_path), exist_ok=True)
+
+            # Media files sharing the same name (eg. located in different subdirectories) are numbered
+            name, extension = os.path.splitext(link_path)
+            number = 1
+
+            while os.path.lexists(link_path):
+                number += 1
+                link_path = name + " (" + str(number) + ")" + extension
+
+            if self.output == "hardlinks":
+                os.link(full_path, link_path)
+            else:
+                reflink_file(full_path, link_path)
+
+            self.report_file(full_path, progress)
+
+    def report_file(self, full_path, progress):
+        """
+            Updates the progress of the build after a media file has been added to a playlist or a folder.
+
+            :param full_path: The full path of the media file.
+            :param progress: The progress of the build, updated in place.
+
+            :return: None
+        """
+
+        if os.path.isfile(full_path):
+            progress[0] += os.path.getsize(full_path)
+
+        progress[2] += 1
+
+        if self.on_progress is not None:
+            self.on_progress(*progress)
+
+    @staticmethod
+    def get_savelist_name(full_path):
+        """
+            Gets the name of a media file inside a savelist. Media files located in subdirectories of the media folder
+            keep their relative path.
+
+            :param full_path: The full path of the media file.
+            :return: The name of the media file inside the savelist (using the app-level convention for slashes).
+        """
+
+        if is_in_media_folder(full_path):
+            return os.path.relpath(full_path, media_folder).replace("\\", "/")
+
+        return os.path.basename(full_path)
+
+    def submit(self, executor, full_path):
+        """
+            Hands a media file to the worker pool, which reads it into a queue of chunks.
+
+            :param executor: The worker pool.
+            :param full_path: The full path of the media file.
+
+            :return: The queue the chunks of the media file are put into.
+        """
+
+        stream = queue.Queue(self.QUEUED_CHUNKS)
+
+        executor.submit(self.read_entry, full_path, stream)
+
+        return stream
+
+    def put_chunk(self, stream, item):
+        """
+            Puts an item into a chunk queue, waiting for free space unless the build is cancelled.
+
+            :param stream: The chunk queue.
+            :param item: The item.
+
+            :return: True if the item was queued, False if the build was cancelled.
+        """
+
+        while not self.cancel_event.is_set():
+            try:
+                stream.put(item, timeout=0.1)
+                return True
+
+            except queue.Full:
+                continue
+
+        return False
+
+    def read_entry(self, full_path, stream):
+        """
+            Runs on the worker pool. Reads a media file in chunks, putting every chunk into the queue of the media file,
+            followed by a final ("end",) item; errors are put into the queue as ("error", exception) items.
+
+            :param full_path: The full path of the media file.
+            :param stream: The chunk queue of the media file.
+
+            :return: None
+        """
+
+        try:
+            with open(full_path, 'rb') as media_file:
+                while not self.cancel_event.is_set():
+                    chunk = media_file.read(self.CHUNK_SIZE)
+
+                    if not chunk:
+                        break
+
+                    if not self.put_chunk(stream, ("data", chunk)):
+                        return
+
+            self.put_chunk(stream, ("end",))
+
+        except Exception as e:
+            self.put_chunk(stream, ("error", e))
+
+    def write_entry(self, savelist_zip, full_path, stream, progress):
+        """
+            Writes a media file to the archive using the chunks read by the worker pool. The entry is written through
+            "ZipFile.open", which computes the checksum and compresses the chunks as they are written, using the
+            compression method and level of the archive.
+
+            :param savelist_zip: The archive.
+            :param full_path: The full path of the media file.
+            :param stream: The chunk queue of the media file.
+            :param progress: The progress of the build, updated in place.
+
+            :return: None
+        """
+
+        # The compressed data might be larger than the media file itself
+        zip64 = os.path.getsize(full_path) * 1.05 > zipfile.ZIP64_LIMIT
+
+        with savelist_zip.open(self.get_savelist_name(full_path), 'w', force_zip64=zip64) as entry:
+            while True:
+                try:
+                    item = stream.get(timeout=0.1)
+
+                except queue.Empty:
+                    if self.cancel_event.is_set():
+                        raise InterruptedError("The savelist was cancelled.")
+
+                    continue
+
+                if item[0] == "error":
+                    raise item[1]
+
+                if item[0] == "end":
+                    break
+
+                entry.write(item[1])
+
+                progress[0] += len(item[1])
+
+                if self.on_progress is not None:
+                    self.on_progress(*progress)
+
+        progress[2] += 1
+
+        if self.on_progress is not None:
+            self.on_progress(*progress)
+
+
+def start_savelist_builder(archive_name, files, method=None, level=None, on_progress=None, output=None):
+    """
+        Starts building a savelist in the media folder. The kind of savelist, the compression method, level and number
+        of workers default to the values of the configuration file.
+
+        :param archive_name: The name of the savelist (without the extension).
+        :param files: The full paths of the media files to be added to the savelist.
+        :param method: Optional compression method (see "SavelistBuilder.COMPRESSION_METHODS").
+        :param level: Optional compression level.
+        :param on_progress: Optional callable receiving the progress of the build (see "SavelistBuilder").
+        :param output: Optional kind of savelist (see "SavelistBuilder.OUTPUT_FORMATS").
+
+        :return: The running builder.
+    """
+
+    if output is None:
+        output = config_var.get('SAVELIST', 'output', fallback="zip")
+
+    if output not in SavelistBuilder.OUTPUT_FORMATS:
+        raise ValueError("Unknown savelist output \"" + output + "\".")
+
+    if method is None:
+        method = config_var.get('SAVELIST', 'compression', fallback="stored")
+
+    if level is None and config_var.get('SAVELIST', 'level', fallback="") != "":
+        level = config_var.getint('SAVELIST', 'level')
+
+    builder = SavelistBuilder(media_folder + "/" + archive_name + SavelistBuilder.OUTPUT_FORMATS[output], files, method,
+                              level, config_var.getint('SAVELIST', 'workers', fallback=4), on_progress, output)
+    builder.start()
+
+    return builder
+
+
+def get_media_label(media_row):
+    """
+        Gets the text displayed for a media item in the media list, depending on its mode.
+
+        :param media_row: The MediaRow record of the media item.
+        :return: The filename of the media item (mode '1') or its artist and title (mode '0').
+    """
+
+    if int(media_row.mode):  # Displaying the media label using its filename
+        return os.path.basename(media_row.full_path)
+
+    return media_row.artist + " - " + media_row.title  # Displaying the media label using its metadata
+
+
+class VirtualMediaList(Frame):  # Scrollable media list that only creates widgets for the visible rows
+    ROW_HEIGHT = 36  # The height (in pixels) of every row of the media list
+    VISIBLE_HEIGHT = 200  # The height (in pixels) of the visible area of the media list
+    OVERSCAN = 3  # The number of rows kept ready above and below the visible area, for smooth scrolling
+
+    def __init__(self, master, gui_instance):
+        """
+            Initialization method of the class. The row widgets are created on demand; their number only depends on the
+            height of the visible area, never on the number of media items.
+
+            :param master: The parent widget.
+            :param gui_instance: The GUI instance whose methods are fired by the buttons of the media list.
+
+            :return: None
+        """
+
+        super().__init__(master)
+
+        self.gui_instance = gui_instance
+
+        self.media_rows = []  # The MediaRow records of every item in the media list
+        self.media_labels = []  # The text displayed for every item in the media list
+
+        # The recycled row widgets, and the index of the media item currently displayed by each of them
+        self.row_widgets = []
+        self.bound_indexes = []
+
+        self.pool_size = self.VISIBLE_HEIGHT // self.ROW_HEIGHT + 1 + 2 * self.OVERSCAN
+
+        self.canvas = Canvas(self, width=500, height=self.VISIBLE_HEIGHT)
+        self.scrollbar = Scrollbar(self, orient="vertical", command=self.canvas.yview)
+
+        # Every change of the visible area (scrollbar, mouse wheel etc.) goes through the "on_scroll" method
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.canvas.pack(side=LEFT)
+
+        self.bind_mousewheel(self.canvas)
+
+    def bind_mousewheel(self, widget):
+        """
+            Allows the media list to be scrolled using the mouse wheel while the cursor hovers over the widget.
+
+            :param widget: The widget that will forward mouse wheel events to the media list.
+            :return: None
+        """
+
+        widget.bind("<MouseWheel>", lambda event: self.canvas.yview_scroll(-1 if event.delta > 0 else 1, "units"))
+        widget.bind("<Button-4>", lambda _: self.canvas.yview_scroll(-1, "units"))  # X11 scroll up
+        widget.bind("<Button-5>", lambda _: self.canvas.yview_scroll(1, "units"))  # X11 scroll down
+
+    def create_row_widgets(self):
+        """
+            Creates the widgets of one row of the media list. The row is placed inside the canvas, outside of the
+            visible area, until it gets bound to a media item.
+
+            :return: A tuple containing the canvas item, the label, the "Play", "Queue", "Configure" and "Remove"
+                     buttons and the canvas displaying the waveform.
+        """
+
+        row_frame = Frame(self.canvas)
+
+        waveform_canvas = Canvas(row_frame, width=WAVEFORM_ROW_SIZE[0], height=WAVEFORM_ROW_SIZE[1],
+                                 highlightthickness=0)
+        waveform_canvas.grid(row=0, column=0, padx=5)
+
+        label = Label(row_frame)
+        label.grid(row=0, column=1)
+
+        play_button = Button(row_frame, text="Play")
+        play_button.grid(row=0, column=2, padx=10, pady=5)
+
+        queue_button = Button(row_frame, text="Queue")
+        queue_button.grid(row=0, column=3, padx=10, pady=5)
+
+        configure_button = Button(row_frame, text="Configure")
+        configure_button.grid(row=0, column=4, padx=10, pady=5)
+
+        remove_button = Button(row_frame, text="Remove")
+        remove_button.grid(row=0, column=5, padx=10, pady=5)
+
+        for widget in (row_frame, label, play_button, queue_button, configure_button, remove_button, waveform_canvas):
+            self.bind_mousewheel(widget)
+
+        canvas_item = self.canvas.create_window((0, -self.ROW_HEIGHT), window=row_frame, anchor='nw')
+
+        return canvas_item, label, play_button, queue_button, configure_button, remove_button, waveform_canvas
+
+    def set_rows(self, media_rows):
+        """
+            Replaces the items of the media list and scrolls back to the top of the list.
+
+            :param media_rows: The MediaRow records of the media items to be displayed.
+            :return: None
+        """
+
+        self.media_rows = media_rows
+        self.media_labels = [get_media_label(media_row) for media_row in media_rows]
+
+        # The length (in characters) of the longest item in the media list
+        longest_item_length = max((len(media_label) for media_label in self.media_labels), default=0)
+
+        while len(self.row_widgets) < min(self.pool_size, len(media_rows)):
+            self.row_widgets.append(self.create_row_widgets())
+
+        for row_widget in self.row_widgets:  # Aligning the buttons of every row
+            row_widget[1].configure(width=longest_item_length)
+
+        self.bound_indexes = [None] * len(self.row_widgets)  # Every row needs to be bound again
 
-    if media.isnumeric():  # CLI-only: The user has attempted to delete the media file based on its ID in the database
-        cursor.execute("SELECT full_path FROM media WHERE id = " + media)
+        # The width of the scrollable area is calculated as follows:
+        # - we assume that every ASCII character is 7-pixels wide
+        # - the width of the buttons appended to each media file is around 320 pixels
+        # - the waveform preceding each media file is padded by 5 pixels on both sides
+        # The total width is calculated by multiplying the width of the longest media item by 7, adding the width of
+        # the buttons and of the waveform to the result
+        width = longest_item_length * 7 + 320 + WAVEFORM_ROW_SIZE[0] + 10
 
-        full_path = cursor.fetchone()
+        self.canvas.configure(width=width, scrollregion=(0, 0, width, len(media_rows) * self.ROW_HEIGHT))
+        self.canvas.yview_moveto(0)
 
-        if full_path is None:  # The system couldn't find the specified ID
-            print("Error: The specified ID does not exist in the database.")
-            return
+        self.refresh()
 
-        # Attempting to remove the media file record from the database
-        try:
-            cursor.execute("DELETE FROM media WHERE id = " + media)  # Deleting the record from the database
+    def on_scroll(self, first, last):
+        """
+            Updates the scrollbar and the visible rows every time the visible area of the canvas changes.
 
-            connection.commit()  # Writing the changes to the database
+            :param first: The fraction of the scrollable area above the visible area.
+            :param last: The fraction of the scrollable area above the bottom of the visible area.
 
-        except Error:  # Database is locked
-            print("\nError when trying to commit changes to database. Make sure another application is not using the "
-                  "database.")
+            :return: None
+        """
 
-            return False
+        self.scrollbar.set(first, last)
+        self.refresh()
 
-        cursor.close()
+    def refresh(self):
+        """
+            Binds the row widgets to the media items located in (or close to) the visible area. Every media item is
+            always displayed by the same row widget (its index modulo the number of row widgets), so scrolling by one
+            row only needs to rebind a single row widget.
 
-        # Attempting to re-order the keys after the deleted one
-        if not resort_keys(media):  # Fatal error: database is locked
-            print("\nERROR: DATABASE COULD NOT BE UPDATED. APPLICATION CANNOT WORK AS INTENDED. "
-                  "PLEASE MANUALLY REMOVE ALL MEDIA FILES FROM THE MEDIA FOLDER AND TRY ADDING THEM BACK.")
-            sys.exit()  # Quitting; the application will malfunction until the user manually resets the media folder
+            :return: None
+        """
 
-        try:
-            os.remove(full_path[0].replace("\\", "/"))  # Removes the media file from the media folder
+        if not self.row_widgets:
+            return
 
-        except FileNotFoundError:
-            print("\nError: Could not remove the file from the media folder: The file does not exist.")
-            return False
+        first_index = max(0, int(self.canvas.canvasy(0)) // self.ROW_HEIGHT - self.OVERSCAN)
 
-        except PermissionError:
-            print("\nError: Unable to remove file from the media folder. Make sure you haven't selected a "
-                  "write-protected folder. If the issue persists, try changing the media folder and manually removing"
-                  " the media file from the current media folder.")
-            return False
+        for index in range(first_index, first_index + len(self.row_widgets)):
+            slot = index % len(self.row_widgets)
 
-        print("\nThe media file has been removed.")
+            if self.bound_indexes[slot] == index:  # The row widget already displays this media item
+                continue
 
-    else:  # The user is either using the GUI or has provided the filename as parameter
-        # Getting the full path of the file (using an app-level convention for slashes)
-        full_path = os.path.join(media_folder, os.path.basename(media)).replace("\\", "/")
+            canvas_item, label, play_button, queue_button, configure_button, remove_button, waveform_canvas = \
+                self.row_widgets[slot]
+            self.bound_indexes[slot] = index
 
-        if path.exists(full_path):  # (CLI-only) Checking if the provided filename exists
+            if index >= len(self.media_rows):  # Moving the unused row widget outside of the visible area
+                self.canvas.coords(canvas_item, 0, -self.ROW_HEIGHT)
+                continue
 
-            # Getting the id of the media which will be removed in order to re-order the IDs of the database
-            cursor.execute("SELECT id FROM media WHERE full_path = " + "\"" + full_path + "\"")
-            id_value = cursor.fetchone()
+            media_row = self.media_rows[index]
 
-            # Attempting to remove the media file record from the database
-            try:
-                cursor.execute("DELETE FROM media WHERE full_path = " + "\"" + full_path + "\"")
+            # The name of the media file without showing the extension
+            label_entry = os.path.splitext(os.path.basename(media_row.full_path))[0]
 
-                connection.commit()  # Writing the changes to the database
+            label.configure(text=self.media_labels[index])
+            play_button.configure(command=partial(play_media, media_row.full_path, 1, self.gui_instance))
+            queue_button.configure(command=partial(play_media, media_row.full_path, 1, self.gui_instance, True))
+            configure_button.configure(command=partial(self.gui_instance.configure_media, label_entry,
+                                                       media_row.full_path))
+            remove_button.configure(command=partial(self.gui_instance.remove_media_query, label_entry,
+                                                    media_row.full_path))
 
-            except Error:  # Database is locked
-                # Application is running in GUI-mode
-                if gui_instance is not None:
-                    messagebox.showerror("Database is locked", "Error when trying to commit changes to database. Make "
-                                                               "sure another application is not using the database.")
+            # Drawing the stored waveform only requires reading a few hundred bytes; nothing is decoded
+            draw_waveform(waveform_canvas, get_waveform_peaks(media_row.full_path), *WAVEFORM_ROW_SIZE)
 
-                # Application is running in CLI or debugging mode
-                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
-                    print("\nError when trying to commit changes to database. Make sure another application is not "
-                          "using the database.")
+            self.canvas.coords(canvas_item, 0, index * self.ROW_HEIGHT)
 
-                return False
+    def refresh_waveforms(self):
+        """
+            Draws the waveforms of the visible rows again (eg. after new waveforms have been computed).
 
-            cursor.close()
+            :return: None
+        """
 
-            # Attempting to re-order the keys after the deleted one
-            if not resort_keys(id_value[0]):  # Fatal error: database is locked
-                # Application is running in GUI-mode
-                if gui_instance is not None:
-                    messagebox.showerror("Database error", "DATABASE COULD NOT BE UPDATED. APPLICATION CANNOT WORK AS "
-                                         "INTENDED. PLEASE MANUALLY REMOVE ALL MEDIA FILES FROM THE MEDIA FOLDER AND "
-                                         "TRY ADDING THEM BACK.")
-                    # Quitting; the application will malfunction until the user manually resets the media folder
-                    sys.exit()
+        for slot, index in enumerate(self.bound_indexes):
+            if index is not None and index < len(self.media_rows):
+                draw_waveform(self.row_widgets[slot][6], get_waveform_peaks(self.media_rows[index].full_path),
+                              *WAVEFORM_ROW_SIZE)
 
-                # Application is running in CLI or debugging mode
-                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
-                    print("\nERROR: DATABASE COULD NOT BE UPDATED. APPLICATION CANNOT WORK AS INTENDED. "
-                          "PLEASE MANUALLY REMOVE ALL MEDIA FILES FROM THE MEDIA FOLDER AND TRY ADDING THEM BACK.")
-                    # Quitting; the application will malfunction until the user manually resets the media folder
-                    sys.exit()
 
-            try:
-                os.remove(full_path)  # Removes the media file from the media folder
+class SearchCache:  # LRU cache of the results of recent search queries
+    def __init__(self, capacity):
+        """
+            Initialization method of the class.
 
-            except FileNotFoundError:
-                # Application is running in GUI-mode
-                if gui_instance is not None:
-                    messagebox.showerror("File not found", "The file does not exist.")
+            :param capacity: The maximum number of search queries whose results are kept in the cache.
+            :return: None
+        """
 
-                # Application is running in CLI or debugging mode
-                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
-                    print("\nError: Could not remove the file from the media folder: The file does not exist.")
+        self.capacity = capacity
+        self.entries = OrderedDict()  # (media folder, query) -> MediaRow records, ordered from least recently used
+        self.generation = None  # The write-generation of the "media" table the cached results belong to
 
-                return False
+    def validate(self, generation):
+        """
+            Discards every cached result if the "media" table was modified since the results were loaded.
 
-            except PermissionError:
-                # Application is running in GUI-mode
-                if gui_instance is not None:
-                    messagebox.showerror("Unable to remove file", "Unable to remove file from the media folder. Make "
-                                         "sure you haven't selected a write-protected folder. If the issue persists, "
-                                         "try changing the media folder and manually removing the media file from the "
-                                         "current media folder.")
+            :param generation: The current write-generation of the "media" table.
+            :return: None
+        """
 
-                # Application is running in CLI or debugging mode
-                if config_var['RUN-MODE']['run_mode'] == "1" or config_var['RUN-MODE']['run_mode'] == "2":
-                    print("\nError: Unable to remove file from the media folder. Make sure you haven't selected a "
-                          "write-protected folder. If the issue persists, try changing the media folder and manually "
-                          "removing the media file from the current media folder.")
+        if generation != self.generation:
+            self.entries.clear()
+            self.generation = generation
 
-                return False
+    def lookup(self, folder, query, generation):
+        """
+            Looks up the results of a search query. If the query itself is not cached, but it extends a cached query
+            (eg. the user typed "beat" after searching "bea"), its results are obtained by filtering the results of the
+            cached query in memory, since they can only be a subset of them.
 
-            if gui_instance is not None:  # The method has been fired by a GUI widget
-                window.destroy()  # Closes the removal window
+            :param folder: The media folder the search is performed in.
+            :param query: The search query.
+            :param generation: The current write-generation of the "media" table.
 
-                # Reloading the media list of the root window
-                gui_instance.library_items = []
-                gui_instance.path_frame_parent.destroy()
-                gui_instance.display_media()
+            :return: The list of MediaRow records matching the query, or None if the database needs to be searched.
+        """
 
-            else:  # The method has been fired by using CLI
-                print("\nThe media file has been removed.")
+        self.validate(generation)
 
-        else:  # (CLI-only) The user has provided an invalid filename
-            print("\nError: The specified media file does not exist.")
-            return False
+        if (folder, query) in self.entries:
+            self.entries.move_to_end((folder, query))
 
-    return True
+            return self.entries[(folder, query)]
 
+        # Finding the longest cached query the search query starts with
+        base_query = None
 
-def resort_keys(id_value):
-    """
-        Re-orders the keys of the database.
+        for cached_folder, cached_query in self.entries:
+            if cached_folder == folder and query.startswith(cached_query) and cached_query.strip() != "":
+                if base_query is None or len(cached_query) > len(base_query):
+                    base_query = cached_query
 
-        :param id_value: The deleted key. All keys after this value need to be sorted.
-        :return True: The database keys were succesfully sorted.
-        :return False: Fatal error: The database keys could not be sorted. Application will malfunction until user
-                       manually clears the media folder.
-    """
+        if base_query is None:
+            return None
 
-    cursor = connection.cursor()
+        self.entries.move_to_end((folder, base_query))
 
-    try:
-        cursor.execute("UPDATE media SET id = id - 1 WHERE id > " + str(id_value))
+        media_rows = [media_row for media_row in self.entries[(folder, base_query)]
+                      if media_row_matches(media_row, query)]
 
-        connection.commit()
+        self.store(folder, query, generation, media_rows)
 
-    except Error:  # Database is locked
-        return False  # The error messages will be displayed by the caller method
+        return media_rows
 
-    cursor.close()
+    def store(self, folder, query, generation, media_rows):
+        """
+            Adds the results of a search query to the cache, evicting the least recently used ones if needed.
 
-    if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
-        print("\nThe database keys were successfully sorted.")
+            :param folder: The media folder the search was performed in.
+            :param query: The search query.
+            :param generation: The write-generation of the "media" table the results were loaded at.
+            :param media_rows: The list of MediaRow records matching the query.
 
-    return True
+            :return: None
+        """
 
+        if self.generation is not None and generation < self.generation:  # The results are already out of date
+            return
 
-def folder_selector(folder_path=None, gui_instance=None):
-    """
-        Prompts the user to select the media folder.
+        self.validate(generation)
 
-        :param folder_path: If the application is run in CLI-mode, the user can pass a path as an optional argument to
-                            specify the new location of the media folder.
-        :param gui_instance: Specifies whether the method was called from a CLI or from a GUI instance. The latter
-                             means the method will process some GUI-related elements such as widgets.
+        self.entries[(folder, query)] = media_rows
+        self.entries.move_to_end((folder, query))
 
-        :return: True: The method has successfully updated the media folder.
-        :return False: The configuration file was already in use or was manually removed; the operation failed.
-    """
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
 
-    global config_var  # Using the global variable that reads and modifies the configuration file
 
-    if gui_instance is not None:  # The method has been fired by a GUI widget
-        folder = filedialog.askdirectory()  # We will use an OS-specific dialog box call to select the media folder
+class SearchWorker:  # Background thread that runs the search queries of the GUI
+    def __init__(self):
+        """
+            Initialization method of the class. The worker thread is started immediately.
 
-        if folder != "":  # Checks to see if the user has canceled the operation
-            config_var.set('MEDIA FOLDER', 'folder', folder)  # Updating the value inside the configuration file
+            :return: None
+        """
 
-            try:
-                with open('config.ini', 'w') as configfile_folder:
-                    config_var.write(configfile_folder)  # Writing the changes to the configuration file
-                    configfile_folder.close()
+        self.requests = queue.Queue()  # The search requests, as (sequence number, query) tuples
+        self.results = queue.Queue()  # The search results, as (sequence number, query, generation, rows) tuples
 
-            except IOError:
-                messagebox.showerror("Writing to file failed", "Failed to write new value to the configuration file."
-                                     " Please make sure no other applications are interacting with the configuration "
-                                     "file and that \"config.ini\" is located in the folder of the application.")
+        self.latest_sequence = 0  # The sequence number of the most recent request; older requests are stale
+        self.busy = False  # Specifies whether a query is currently running
 
-                # Application is running in debugging mode
-                if config_var['RUN-MODE']['run_mode'] == "2":
-                    print("\nError: Failed to write new value to the configuration file. Please make sure no other "
-                          "applications are interacting with the configuration file and that \"config.ini\" is located "
-                          "in the folder of the application.")
+        # SQLite connections cannot be shared between threads; the worker uses a connection of its own. Interrupting
+        # it from the GUI thread is the only operation performed on it outside of the worker thread.
+        self.worker_connection = sqlite3.connect('Resources/media.db', timeout=30, check_same_thread=False)
 
-                return False
+        self.thread = threading.Thread(target=self.run, name="SearchWorker", daemon=True)
+        self.thread.start()
 
-            gui_instance.display_media_folder()  # Updating the media list
+    def submit(self, sequence, query):
+        """
+            Requests a search, cancelling the query that is currently running (if any), since its results are stale.
 
-            gui_instance.folder_scan()
+            :param sequence: The sequence number of the request.
+            :param query: The search query.
 
-    else:  # The method has been fired by using CLI
-        if not os.path.exists(folder_path):  # The user has specified an invalid folder
-            print("\nError: The specified directory does not exist.")
-            return False
+            :return: None
+        """
 
-        config_var.set('MEDIA FOLDER', 'folder', folder_path)  # Updating the value inside the configuration file
+        self.latest_sequence = sequence
 
-        try:
-            with open('config.ini', 'w') as configfile_folder:
-                config_var.write(configfile_folder)  # Writing the changes to the configuration file
-                configfile_folder.close()
+        if self.busy:
+            self.worker_connection.interrupt()
 
-        except IOError:
-            print("\nError: Failed to write new value to the configuration file. Please make sure no other "
-                  "applications are interacting with the configuration file and that \"config.ini\" is located "
-                  "in the folder of the application.")
+        self.requests.put((sequence, query))
 
-            return False
+    def stop(self):
+        """
+            Stops the worker thread.
 
-        print("\nMedia folder updated.")
+            :return: None
+        """
 
-    return True
+        self.requests.put(None)
 
+    def run(self):
+        """
+            The body of the worker thread. Only the most recent of the pending requests is ever executed.
 
-def intersection(list1, list2):
-    """
-        Performs an intersection of the values of the two lists specified as parameters. Returns a list containing
-        only the shared values.
+            :return: None
+        """
 
-        :param list1: The first list.
-        :param list2: The second list.
-        :return: Returns a list containing only the common variables of the two lists passed as arguments.
-    """
+        while True:
+            request = self.requests.get()
 
-    list3 = []
+            while not self.requests.empty():  # Skipping the requests that became stale while waiting
+                request = self.requests.get_nowait()
 
-    if not list1 and not list2:  # Both lists passed as arguments are empty
-        return list3
+            if request is None:
+                break
 
-    elif not list1 and list2:  # The first list passed as argument is empty
-        return list2
+            sequence, query = request
 
-    elif list1 and not list2:  # The second list passed as argument is empty
-        return list1
+            if sequence != self.latest_sequence:
+                continue
 
-    else:
-        list3 = [value for value in list1 if value in list2]  # Getting only the common values of the two lists
-        return list3
+            self.busy = True
 
+            try:
+                # The generation is read before searching, so that the results are never considered newer than they are
+                generation = get_media_generation(self.worker_connection)
+                media_rows = search_media(query, self.worker_connection)
 
-def load_cli(gui_instance):
-    """
-        Loads the application in command-line interface.
+            except sqlite3.OperationalError as e:
+                if str(e) == "interrupted":  # The query was interrupted because a newer request has been submitted
+                    media_rows = None
 
-        :param gui_instance: The graphical user interface instance to be hidden.
-        :return: None
-    """
+                else:  # The search failed (eg. the database is locked); the query is answered with no results
+                    if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                        print("\nError: The search failed.")
+                        print(e)
 
-    gui_instance.destroy()  # Destroying the application graphical window
+                    generation, media_rows = -1, []
 
-    SongStorageCLI(1)  # Loading the application in CLI, loop-mode
+            finally:
+                self.busy = False
 
+            if media_rows is None:
+                # The interruption might have been aimed at a query that had already finished, hitting this one instead
+                if sequence == self.latest_sequence:
+                    self.requests.put(request)
 
-def load_gui():
-    """
-        Loads the graphical user interface of the application.
+                continue
 
-        :return: None
-    """
+            self.results.put((sequence, query, generation, media_rows))
 
-    print("\nLoading graphical user interface...\n")
-    SongStorageGUI().mainloop()
+        self.worker_connection.close()
 
 
 class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical interface to the user
@@ -679,17 +5826,23 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
 
         # The frame that will display all the media content available inside the media folder
         self.media_frame = Frame()
-        self.canvas = Canvas()
 
         self.path_frame_parent = Frame(self.media_frame, relief=GROOVE, width=500, height=100, bd=1)
 
+        # The scrollable media list; its row widgets are recycled every time the media list is refreshed
+        self.media_list = VirtualMediaList(self.path_frame_parent, self)
+
         # Variables related to the search frame of the application
         self.search_frame = Frame()
 
         self.back_image = PhotoImage(file="Resources/Icons/Back Icon #2.png")
         self.back_button = Button(self.search_frame, image=self.back_image, bg="#ffffff", command=self.display_media)
 
-        self.search_entry = ttk.Entry(self.search_frame, width=50)
+        # The search query; the media list is filtered while the user is typing
+        self.search_query = StringVar(self, "")
+        self.search_query.trace_add("write", self.on_search_trace)
+
+        self.search_entry = ttk.Entry(self.search_frame, width=50, textvariable=self.search_query)
         self.search_button = ttk.Button(self.search_frame, text="Search",
                                         command=lambda entry=self.search_entry: self.search(self.search_entry))
         # self.advanced_search_button = ttk.Button(self.search_frame, text="Advanced Search...")
@@ -708,16 +5861,42 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
         self.create_savelist_button = ttk.Button(self.button_frame, text="Create Savelist...",
                                                  command=self.create_savelist)
 
+        # The buttons controlling the playback engine; "Play all" plays the displayed media list (eg. search results)
+        self.play_all_button = ttk.Button(self.button_frame, text="Play all", command=lambda: play_media_list(
+            [media_row.full_path for media_row in self.media_list.media_rows], 1, self))
+        self.pause_button = ttk.Button(self.button_frame, text="Pause", command=lambda: playback_engine.submit("pause"))
+        self.stop_button = ttk.Button(self.button_frame, text="Stop", command=lambda: playback_engine.submit("stop"))
+
         self.quit_button = ttk.Button(self.button_frame, text="Exit", command=self.destroy)
 
         self.archive_name = StringVar()
         self.archive_name.set("")
 
-        # We are storing the length of the longest item in the media list in order to be able to modify the size of the
-        # scrollable area (if necessary).
-        self.longest_item_length = 0
+        self.savelist_builder = None  # The builder of the savelist archive currently being created (if any)
 
-        self.library_items = []  # The array storing info for every media file (name, buttons, metadata etc.)
+        # The media folder watcher (if enabled) and the queue through which it notifies the GUI about database updates
+        self.watcher = None
+        self.watcher_queue = queue.Queue()
+        self.watcher_job = None  # The identifier of the scheduled "process_watcher_queue" call
+
+        # The background thread computing the waveforms of the media files (NumPy is required) and the queue through
+        # which it notifies the GUI about new waveforms
+        self.waveform_analyzer = None
+        self.waveform_queue = queue.Queue()
+        self.waveform_job = None  # The identifier of the scheduled "process_waveform_queue" call
+
+        # The background thread measuring the loudness of the media files (if running) and the queue through which it
+        # notifies the GUI once it has ended
+        self.loudness_thread = None
+        self.loudness_queue = queue.Queue()
+
+        # Variables related to searching while the user is typing
+        self.search_cache = SearchCache(SEARCH_CACHE_SIZE)  # The results of the most recent search queries
+        self.search_worker = None  # The background thread running the search queries (started on first use)
+        self.search_sequence = 0  # The sequence number of the most recent search request
+        self.search_job = None  # The identifier of the scheduled "live_search" call
+        self.search_results_job = None  # The identifier of the scheduled "process_search_results" call
+        self.displayed_query = ""  # The search query whose results are displayed ("" for the entire media list)
 
         self.process_widgets()
 
@@ -743,6 +5922,7 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
 
         # Placing all the submenus
         self.filemenu.add_cascade(label="Run Mode", menu=self.runmode_menu)
+        self.filemenu.add_command(label="Analyze Loudness", command=self.analyze_loudness)
         self.menubar.add_cascade(label="File", menu=self.filemenu)
 
         self.config(menu=self.menubar)  # Indicating that the "menubar" variable is the filemenu of the application
@@ -757,44 +5937,170 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
 
         self.path_frame_parent.pack(side=LEFT)
 
-        self.search_frame.pack()
+        self.search_frame.pack()
+
+        self.search_frame.pack()
+        self.search_entry.grid(row=0, column=0, padx=10, pady=20)
+        self.search_button.grid(row=0, column=1, padx=5)
+        # self.advanced_search_button.grid(row=0, column=2, padx=5)
+
+        self.media_frame.pack()
+
+        self.button_frame.pack()
+
+    def folder_scan(self):
+        """
+            Scans the currently selected media folder.
+            Every media file that is not indexed (eg. it was manually placed by the user in the media folder) is
+            automatically added to the database, after which the list of available media is refreshed once.
+
+            :return: None
+        """
+
+        # Indexing every media file that is missing from the database in a single pass
+        reconcile_media_folder(self)
+
+        # Refreshing the media list
+        self.display_media()
+
+        # (Re)starting the media folder watcher, since the media folder might have changed
+        self.stop_watcher()
+
+        self.watcher = start_media_watcher(lambda: self.watcher_queue.put(True))
+
+        if self.watcher is not None:
+            self.watcher_job = self.after(int(WATCHER_COALESCE_DELAY * 1000), self.process_watcher_queue)
+
+    def stop_watcher(self):
+        """
+            Stops the media folder watcher (if running) along with the periodic processing of its notifications.
+
+            :return: None
+        """
+
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+        if self.watcher_job is not None:
+            self.after_cancel(self.watcher_job)
+            self.watcher_job = None
+
+    def process_watcher_queue(self):
+        """
+            Refreshes the media list whenever the media folder watcher has updated the database. The method is
+            periodically re-scheduled through the Tk event queue for as long as the watcher is running.
+
+            :return: None
+        """
+
+        updated = False
+
+        while not self.watcher_queue.empty():
+            self.watcher_queue.get_nowait()
+            updated = True
+
+        if updated:
+            if self.displayed_query == "":
+                self.display_media()
+
+            else:  # Running the search again, since the cached search results are now out of date
+                self.displayed_query = None
+                self.live_search()
+
+        self.watcher_job = self.after(int(WATCHER_COALESCE_DELAY * 1000), self.process_watcher_queue)
+
+    def start_waveform_analyzer(self):
+        """
+            Starts the background thread computing the waveforms displayed by the media list, along with the periodic
+            processing of its notifications. Waveforms are not displayed if NumPy is not installed.
+
+            :return: None
+        """
+
+        if numpy is None:
+            if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                print("\nNumPy is not installed; waveforms will not be displayed.")
+
+            return
+
+        self.waveform_analyzer = WaveformAnalyzer(self.waveform_queue.put)
+        self.waveform_job = self.after(int(WAVEFORM_POLL_INTERVAL * 1000), self.process_waveform_queue)
+
+    def stop_waveform_analyzer(self):
+        """
+            Stops the waveform analyzer (if running) along with the periodic processing of its notifications.
+
+            :return: None
+        """
+
+        if self.waveform_analyzer is not None:
+            self.waveform_analyzer.stop()
+            self.waveform_analyzer = None
+
+        if self.waveform_job is not None:
+            self.after_cancel(self.waveform_job)
+            self.waveform_job = None
+
+    def process_waveform_queue(self):
+        """
+            Draws the waveforms of the visible rows again whenever the waveform analyzer has computed new waveforms.
+            The method is periodically re-scheduled through the Tk event queue for as long as the analyzer is running.
+
+            :return: None
+        """
+
+        updated = False
 
-        self.search_frame.pack()
-        self.search_entry.grid(row=0, column=0, padx=10, pady=20)
-        self.search_button.grid(row=0, column=1, padx=5)
-        # self.advanced_search_button.grid(row=0, column=2, padx=5)
+        while not self.waveform_queue.empty():
+            self.waveform_queue.get_nowait()
+            updated = True
 
-        self.media_frame.pack()
+        if updated:
+            self.media_list.refresh_waveforms()
 
-        self.button_frame.pack()
+        self.waveform_job = self.after(int(WAVEFORM_POLL_INTERVAL * 1000), self.process_waveform_queue)
 
-    def folder_scan(self):
+    def analyze_loudness(self):
         """
-            Scans the currently selected media folder.
-            For every media file it finds, it checks if the specified file is indexed to the database.
-            If the file is not indexed (eg. it was manually placed by the user in the media folder), the program
-            automatically adds it to the database and refreshes the list of available media.
+            Measures the loudness of every media file of the media folder in the background, so that every media file
+            is played at the same loudness. The user is notified once the analysis has ended.
+
+            :return: None
         """
 
-        cursor = connection.cursor()
+        if self.loudness_thread is not None:  # The analysis is already running
+            messagebox.showinfo("Loudness analysis", "The loudness of the media files is already being analyzed.")
+            return
 
-        # Parsing the entire media folder and scanning each file
-        for filename in os.listdir(media_folder):
-            full_path = os.path.join(media_folder, filename).replace("\\", "/")
+        self.loudness_thread = start_loudness_analysis(None, self.loudness_queue.put)
 
-            # Checks if the file is indexed to the database
-            cursor.execute("SELECT COUNT(1) FROM media WHERE full_path = \"" + full_path + "\"")
-            result = int(str(cursor.fetchone())[1])
+        self.after(int(LOUDNESS_POLL_INTERVAL * 1000), self.process_loudness_queue)
 
-            if not result:  # If the file is not indexed, the program automatically adds it to the database
-                add_media(full_path, 1, self)
+    def process_loudness_queue(self):
+        """
+            Notifies the user once the loudness analysis has ended. The method is periodically re-scheduled through the
+            Tk event queue for as long as the analysis is running.
 
-        connection.commit()
+            :return: None
+        """
 
-        # Resetting GUI-specific variables and counters before refreshing the media list
-        self.library_items = []
-        self.path_frame_parent.destroy()
-        self.display_media()
+        if self.loudness_queue.empty():  # The analysis is still running
+            self.after(int(LOUDNESS_POLL_INTERVAL * 1000), self.process_loudness_queue)
+            return
+
+        analyzed_count = self.loudness_queue.get_nowait()
+        self.loudness_thread = None
+
+        if analyzed_count is None:
+            messagebox.showerror("Loudness analysis failed", "Unable to analyze the media files. Please make sure "
+                                 "that NumPy and ffmpeg (https://ffmpeg.org/) are installed and that another "
+                                 "application is not using the database.")
+
+        else:
+            messagebox.showinfo("Loudness analysis", "The loudness of " + str(analyzed_count) + " media files has "
+                                "been analyzed. Media files that did not change since they were last analyzed are "
+                                "skipped.")
 
     def load_interface(self):
         """
@@ -805,12 +6111,17 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
 
         self.display_media_folder()
 
+        self.start_waveform_analyzer()
+
         if media_folder != "":
             self.folder_scan()
 
         self.add_music_button.grid(row=0, column=0, padx=10, pady=20)
         self.create_savelist_button.grid(row=0, column=1, padx=10, pady=20)
-        self.quit_button.grid(row=0, column=2, padx=10, pady=20)
+        self.play_all_button.grid(row=0, column=2, padx=10, pady=20)
+        self.pause_button.grid(row=0, column=3, padx=10, pady=20)
+        self.stop_button.grid(row=0, column=4, padx=10, pady=20)
+        self.quit_button.grid(row=0, column=5, padx=10, pady=20)
 
     def display_media(self, search_list=None):
         """
@@ -818,187 +6129,28 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
             Displays the entire list of media files to the user, or the list containing the search results for a
             particular search query.
 
-            :param search_list: Optional parameter that specifies the list to be displayed, containing search results.
+            :param search_list: Optional parameter that specifies the list to be displayed, containing the MediaRow
+                                records of the search results.
 
             :return: None
         """
 
-        global config_var  # Using the global variable that reads and modifies the configuration file
-
-        cursor = connection.cursor()
-
-        index = 0  # Using an index to determine the correct row in which every media item needs to be placed
-
         if media_folder != "":
-            self.header.pack(pady=10)
-
-        # Resetting the media frame
-        self.library_items = []
-        self.path_frame_parent.destroy()
-        self.path_frame_parent = Frame(self.media_frame, relief=GROOVE, width=500, height=100, bd=1)
-        self.path_frame_parent.pack()
-
-        # The canvas will store every item in the media list
-        self.canvas = Canvas(self.path_frame_parent, width=500)
-        path_frame_child = Frame(self.canvas, width=500)
-
-        # Adding a scrollbar in case the media list height exceeds the window height
-        scrollbar = Scrollbar(self.path_frame_parent, orient="vertical", command=self.canvas.yview)
-        self.canvas.configure(yscrollcommand=scrollbar.set)
-
-        self.canvas.create_window((0, 0), window=path_frame_child, anchor='nw')
-        scrollbar.pack(side=RIGHT, fill=Y)
-        self.canvas.pack(side=LEFT)
-
-        # The variable that stores the length (in characters) of the longest item in the media list
-        self.longest_item_length = 0
+            self.header.pack(pady=10, before=self.path_frame_parent)
+            self.path_frame_parent.pack(side=TOP)
+            self.media_list.pack()
 
         if search_list is None:  # No search string was provided; displaying the entire media list
             self.back_button.grid_forget()
             self.search_entry.delete(0, 'end')
+            self.displayed_query = ""
 
-            # Parsing the entire database and displaying every record that matches the current media folder
-            cursor.execute("SELECT COUNT(*) FROM media")
-
-            number_of_entries = cursor.fetchone()  # This variable will store the amount of records in the database
-
-            for i in range(number_of_entries[0]):  # Parsing every item in the database
-                index += 1
-
-                cursor.execute("SELECT full_path FROM media WHERE id = " + str(i + 1))
-                entry_path = cursor.fetchone()  # This variable will store the path of the currently selected item
-
-                display_entry = StringVar()
-                display_entry.set(os.path.basename(entry_path[0]))
+            search_list = load_media_rows()  # Loading every media item of the media folder
 
-                # This variable will store the name of the media file without showing the extension
-                label_entry = StringVar()
-                label_entry.set(os.path.splitext(display_entry.get())[0])
+        self.media_list.set_rows(search_list)  # Only the visible items of the media list are drawn
 
-                # Checking if the currently selected item from the database is located in the media folder
-                if (os.path.dirname(entry_path[0])) == config_var['MEDIA FOLDER']['folder']:
-                    # Adding the media item title to the media list
-                    cursor.execute("SELECT mode FROM media WHERE id = " + str(i + 1))
-                    mode = cursor.fetchone()
-
-                    if int(mode[0]):  # Displaying the media label using its filename
-                        self.library_items.append(Label(path_frame_child, textvariable=display_entry))
-                        self.library_items[-1].grid(row=index, column=1)
-
-                        current_item_length = len(display_entry.get())
-                        if current_item_length > self.longest_item_length:
-                            self.longest_item_length = current_item_length
-
-                    else:  # Displaying the media label using its metadata
-                        cursor.execute("SELECT artist FROM media WHERE id = " + str(i + 1))
-                        artist = cursor.fetchone()
-                        cursor.execute("SELECT title FROM media WHERE id = " + str(i + 1))
-                        title = cursor.fetchone()
-
-                        display_label = StringVar()
-                        display_label.set(artist[0] + " - " + title[0])
-
-                        self.library_items.append(Label(path_frame_child, textvariable=display_label))
-                        self.library_items[-1].grid(row=index, column=1)
-
-                        current_item_length = len(display_label.get())
-                        if current_item_length > self.longest_item_length:
-                            self.longest_item_length = current_item_length
-
-                    # Adding the play button specific to the current media item
-                    self.library_items.append(Button(path_frame_child, text="Play",
-                                                     command=lambda file_path=entry_path[0]:
-                                                     play_media(file_path, 1, self)))
-                    self.library_items[-1].grid(row=index, column=2, padx=10, pady=5)
-
-                    """
-                    # Adding the info button specific to the current media item
-                    self.library_items.append(Button(path_frame_child, text="Info"))
-                    self.library_items[-1].grid(row=index, column=3, padx=10, pady=5)
-                    """
-
-                    # Adding the configuration button specific to the current media item
-                    self.library_items.append(Button(path_frame_child, text="Configure",
-                                                     command=lambda media_title=label_entry.get(),
-                                                     file_path=entry_path[0]:
-                                                     self.configure_media(media_title, file_path)))
-                    self.library_items[-1].grid(row=index, column=4, padx=10, pady=5)
-
-                    # Adding the removal button specific to the current media item
-                    self.library_items.append(Button(path_frame_child, text="Remove",
-                                                     command=lambda media_title=label_entry.get(),
-                                                     file_path=entry_path[0]:
-                                                     self.remove_media_query(media_title, file_path)))
-                    self.library_items[-1].grid(row=index, column=5, padx=10, pady=5)
-
-        else:  # A search string was provided
-            for i in search_list:  # Displaying every item in the search results
-                index += 1
-
-                display_entry = StringVar()
-                display_entry.set(os.path.basename(i[0]))
-
-                # This variable will store the name of the media file without showing the extension
-                label_entry = StringVar()
-                label_entry.set(os.path.splitext(display_entry.get())[0])
-
-                # Checking if the currently selected item from the database is located in the media folder
-                if (os.path.dirname(i[0])) == config_var['MEDIA FOLDER']['folder']:
-
-                    # Adding the media item title to the media list
-                    cursor.execute("SELECT mode FROM media WHERE full_path = " + "\"" + i[0] + "\"")
-                    mode = cursor.fetchone()
-
-                    if int(mode[0]):  # Displaying the media label using its metadata
-                        self.library_items.append(
-                            Label(path_frame_child, textvariable=display_entry))
-                        self.library_items[-1].grid(row=index, column=1)
-
-                        current_item_length = len(display_entry.get())
-                        if current_item_length > self.longest_item_length:
-                            self.longest_item_length = current_item_length
-
-                    else:  # Displaying the media label using its filename
-                        cursor.execute("SELECT artist FROM media WHERE full_path = " + "\"" + i[0] + "\"")
-                        artist = cursor.fetchone()
-                        cursor.execute("SELECT title FROM media WHERE full_path = " + "\"" + i[0] + "\"")
-                        title = cursor.fetchone()
-
-                        display_label = StringVar()
-                        display_label.set(artist[0] + " - " + title[0])
-
-                        self.library_items.append(
-                            Label(path_frame_child, textvariable=display_label))
-                        self.library_items[-1].grid(row=index, column=1)
-
-                        current_item_length = len(display_label.get())
-                        if current_item_length > self.longest_item_length:
-                            self.longest_item_length = current_item_length
-
-                    # Adding the play button specific to the current media item
-                    self.library_items.append(Button(path_frame_child, text="Play"))
-                    self.library_items[-1].grid(row=index, column=2, padx=10, pady=5)
-
-                    """
-                    # Adding the info button specific to the current media item
-                    self.library_items.append(Button(path_frame_child, text="Info"))
-                    self.library_items[-1].grid(row=index, column=3, padx=10, pady=5)
-                    """
-
-                    # Adding the configuration button specific to the current media item
-                    self.library_items.append(Button(path_frame_child, text="Configure",
-                                                     command=lambda media_title=label_entry.get(), file_path=i[0]:
-                                                     self.configure_media(media_title, file_path)))
-                    self.library_items[-1].grid(row=index, column=4, padx=10, pady=5)
-
-                    # Adding the removal button specific to the current media item
-                    self.library_items.append(Button(path_frame_child, text="Remove",
-                                                     command=lambda media_title=label_entry.get(), file_path=i[0]:
-                                                     self.remove_media_query(media_title, file_path)))
-                    self.library_items[-1].grid(row=index, column=5, padx=10, pady=5)
-
-        # Updating the width of the scrollable area
-        path_frame_child.bind("<Configure>", lambda event, x=self.longest_item_length: self.scroll_function(event, x))
+        if self.waveform_analyzer is not None:  # Computing the waveforms of the new and changed media files
+            self.waveform_analyzer.request()
 
         # Refreshing the add button
         self.add_music_button.destroy()
@@ -1012,8 +6164,6 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
                                                  command=self.create_savelist)
         self.create_savelist_button.grid(row=0, column=1, padx=10, pady=20)
 
-        cursor.close()
-
     def search(self, entry):
         """
             Searches the database for the value provided in the search box, then updates the media list to show only
@@ -1023,44 +6173,120 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
             :return: None
         """
 
-        if entry.get() != "":  # The algorithm only needs to run if the user has entered a search query
+        if self.search_job is not None:  # The search is performed right away; the debounced search is not needed
+            self.after_cancel(self.search_job)
+            self.search_job = None
 
-            cursor = connection.cursor()
+        query = entry.get()
 
-            # Looking up the search entry in each of the database's columns
-            cursor.execute("SELECT full_path FROM media WHERE INSTR(title, " + "\"" + entry.get() + "\"" +
-                           ") > 0 OR INSTR(artist, " + "\"" + entry.get() + "\"" + ") > 0 OR INSTR(album, " + "\"" +
-                           entry.get() + "\"" + ") > 0 OR INSTR(release_date, " + "\"" + entry.get() + "\"" + ") > 0" +
-                           " OR INSTR(tags, " + "\"" + entry.get() + "\"" + ") > 0")
+        if query != "":  # The algorithm only needs to run if the user has entered a search query
+            generation = get_media_generation()
 
-            files = cursor.fetchall()
+            files = self.search_cache.lookup(media_folder, query, generation)
 
-            # Packing the "Back" button, which quits the searching session
-            self.back_button.grid(row=0, column=0, padx=5)
-            self.search_entry.grid(row=0, column=1, padx=10, pady=20)
-            self.search_button.grid(row=0, column=2, padx=5)
-            # self.advanced_search_button.grid(row=0, column=3, padx=5)
+            if files is None:  # The results of the query are not cached
+                files = search_media(query)
+                self.search_cache.store(media_folder, query, generation, files)
 
-            self.display_media(files)  # Displaying the media list containing only the search results
+            self.display_search_results(query, files)
 
         else:  # The user has attempted a search on an empty string; displaying the entire media list instead
             self.display_media()
 
-    def scroll_function(self, _, longest_item_length):
+    def display_search_results(self, query, files):
+        """
+            Updates the media list to show only the search results of a search query.
+
+            :param query: The search query.
+            :param files: The list containing the MediaRow records of the search results.
+
+            :return: None
+        """
+
+        # Packing the "Back" button, which quits the searching session
+        self.back_button.grid(row=0, column=0, padx=5)
+        self.search_entry.grid(row=0, column=1, padx=10, pady=20)
+        self.search_button.grid(row=0, column=2, padx=5)
+        # self.advanced_search_button.grid(row=0, column=3, padx=5)
+
+        self.display_media(files)  # Displaying the media list containing only the search results
+
+        self.displayed_query = query
 
+    def on_search_trace(self, *_):
         """
-            Dictates the specifications of the scrollable area.
+            Called every time the contents of the search box change. The search is delayed until the user stops typing,
+            so that a burst of keystrokes results in a single search.
 
             :return: None
         """
 
-        # The width of the scrollable area is calculated as follows:
-        # - we assume that every ASCII character is 7-pixels wide
-        # - the width of the buttons appended to each media file is around 250 pixels
-        # The total width is calculated by multiplying the width of the longest media item by 7, adding the width of
-        # the buttons to the result
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"), width=longest_item_length * 7 + 250, height=200)
-        
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+
+        self.search_job = self.after(int(SEARCH_DEBOUNCE_DELAY * 1000), self.live_search)
+
+    def live_search(self):
+        """
+            Searches the database for the current contents of the search box without blocking the GUI. Cached results
+            are displayed right away; otherwise, the query is handed to the background search worker.
+
+            :return: None
+        """
+
+        self.search_job = None
+
+        query = self.search_query.get()
+
+        if query == self.displayed_query:  # The results of this query are already displayed
+            return
+
+        if query == "":  # The search box was cleared; displaying the entire media list
+            self.display_media()
+            return
+
+        files = self.search_cache.lookup(media_folder, query, get_media_generation())
+
+        if files is not None:
+            self.display_search_results(query, files)
+            return
+
+        if self.search_worker is None:
+            self.search_worker = SearchWorker()
+
+        self.search_sequence += 1
+        self.search_worker.submit(self.search_sequence, query)
+
+        if self.search_results_job is None:
+            self.search_results_job = self.after(int(SEARCH_POLL_INTERVAL * 1000), self.process_search_results)
+
+    def process_search_results(self):
+        """
+            Displays the results of the background search worker, as long as they belong to the most recent search
+            request. The method is re-scheduled through the Tk event queue until every request has been answered.
+
+            :return: None
+        """
+
+        self.search_results_job = None
+
+        answered = False
+
+        while not self.search_worker.results.empty():
+            sequence, query, generation, files = self.search_worker.results.get_nowait()
+
+            self.search_cache.store(media_folder, query, generation, files)
+
+            if sequence == self.search_sequence:
+                answered = True
+
+                # The user might have cleared the search box or pressed the "Search" button in the meantime
+                if query == self.search_query.get() and query != self.displayed_query:
+                    self.display_search_results(query, files)
+
+        if not answered:
+            self.search_results_job = self.after(int(SEARCH_POLL_INTERVAL * 1000), self.process_search_results)
+
     def display_media_folder(self):
         """
             This method makes the media folder label display the correct folder.
@@ -1134,6 +6360,13 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
         mode1_radiobutton.pack(side=LEFT, padx=10, pady=10)
         mode2_radiobutton.pack(padx=10, pady=10)
 
+        # The waveform of the media file (empty until it has been computed by the waveform analyzer)
+        waveform_canvas = Canvas(config_window, width=WAVEFORM_WINDOW_SIZE[0], height=WAVEFORM_WINDOW_SIZE[1],
+                                 highlightthickness=0)
+        waveform_canvas.grid(row=2, column=0, padx=10, pady=10)
+
+        draw_waveform(waveform_canvas, get_waveform_peaks(file_path), *WAVEFORM_WINDOW_SIZE)
+
         config_window.mainloop()
 
     def remove_media_query(self, media_title, file_path):
@@ -1369,11 +6602,14 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
         cursor = connection.cursor()
 
         try:
-            cursor.execute("UPDATE media SET title = " + "\"" + title_value.get() + "\"" + ", artist = " + "\"" +
-                           artist_value.get() + "\"" + ", album = " + "\"" + album_value.get() + "\"" +
-                           ", release_date = " + "\"" + release_date_value.get() + "\"" + ", tags = " + "\"" +
-                           tags_value.get() + "\"" + ", mode = " + str(mode) + " WHERE full_path = " + "\""
-                           + media_path + "\"")
+            cursor.execute("UPDATE media SET title = ?, artist = ?, album = ?, release_date = ?, mode = ? "
+                           "WHERE full_path = ?", (title_value.get(), artist_value.get(), album_value.get(),
+                                                   release_date_value.get(), mode, media_path))
+
+            # Updating the tags of the media item in the tag tables
+            cursor.execute("SELECT id FROM media WHERE full_path = ?", (media_path,))
+            set_media_tags(cursor, cursor.fetchone()[0], tags_value.get())
+
             if run_mode:  # Updating the full path in the database as well
                 cursor.execute("UPDATE media SET full_path = " + "\"" + new_path + "\"" + " WHERE full_path = " + "\"" +
                                media_path + "\"")
@@ -1390,20 +6626,36 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
         window.destroy()  # Unloading the configuration window
 
         # Reloading the media list of the root window
-        self.library_items = []
-        self.path_frame_parent.destroy()
         self.display_media()
 
         return True
 
     def add_media_dialog(self):
         """
-            Prompts the user to select a media file to be added to the media list.
+            Prompts the user to select the media files to be added to the media list. A single media file is added
+            interactively, while several media files are added at once by the bulk import.
 
             :return: None
         """
 
-        file = filedialog.askopenfilename()
+        files = filedialog.askopenfilenames()
+
+        if len(files) > 1:  # The user has selected several media files
+            import_result = add_media_bulk(files, self)
+
+            if import_result is not None:  # The error (if any) has already been displayed
+                added_paths, skipped_files = import_result
+
+                self.display_media()  # Updating the media list
+
+                messagebox.showinfo("Media files added", str(len(added_paths)) + " media files have been added." +
+                                    ("\n\nThe following files were skipped:\n" +
+                                     "\n".join(os.path.basename(file) + " - " + reason
+                                               for file, reason in skipped_files) if skipped_files else ""))
+
+            return
+
+        file = files[0] if files else ""
 
         if add_media(file, 0, self):  # Checking if the process of adding the media file was successful
 
@@ -1466,12 +6718,39 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
         tags_entry = ttk.Entry(savelist_frame)
         tags_entry.grid(row=4, column=1)
 
-        archive_name_label = Label(savelist_frame, text="Name of the generated archive:")
+        archive_name_label = Label(savelist_frame, text="Name of the generated savelist:")
         archive_name_label.grid(row=5, column=0, padx=10, pady=10)
 
         archive_name_entry = ttk.Entry(savelist_frame, textvariable=self.archive_name)
         archive_name_entry.grid(row=5, column=1)
 
+        # The compression settings of the archive default to the ones of the configuration file
+        compression_label = Label(savelist_frame, text="Compression:")
+        compression_label.grid(row=6, column=0, padx=10, pady=10)
+
+        compression_box = ttk.Combobox(savelist_frame, values=list(SavelistBuilder.COMPRESSION_METHODS),
+                                       state="readonly")
+        compression_box.set(config_var.get('SAVELIST', 'compression', fallback="stored"))
+        compression_box.grid(row=6, column=1)
+
+        level_label = Label(savelist_frame, text="Compression level (optional):")
+        level_label.grid(row=7, column=0, padx=10, pady=10)
+
+        level_entry = ttk.Entry(savelist_frame)
+        level_entry.insert(0, config_var.get('SAVELIST', 'level', fallback=""))
+        level_entry.grid(row=7, column=1)
+
+        # Playlists and folders of links reference the media files instead of copying them into an archive
+        output_label = Label(savelist_frame, text="Savelist type:")
+        output_label.grid(row=8, column=0, padx=10, pady=10)
+
+        output_box = ttk.Combobox(savelist_frame, values=list(SavelistBuilder.OUTPUT_FORMATS), state="readonly")
+        output_box.set(config_var.get('SAVELIST', 'output', fallback="zip"))
+        output_box.grid(row=8, column=1)
+
+        # The progress bar is only displayed while the archive is being created
+        progress_bar = ttk.Progressbar(savelist_window, length=300, mode="determinate")
+
         button_frame = Frame(savelist_window)
         button_frame.pack()
 
@@ -1480,19 +6759,24 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
         generate_button = ttk.Button(button_frame, text="Generate Savelist", state="disabled", command=lambda
                                      title_value=title_contains_entry, artist_value=artist_name_entry,
                                      album_value=album_name_entry, release_year_value=release_year_entry,
-                                     tags_value=tags_entry, archive_value=archive_name_entry, x_window=savelist_window:
+                                     tags_value=tags_entry, archive_value=archive_name_entry, x_window=savelist_window,
+                                     compression_value=compression_box, level_value=level_entry,
+                                     progress_value=progress_bar, output_value=output_box:
                                      self.generate_savelist(title_value, artist_value, album_value, release_year_value,
-                                                            tags_value, archive_value, x_window))
+                                                            tags_value, archive_value, x_window, compression_value,
+                                                            level_value, progress_value, output_value))
         generate_button.grid(row=6, column=0, padx=10, pady=10)
 
         # The partial method that checks if the "Archive Name" entry is filled
         on_enter_trace = partial(self.on_enter_trace, generate_button)
         self.archive_name.trace("w", on_enter_trace)
 
-        # The button that cancels the Savelist action
-        cancel_button = ttk.Button(button_frame, text="Cancel", command=savelist_window.destroy)
+        # The button that cancels the Savelist action (including the creation of the archive, if already started)
+        cancel_button = ttk.Button(button_frame, text="Cancel", command=lambda: self.cancel_savelist(savelist_window))
         cancel_button.grid(row=6, column=1, padx=10, pady=10)
 
+        savelist_window.protocol("WM_DELETE_WINDOW", lambda: self.cancel_savelist(savelist_window))
+
         savelist_window.mainloop()
 
     def on_enter_trace(self, button, *_):
@@ -1512,12 +6796,16 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
         else:  # The archive name entry is filled
             button.configure(state="enabled")
 
-    def generate_savelist(self, title, artist, album, release_year, tags, archive, window):
+    def generate_savelist(self, title, artist, album, release_year, tags, archive, window, compression=None, level=None,
+                          progress_bar=None, output=None):
         """
-            Creates a .zip file using the contents specified by the user in the entry fields. The .zip file is placed
-            in the media folder. The algorithm attempts to create the intersection of each SQL result from the provided
-            tags, in order for the final resulted list to contain only the media files that match every criterion
-            specified by the user.
+            Creates a savelist using the contents specified by the user in the entry fields: a .zip file, a playlist or
+            a folder of links (see "SavelistBuilder.OUTPUT_FORMATS"). The savelist is placed in the media folder. The
+            criteria are compiled into a single query, in order for the final resulted list to contain only the media
+            files that match every criterion specified by the user.
+
+            The archive is written on a background thread, so the GUI remains responsive; the progress is displayed
+            using the progress bar of the savelist window.
 
             :param title: The contents of the title entry.
             :param artist: The contents of the artist entry.
@@ -1526,70 +6814,102 @@ class SongStorageGUI(Tk):  # The GUI class responsible for showing the graphical
             :param tags: The contents of the tags entry.
             :param archive: The contents of the archive entry.
             :param window: The window which will need to close after archive creation.
+            :param compression: Optional widget specifying the compression method of the archive.
+            :param level: Optional widget specifying the compression level of the archive.
+            :param progress_bar: Optional progress bar displaying the progress of the archive creation.
+            :param output: Optional widget specifying the kind of savelist to be created.
 
             :return: None
         """
 
-        cursor = connection.cursor()
+        if self.savelist_builder is not None:  # An archive is already being created
+            return
+
+        compression_level = None
+
+        if level is not None and level.get().strip() != "":
+            if not level.get().strip().isdigit():
+                messagebox.showerror("Invalid compression level", "The compression level must be a number between 0 "
+                                     "and 9.")
+                return
+
+            compression_level = int(level.get())
+
+        files = find_media_by_criteria(["title=" + title.get(), "artist=" + artist.get(), "album=" + album.get(),
+                                        "release_year=" + release_year.get(), "tags=" + tags.get()])
+
+        progress = [None]  # The latest progress reported by the builder thread
 
-        # The arrays storing the results of the SQL entries for each of the entries' contents
-        valid_title_files = []
-        valid_artist_files = []
-        valid_album_files = []
-        valid_release_year_files = []
-        valid_tags_files = []
+        try:
+            self.savelist_builder = start_savelist_builder(archive.get(), files,
+                                                           compression.get() if compression is not None else None,
+                                                           compression_level,
+                                                           lambda *values: progress.__setitem__(0, values),
+                                                           output.get() if output is not None else None)
+        except ValueError as e:
+            messagebox.showerror("Invalid savelist settings", str(e))
+            return
+
+        if progress_bar is not None:
+            progress_bar.pack(padx=10, pady=(0, 10))
+
+        self.after(100, self.process_savelist_progress, window, progress_bar, progress)
 
-        # Creating the archive file using the name provided in the archive entry
-        with zipfile.ZipFile(media_folder + "/" + archive.get() + '.zip', 'w') as savelist_zip:
+    def process_savelist_progress(self, window, progress_bar, progress):
+        """
+            Displays the progress of the savelist archive creation. The method is periodically re-scheduled through the
+            Tk event queue until the archive is created.
+
+            :param window: The savelist window.
+            :param progress_bar: The progress bar of the savelist window (if any).
+            :param progress: A list whose only element is the latest progress reported by the builder.
 
-            if title.get() != "":  # The user has specified a custom criterion for the title
-                cursor.execute("SELECT full_path FROM media WHERE INSTR(title, " + "\"" + title.get() + "\"" +
-                               ") > 0")
+            :return: None
+        """
 
-                for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                    valid_title_files.append(i[0])
+        builder = self.savelist_builder
 
-            if artist.get() != "":  # The user has specified a custom criterion for the artist
-                cursor.execute("SELECT full_path FROM media WHERE INSTR(artist, " + "\"" + artist.get() + "\"" +
-                               ") > 0")
+        if builder.thread.is_alive():
+            # The savelist window no longer exists if the user has cancelled the archive creation
+            if progress_bar is not None and progress[0] is not None and not builder.cancel_event.is_set():
+                written_bytes, total_bytes, written_files, total_files = progress[0]
 
-                for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                    valid_artist_files.append(i[0])
+                if total_bytes:
+                    progress_bar["value"] = written_bytes * 100 / total_bytes
+                elif total_files:
+                    progress_bar["value"] = written_files * 100 / total_files
 
-            if album.get() != "":  # The user has specified a custom criterion for the album
-                cursor.execute("SELECT full_path FROM media WHERE INSTR(album, " + "\"" + album.get() + "\"" +
-                               ") > 0")
+            self.after(100, self.process_savelist_progress, window, progress_bar, progress)
+            return
 
-                for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                    valid_album_files.append(i[0])
+        self.savelist_builder = None
 
-            if release_year.get() != "":  # The user has specified a custom criterion for the release year
-                cursor.execute("SELECT full_path FROM media WHERE INSTR(release_date, " + "\"" + release_year.get() +
-                               "\") > 0")
+        if builder.error is not None:
+            messagebox.showerror("Savelist creation failed", "Could not create the savelist: " + str(builder.error))
 
-                for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                    valid_release_year_files.append(i[0])
+            if config_var['RUN-MODE']['run_mode'] == "2":  # Debugging mode
+                print("\nError: Could not create the savelist.")
+                print(builder.error)
 
-            if tags.get() != "":  # The user has specified a custom criterion for the tags
-                cursor.execute("SELECT full_path FROM media WHERE INSTR(" + "\"" + tags.get() + "\"" +
-                               ", tags) > 0")
+        elif builder.completed:
+            self.archive_name.set("")  # Resetting the archive name variable for further use
 
-                for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                    valid_tags_files.append(i[0])
+            window.destroy()  # Closing the Savelist window
 
-            # We are now performing intersection operation for each of the lists in order to add to the archive only
-            # the files that match every criterion passed by the user
-            files = intersection(intersection(intersection(intersection(valid_title_files, valid_artist_files),
-                                 valid_album_files), valid_release_year_files), valid_tags_files)
+    def cancel_savelist(self, window):
+        """
+            Closes the savelist window, cancelling the creation of the archive if it has already started.
 
-            for index in files:  # Writing the suitable files to the archive
-                savelist_zip.write(index, os.path.basename(index))
+            :param window: The savelist window.
+            :return: None
+        """
 
-        savelist_zip.close()  # Closing the archive
+        if self.savelist_builder is not None:
+            self.savelist_builder.cancel()
 
         self.archive_name.set("")  # Resetting the archive name variable for further use
 
-        window.destroy()  # Closing the Savelist window
+        window.destroy()
 
     @staticmethod
     def enable_debugging_mode():
@@ -1678,16 +6998,18 @@ class SongStorageCLI:  # The class responsible for running the application in th
             print("Please type a command.\nType \"help\" for a list of commands.\nType \"quit\" to exit the program. "
                   "Type \"load_gui\" to go back to the graphical user interface version.")
 
+            start_media_watcher()  # Keeping the database in sync with the media folder (if enabled)
+
             while self.run_mode:  # The application will continue to listen for user commands
                 command = input("\nInsert command: ")
                 self.process_command(command.lower())
 
         else:  # The user is running the application using command line arguments; no additional iterations required
             if sys.argv[1].lower() == "add_song":
-                add_media(sys.argv[2], 0)
+                self.add_song_cli(sys.argv)
 
             elif sys.argv[1].lower() == "delete_song":
-                remove_media(sys.argv[2])
+                remove_media_bulk(sys.argv[2:])
 
             elif sys.argv[1].lower() == "list_media":
                 self.display_media_cli()
@@ -1704,9 +7026,21 @@ class SongStorageCLI:  # The class responsible for running the application in th
             elif sys.argv[1].lower() == "search":
                 self.search_cli(sys.argv)
 
+            elif sys.argv[1].lower() == "scan_folder":
+                self.scan_folder_cli(sys.argv)
+
+            elif sys.argv[1].lower() == "find_duplicates":
+                self.find_duplicates_cli()
+
             elif sys.argv[1].lower() == "play":
                 play_media(sys.argv[2], 0)
 
+            elif sys.argv[1].lower() == "play_list":
+                self.play_list_cli(sys.argv, 0)
+
+            elif sys.argv[1].lower() == "analyze_loudness":
+                self.analyze_loudness_cli(sys.argv, 0)
+
             elif sys.argv[1].lower() == "load_gui":
                 load_gui()
 
@@ -1735,10 +7069,10 @@ class SongStorageCLI:  # The class responsible for running the application in th
         sys_argv_emulation.insert(0, "filler argument")
 
         if tokenized_command[0] == "add_song":
-            add_media(tokenized_command[1], 0)
+            self.add_song_cli(sys_argv_emulation)
 
         elif tokenized_command[0] == "delete_song":
-            remove_media(tokenized_command[1])
+            remove_media_bulk(tokenized_command[1:])
 
         elif tokenized_command[0] == "list_media":
             self.display_media_cli()
@@ -1755,9 +7089,36 @@ class SongStorageCLI:  # The class responsible for running the application in th
         elif tokenized_command[0] == "search":
             self.search_cli(sys_argv_emulation)
 
+        elif tokenized_command[0] == "scan_folder":
+            self.scan_folder_cli(sys_argv_emulation)
+
+        elif tokenized_command[0] == "find_duplicates":
+            self.find_duplicates_cli()
+
         elif tokenized_command[0] == "play":
             play_media(tokenized_command[1], 1)
 
+        elif tokenized_command[0] == "play_list":
+            self.play_list_cli(sys_argv_emulation, 1)
+
+        elif tokenized_command[0] == "analyze_loudness":
+            self.analyze_loudness_cli(sys_argv_emulation, 1)
+
+        elif tokenized_command[0] == "queue":
+            play_media(tokenized_command[1], 1, enqueue=True)
+
+        elif tokenized_command[0] == "stop":
+            playback_engine.submit("stop")
+
+        elif tokenized_command[0] == "pause":
+            playback_engine.submit("pause")
+
+        elif tokenized_command[0] == "next":
+            playback_engine.submit("next")
+
+        elif tokenized_command[0] == "seek":
+            self.seek_cli(sys_argv_emulation)
+
         elif tokenized_command[0] == "load_gui":
             self.run_mode = 0
             load_gui()
@@ -1780,11 +7141,13 @@ class SongStorageCLI:  # The class responsible for running the application in th
             :return: None
         """
 
-        print("\nAdd_song [path to song] - Adds the specified media file to the media folder (only .mp3 and .wav files "
-              "are supported).\n")
+        print("\nAdd_song [path to song | path to a directory | glob pattern (eg. ~/Music/*.mp3)]+ - Adds the " +
+              "specified media files to the media folder (only .mp3 and .wav files are supported). Directories are " +
+              "added along with their subdirectories.\n")
 
-        print("Delete_song [ID of the song | name of the media file] - Deletes the specified media file from the media "
-              + "folder.\n")
+        print("Delete_song [IDs of the songs | ranges of IDs (eg. 3-7) | names of the media files | (title= | " +
+              "artist= | album= | release_year= | tags=) + search query]+ - Deletes every specified media file from " +
+              "the media folder.\n")
 
         print("List_media - Displays the entire media list located in the media folder.\n")
 
@@ -1798,11 +7161,47 @@ class SongStorageCLI:  # The class responsible for running the application in th
               "for media files matching the search query and displays the results.\n")
 
         print("Create_save_list [archive name] [(title= | artist= | album= | release_date= | tags=)* + search query] " +
-              "- Creates an archive in the media folder containing the media files matching the search query.\n")
+              "[--output=(zip | m3u | m3u8 | hardlinks | reflinks)]* [--compression=(stored | deflated | bzip2)]* " +
+              "[--level=(0-9)]* - Creates a savelist in the media folder containing the media files matching the " +
+              "search query: an archive, a playlist referencing them or a folder of hard links or reflinks.\n")
+
+        print("Exact criteria (eg. artist==Queen) - Matches the whole value, without regard to letter case.\n")
+
+        print("Release year criteria (release_year=) - Either a year or a range of years (eg. 1990..1999, 1990.. or " +
+              "..1999).\n")
+
+        print("Tags criteria (tags=) - Tags separated by commas are alternatives, while tags joined by \"+\" are all " +
+              "required (eg. \"tags=rock+live,jazz\").\n")
+
+        print("Scan_folder [--full-rescan]* - Indexes every media file from the media folder that is missing from " +
+              "the database and reports indexed media files that no longer exist on disk. Unchanged folders are " +
+              "skipped unless \"--full-rescan\" is specified.\n")
+
+        print("Find_duplicates - Reports the groups of media files of the media folder having identical contents.\n")
 
         print("Play [ID of the song | name of the media file] - Plays the currently selected media file in the " +
               "background.\n")
 
+        print("Play_list [IDs of the songs | ranges of IDs (eg. 3-7) | names of the media files | (title= | " +
+              "artist= | album= | release_year= | tags=) + search query]* - Plays the specified media files (or the " +
+              "entire media list) in sequence, without gaps between them.\n")
+
+        print("Queue [ID of the song | name of the media file] - Plays the specified media file once the media files " +
+              "playing or queued before it have been played.\n")
+
+        print("Pause - Pauses or resumes the playback.\n")
+
+        print("Next - Stops the current media file and plays the next media file of the queue.\n")
+
+        print("Seek [position in seconds] - Plays the current media file from the specified position.\n")
+
+        print("Stop - Stops the playback and empties the queue.\n")
+
+        print("Analyze_loudness [IDs of the songs | ranges of IDs (eg. 3-7) | names of the media files | (title= | " +
+              "artist= | album= | release_year= | tags=) + search query]* - Measures the loudness of the specified " +
+              "media files (or of the entire media list), so that they are all played at the same loudness. Media " +
+              "files that did not change since they were last analyzed are skipped.\n")
+
         print("Load_gui - Loads the graphical user interface of the application.\n")
 
         print("Help - Displays this help message.\n")
@@ -1822,18 +7221,14 @@ class SongStorageCLI:  # The class responsible for running the application in th
         cursor = connection.cursor()
 
         if file.isnumeric():  # The user has attempted to configure the media file based on its ID in the database
-            cursor.execute("SELECT full_path FROM media WHERE id = " + file)
+            full_path = get_media_path_by_position(file)
 
-            full_path_cursor = cursor.fetchone()
-
-            if full_path_cursor is None:  # The system couldn't find the specified ID
+            if full_path is None:  # The system couldn't find the specified ID
                 print("\nError: The specified ID does not exist in the database.")
                 return
 
-            full_path = full_path_cursor[0]
-
         else:  # The user is either using the GUI or has provided the filename as parameter
-            full_path = os.path.join(media_folder, os.path.basename(file)).replace("\\", "/")
+            full_path = resolve_media_path(file)
 
             if not path.exists(full_path):  # (CLI-only) The user has provided an invalid filename
                 print("\nError: The specified media file does not exist.")
@@ -1938,7 +7333,7 @@ class SongStorageCLI:  # The class responsible for running the application in th
             # Inquiring the user about the new tags
             new_song_tags = input("\nNew song tags (separate tags by using a comma (','), whitespaces are optional): ")
 
-            cursor.execute("UPDATE media SET tags = " + "\"" + new_song_tags + "\"" + " WHERE id = " + str(entry_id[0]))
+            set_media_tags(cursor, entry_id[0], new_song_tags)  # Updating the tags in the tag tables as well
             connection.commit()  # Writing the changes to the database
 
             print("\nSong tags updated successfully.")
@@ -1955,112 +7350,86 @@ class SongStorageCLI:  # The class responsible for running the application in th
             :return: None
         """
 
-        global config_var  # Using the global variable that reads and modifies the configuration file
-
-        cursor = connection.cursor()
-        count = 0  # The total amount of items displayed
-
-        # Parsing the entire database and displaying every record that matches the current media folder
-        cursor.execute("SELECT COUNT(*) FROM media")
+        media_rows = load_media_rows()  # Loading every media item of the media folder
 
-        number_of_entries = cursor.fetchone()  # This variable will store the amount of records in the database
+        # The IDs displayed to the user are the sequential positions of the media items
+        for position, media_row in enumerate(media_rows, 1):
+            print("\n" + os.path.basename(media_row.full_path) + " || ID: " + str(position))
 
-        for i in range(number_of_entries[0]):
-            cursor.execute("SELECT full_path FROM media WHERE id = " + str(i + 1))
-            entry_path = cursor.fetchone()  # This variable will store the path of the currently selected item
-
-            # Checking if the currently selected item from the database is located in the media folder
-            if (os.path.dirname(entry_path[0])) == config_var['MEDIA FOLDER']['folder']:
-                print("\n" + os.path.basename(entry_path[0]) + " || ID: " + str(i + 1))
-                count += 1
-
-        if not count:  # No items could be found
+        if not media_rows:  # No items could be found
             print("\nThere are no media files in the media folder.")
 
-        cursor.close()
-
     @staticmethod
     def generate_savelist_cli(sys_arguments):
         """
-            Creates a .zip file using the contents specified by the user in the entry fields. The .zip file is placed
-            in the media folder. The algorithm attempts to create the intersection of each SQL result from the provided
-            tags, in order for the final resulted list to contain only the media files that match every criterion
-            specified by the user.
+            Creates a savelist using the criteria passed at the command line: a .zip file, a playlist or a folder of
+            links (see "SavelistBuilder.OUTPUT_FORMATS"). The savelist is placed in the media folder. The criteria are
+            compiled into a single query, in order for the final resulted list to contain only the media files that
+            match every criterion specified by the user.
+
+            The savelist is written using the same engine as the GUI; pressing Ctrl+C cancels its creation.
 
             :param sys_arguments: Arguments passed at the command line.
             :return: None
         """
 
-        cursor = connection.cursor()
+        method = None
+        level = None
+        output = None
+        criteria = []
 
-        # The arrays storing the results of the SQL entries for each of the entries' contents
-        valid_title_files = []
-        valid_artist_files = []
-        valid_album_files = []
-        valid_release_year_files = []
-        valid_tags_files = []
+        for argument in sys_arguments[3:]:
+            if argument.lower().startswith("--compression="):  # The user has specified a compression method
+                method = argument.split("=", 1)[1].lower()
 
-        # Creating the archive file using the name provided in the archive entry
-        with zipfile.ZipFile(media_folder + "/" + sys_arguments[2] + '.zip', 'w') as savelist_zip:
-            for index in range(len(sys_arguments) - 3):
-                if sys_arguments[index + 3].startswith(
-                        "title="):  # The user has specified a custom criterion for the title
-                    cursor.execute(
-                        "SELECT full_path FROM media WHERE INSTR(title, " + "\"" + sys_arguments[index + 3][6:]
-                        + "\"" + ") > 0")
+            elif argument.lower().startswith("--output="):  # The user has specified the kind of savelist
+                output = argument.split("=", 1)[1].lower()
 
-                    for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                        valid_title_files.append(i[0])
+            elif argument.lower().startswith("--level="):  # The user has specified a compression level
+                if not argument.split("=", 1)[1].isdigit():
+                    print("\nError: The compression level must be a number between 0 and 9.")
+                    return
 
-                # The user has specified a custom criterion for the artist
-                if sys_arguments[index + 3].startswith("artist="):
-                    cursor.execute(
-                        "SELECT full_path FROM media WHERE INSTR(artist, " + "\"" + sys_arguments[index + 3][7:] + "\""
-                        + ") > 0")
+                level = int(argument.split("=", 1)[1])
 
-                    for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                        valid_artist_files.append(i[0])
+            else:
+                criteria.append(argument)
 
-                if sys_arguments[index + 3].startswith(
-                        "album="):  # The user has specified a custom criterion for the album
-                    cursor.execute(
-                        "SELECT full_path FROM media WHERE INSTR(album, " + "\"" + sys_arguments[index + 3][6:] + "\""
-                        + ") > 0")
+        files = find_media_by_criteria(criteria)
 
-                    for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                        valid_album_files.append(i[0])
+        last_progress = [None]  # The latest progress displayed to the user
 
-                # The user has specified a custom criterion for the release year
-                if sys_arguments[index + 3].startswith("release_year="):
-                    cursor.execute(
-                        "SELECT full_path FROM media WHERE INSTR(release_date, " + "\"" + sys_arguments[index + 3][13:]
-                        + "\") > 0")
+        def display_progress(written_bytes, total_bytes, written_files, total_files):
+            percentage = int(written_bytes * 100 / total_bytes) if total_bytes else 100
 
-                    for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                        valid_release_year_files.append(i[0])
+            if (percentage, written_files) != last_progress[0]:
+                last_progress[0] = (percentage, written_files)
 
-                # The user has specified a custom criterion for the tags
-                if sys_arguments[index + 3].startswith("tags="):
-                    tags_list = sys_arguments[index + 3][5:].replace('\"', '').replace(' ', '').split(",")
+                print("\rCreating the savelist: " + str(percentage) + "% (" + str(written_files) + "/" +
+                      str(total_files) + " files)", end="", flush=True)
 
-                    for tag in tags_list:
-                        cursor.execute("SELECT full_path FROM media WHERE INSTR(tags, \"" + tag + "\") > 0")
+        try:
+            builder = start_savelist_builder(sys_arguments[2], files, method, level, display_progress, output)
+        except ValueError as e:
+            print("\nError: " + str(e))
+            return
 
-                        for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                            valid_tags_files.append(i[0])
+        try:
+            while builder.thread.is_alive():
+                builder.thread.join(0.2)
 
-                # We are now performing intersection operation for each of the lists in order to add to the archive only
-                # the files that match every criterion passed by the user
-                files = intersection(intersection(intersection(intersection(valid_title_files, valid_artist_files),
-                                                               valid_album_files), valid_release_year_files),
-                                     valid_tags_files)
+        except KeyboardInterrupt:  # The user has cancelled the archive creation
+            builder.cancel()
+            builder.thread.join()
 
-                for index2 in files:  # Writing the suitable files to the archive
-                    savelist_zip.write(index2, os.path.basename(index2))
+        if builder.completed:
+            print("\nSavelist created successfully.")
 
-        savelist_zip.close()  # Closing the archive
+        elif builder.error is not None:
+            print("\nError: Could not create the savelist: " + str(builder.error))
 
-        print("\nArchive created successfully.")
+        else:
+            print("\nThe savelist creation was cancelled.")
 
     @staticmethod
     def configure_media_folder(arguments):
@@ -2098,6 +7467,183 @@ class SongStorageCLI:  # The class responsible for running the application in th
         elif len(arguments) == 3:  # The user is attempting to change the media folder
             folder_selector(arguments[2])
 
+    @staticmethod
+    def scan_folder_cli(arguments):
+        """
+            CLI-only method. Scans the media folder, indexing every media file that is missing from the database and
+            reporting the indexed media files that no longer exist on disk.
+
+            :param arguments: Arguments passed at the command line. The optional "--full-rescan" argument discards the
+                              folder manifest, forcing every file of the media folder to be checked again.
+            :return: None
+        """
+
+        if media_folder == "":  # No media folder is configured
+            print("\nNo media folder selected. "
+                  "Use \"media_folder [path to a directory]\" command to set up a media folder.")
+            return
+
+        scan_result = reconcile_media_folder(None, "--full-rescan" in arguments[2:])
+
+        if scan_result is None:  # The database could not be updated; the error has already been displayed
+            return
+
+        new_paths, missing_paths = scan_result
+
+        print("\n" + str(len(new_paths)) + " new media files have been indexed.")
+
+        if missing_paths:
+            print("\nThe following indexed media files no longer exist in the media folder:")
+
+            for full_path in missing_paths:
+                print(full_path)
+
+    @staticmethod
+    def add_song_cli(arguments):
+        """
+            CLI-only method. Adds the media files specified by the arguments to the media folder. A single media file
+            is added interactively (the user is prompted to configure its metadata), while several files, directories
+            and glob patterns are added at once by the bulk import.
+
+            :param arguments: Arguments passed at the command line.
+            :return: None
+        """
+
+        if len(arguments) < 3:
+            print("\nError: No media file specified. Use command \"Help\" for the syntax of \"Add_song\".")
+            return
+
+        if media_folder == "":  # No media folder is configured
+            print("\nNo media folder selected. "
+                  "Use \"media_folder [path to a directory]\" command to set up a media folder.")
+            return
+
+        if len(arguments) == 3 and os.path.isfile(arguments[2]):  # A single media file
+            add_media(arguments[2], 0)
+        else:
+            add_media_bulk(arguments[2:])
+
+    @staticmethod
+    def play_list_cli(arguments, allow_multiprocessing):
+        """
+            CLI-only method. Plays the media files specified by the arguments in sequence.
+
+            :param arguments: Arguments passed at the command line (see "select_media_files"). If no media files are
+                              specified, the entire media list is played.
+            :param allow_multiprocessing: Checks whether application can play the media files in background.
+            :return: None
+        """
+
+        if len(arguments) > 2:
+            full_paths = select_media_files(arguments[2:])
+
+            if full_paths is None:  # The error has already been displayed
+                return
+
+        else:
+            full_paths = [media_row.full_path for media_row in load_media_rows()]
+
+        play_media_list(full_paths, allow_multiprocessing)
+
+    @staticmethod
+    def seek_cli(arguments):
+        """
+            CLI-only method. Plays the current media file from the position specified by the arguments.
+
+            :param arguments: Arguments passed at the command line.
+            :return: None
+        """
+
+        try:
+            position = float(arguments[2])
+
+        except (IndexError, ValueError):
+            print("\nError: Please specify the position in seconds (eg. \"seek 90\").")
+            return
+
+        playback_engine.submit("seek", position)
+
+    @staticmethod
+    def analyze_loudness_cli(arguments, allow_multiprocessing):
+        """
+            CLI-only method. Measures the loudness of the media files specified by the arguments, so that every media
+            file is played at the same loudness.
+
+            :param arguments: Arguments passed at the command line (see "select_media_files"). If no media files are
+                              specified, every media file of the media folder is analyzed.
+            :param allow_multiprocessing: Checks whether application can analyze the media files in background.
+            :return: None
+        """
+
+        full_paths = None  # Every media file of the media folder
+
+        if len(arguments) > 2:
+            full_paths = select_media_files(arguments[2:])
+
+            if full_paths is None:  # The error has already been displayed
+                return
+
+        def display_result(analyzed_count):
+            if analyzed_count is not None:  # Otherwise, the error has already been displayed
+                print("\nLoudness analysis finished: " + str(analyzed_count) + " media files analyzed (unchanged " +
+                      "media files are skipped).")
+
+        if allow_multiprocessing:  # The user can keep typing commands while the media files are being analyzed
+            print("\nAnalyzing the loudness of the media files in the background.")
+
+            start_loudness_analysis(full_paths, display_result)
+
+        else:
+            def display_progress(processed_count, total_count):
+                print("\rAnalyzing the loudness of the media files: " + str(processed_count) + "/" + str(total_count),
+                      end="", flush=True)
+
+            display_result(update_loudness(full_paths, display_progress))
+
+    @staticmethod
+    def find_duplicates_cli():
+        """
+            CLI-only method. Reports every group of byte-identical media files of the media folder, along with the disk
+            space that could be reclaimed by removing the redundant copies.
+
+            :return: None
+        """
+
+        if media_folder == "":  # No media folder is configured
+            print("\nNo media folder selected. "
+                  "Use \"media_folder [path to a directory]\" command to set up a media folder.")
+            return
+
+        clusters = find_duplicate_media()
+
+        if clusters is None:  # The database could not be updated; the error has already been displayed
+            return
+
+        if not clusters:
+            print("\nNo duplicate media files were found.")
+            return
+
+        reclaimable_size = 0  # The size of the redundant copies (hard links of the same file do not use extra space)
+
+        for paths, file_size in clusters:
+            print("\n" + str(len(paths)) + " identical media files (" + str(file_size) + " bytes each):")
+
+            inodes = set()
+
+            for full_path in paths:
+                print(str(get_media_position(full_path)) + ". " + full_path)
+
+                try:
+                    inodes.add(os.stat(full_path).st_ino)
+                except OSError:
+                    pass
+
+            reclaimable_size += max(len(inodes) - 1, 0) * file_size
+
+        print("\n" + str(len(clusters)) + " groups of duplicates found, " + str(sum(len(paths) - 1 for paths, _ in
+              clusters)) + " redundant media files, " + "{:.1f}".format(reclaimable_size / (1024 * 1024)) +
+              " MB could be reclaimed.")
+
     @staticmethod
     def search_cli(sys_arguments):
         """
@@ -2108,66 +7654,7 @@ class SongStorageCLI:  # The class responsible for running the application in th
             :return: None
         """
 
-        cursor = connection.cursor()
-
-        # The arrays storing the results of the SQL entries for each of the entries' contents
-        valid_title_files = []
-        valid_artist_files = []
-        valid_album_files = []
-        valid_release_year_files = []
-        valid_tags_files = []
-
-        for index in range(len(sys_arguments) - 2):
-            if sys_arguments[index + 2].startswith("title="):  # The user has specified a custom criterion for the title
-                cursor.execute("SELECT full_path FROM media WHERE INSTR(title, " + "\"" + sys_arguments[index + 2][6:]
-                               + "\"" + ") > 0")
-
-                for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                    if os.path.dirname(i[0]) == media_folder:
-                        valid_title_files.append(i[0])
-
-            # The user has specified a custom criterion for the artist
-            if sys_arguments[index + 2].startswith("artist="):
-                cursor.execute(
-                    "SELECT full_path FROM media WHERE INSTR(artist, " + "\"" + sys_arguments[index + 2][7:] +
-                    "\") > 0")
-
-                for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                    if os.path.dirname(i[0]) == media_folder:
-                        valid_artist_files.append(i[0])
-
-            if sys_arguments[index + 2].startswith("album="):  # The user has specified a custom criterion for the album
-                cursor.execute(
-                    "SELECT full_path FROM media WHERE album = " + "\"" + sys_arguments[index + 2][6:] + "\"")
-
-                for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                    if os.path.dirname(i[0]) == media_folder:
-                        valid_album_files.append(i[0])
-
-            # The user has specified a custom criterion for the release year
-            if sys_arguments[index + 2].startswith("release_year="):
-                cursor.execute(
-                    "SELECT full_path FROM media WHERE release_date = " + "\"" + sys_arguments[index + 2][13:]
-                    + "\"")
-
-                for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                    if os.path.dirname(i[0]) == media_folder:
-                        valid_release_year_files.append(i[0])
-
-            if sys_arguments[index + 2].startswith("tags="):  # The user has specified a custom criterion for the tags
-                tags_list = sys_arguments[index + 2][5:].replace('\"', '').replace(' ', '').split(",")
-
-                for tag in tags_list:
-                    cursor.execute("SELECT full_path FROM media WHERE INSTR(tags, \"" + tag + "\") > 0")
-
-                    for i in cursor.fetchall():  # Updating the corresponding list using the cursor result
-                        if os.path.dirname(i[0]) == media_folder:
-                            valid_tags_files.append(i[0])
-
-        # We are now performing intersection operation for each of the lists in order display only the files that match
-        # every criterion passed by the user
-        files = intersection(intersection(intersection(intersection(valid_title_files, valid_artist_files),
-                                                       valid_album_files), valid_release_year_files), valid_tags_files)
+        files = find_media_by_criteria(sys_arguments[2:])
 
         if not files:
             print("\nNo results.")
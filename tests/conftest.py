@@ -0,0 +1,44 @@
+"""
+    Shared setup of the test suite. The application module reads its configuration file from the current directory
+    when it is imported; the tests load it from the folder of the application instead, so that they can be started
+    from any directory.
+"""
+
+import os
+import sys
+
+import pytest
+
+APPLICATION_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, APPLICATION_FOLDER)
+
+import main  # noqa: E402
+
+main.config_var.read(os.path.join(APPLICATION_FOLDER, 'config.ini'))
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    """
+        Replaces the database and the media folder of the application with empty ones, created inside a temporary
+        folder.
+
+        :return: The full path of the media folder (using the app-level convention for slashes).
+    """
+
+    monkeypatch.chdir(tmp_path)  # The database is created inside the "Resources" folder of the current directory
+    (tmp_path / "Resources").mkdir()
+    (tmp_path / "media").mkdir()
+
+    media_folder = str(tmp_path / "media").replace("\\", "/")
+
+    # The globals set when connecting to the database are restored once the test is over
+    monkeypatch.setattr(main, "fts5_available", main.fts5_available)
+    monkeypatch.setattr(main, "release_year_column", main.release_year_column)
+    monkeypatch.setattr(main, "media_folder", media_folder, raising=False)
+    monkeypatch.setattr(main, "connection", main.connect_to_database(), raising=False)
+
+    yield media_folder
+
+    main.connection.close()
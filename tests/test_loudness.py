@@ -0,0 +1,90 @@
+"""
+    Tests of the loudness measurement (ITU-R BS.1770), fed with synthetic audio instead of audio decoded by ffmpeg.
+"""
+
+import io
+
+import pytest
+
+import main
+
+numpy = pytest.importorskip("numpy")
+
+
+class FakeDecoder:  # Stands in for the ffmpeg process, producing the given samples
+    def __init__(self, samples):
+        self.stdout = io.BytesIO(numpy.asarray(samples, dtype="<f4").tobytes())
+
+    def wait(self):
+        return 0
+
+
+def sine(level, seconds, channels=(True, True)):
+    """
+        Generates a 1 kHz sine wave.
+
+        :param level: The peak level of the wave (in dBFS).
+        :param seconds: The duration of the wave.
+        :param channels: Specifies which of the two channels carry the wave; the other ones are silent.
+
+        :return: The samples, as an array of frames.
+    """
+
+    time_axis = numpy.arange(int(seconds * main.LOUDNESS_SAMPLE_RATE)) / main.LOUDNESS_SAMPLE_RATE
+    wave = 10 ** (level / 20) * numpy.sin(2 * numpy.pi * 1000 * time_axis)
+
+    return numpy.stack([wave if channel else numpy.zeros_like(wave) for channel in channels], axis=1)
+
+
+def measure(monkeypatch, samples):
+    """
+        Measures the loudness of the given samples.
+
+        :return: The integrated loudness and the sample peak (see "measure_loudness").
+    """
+
+    monkeypatch.setattr(main.subprocess, "Popen", lambda *arguments, **options: FakeDecoder(samples))
+
+    return main.measure_loudness("media.mp3")
+
+
+def test_stereo_sine(monkeypatch):
+    # A 1 kHz sine wave is barely affected by the K-weighting; its loudness matches its level (spanning several chunks)
+    loudness, peak = measure(monkeypatch, sine(-23, 12))
+
+    assert loudness == pytest.approx(-23, abs=0.05)
+    assert peak == pytest.approx(10 ** (-23 / 20), rel=1e-3)
+
+
+def test_single_channel(monkeypatch):
+    # A single channel carries half of the power of the same wave played on both channels
+    assert measure(monkeypatch, sine(-20, 6, (True, False)))[0] == pytest.approx(-23.01, abs=0.05)
+
+
+def test_absolute_gate(monkeypatch):
+    # Silent blocks do not count toward the loudness (the few blocks overlapping the end of the wave still do)
+    samples = numpy.concatenate([sine(-23, 6), numpy.zeros((6 * main.LOUDNESS_SAMPLE_RATE, 2))])
+
+    assert measure(monkeypatch, samples)[0] == pytest.approx(-23, abs=0.2)
+
+
+def test_relative_gate(monkeypatch):
+    # Blocks more than 10 LU below the loudness of the other blocks do not count toward the loudness
+    gated_loudness = measure(monkeypatch, numpy.concatenate([sine(-23, 6), sine(-50, 6)]))[0]
+
+    assert gated_loudness == pytest.approx(-23, abs=0.2)
+
+    # Blocks within 10 LU of the other blocks count toward the loudness
+    assert measure(monkeypatch, numpy.concatenate([sine(-23, 6), sine(-29, 6)]))[0] == \
+        pytest.approx(-23 - 10 * numpy.log10(2 / (1 + 10 ** -0.6)), abs=0.2)
+
+
+def test_unmeasurable_audio(monkeypatch):
+    assert measure(monkeypatch, numpy.zeros((3 * main.LOUDNESS_SAMPLE_RATE, 2))) == (None, 0.0)  # Silent
+
+    # Shorter than a single 400 ms block
+    loudness, peak = measure(monkeypatch, sine(-6, 0.3))
+
+    assert loudness is None and peak == pytest.approx(10 ** (-6 / 20), rel=1e-3)
+
+    assert measure(monkeypatch, numpy.zeros((0, 2))) == (None, None)  # The media file could not be decoded
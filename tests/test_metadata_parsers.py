@@ -0,0 +1,238 @@
+"""
+    Tests of the parsers reading the metadata embedded in media files (ID3v2, ID3v1, RIFF INFO and MPEG audio headers).
+"""
+
+import io
+import random
+import struct
+
+import pytest
+
+import main
+
+
+MPEG_FRAME_HEADER = b"\xff\xfb\x90\x00"  # MPEG-1 layer 3, 128 kbps, 44100 Hz, stereo, no padding
+MPEG_FRAME_LENGTH = 144 * 128000 // 44100
+
+
+def syncsafe(value):
+    """
+        Encodes an integer as the 4-byte "syncsafe" integer used by ID3v2.
+
+        :return: The encoded integer.
+    """
+
+    return bytes([(value >> 21) & 0x7F, (value >> 14) & 0x7F, (value >> 7) & 0x7F, value & 0x7F])
+
+
+def id3v2_tag(frames, version=3, flags=0):
+    """
+        Builds an ID3v2 tag.
+
+        :param frames: Pairs of (frame identifier, text) stored as text frames, in the encoding given by the first byte
+                       of the text.
+        :param version: The major version of the tag (2, 3 or 4).
+        :param flags: The flags of the tag header.
+
+        :return: The tag.
+    """
+
+    body = b""
+
+    for frame_id, text in frames:
+        if version == 2:
+            body += frame_id + len(text).to_bytes(3, "big") + text
+        elif version == 3:
+            body += frame_id + struct.pack(">I", len(text)) + b"\x00\x00" + text
+        else:
+            body += frame_id + syncsafe(len(text)) + b"\x00\x00" + text
+
+    return b"ID3" + bytes([version, 0, flags]) + syncsafe(len(body)) + body
+
+
+def id3v1_tag(title, artist, album, year):
+    """
+        Builds an ID3v1 tag.
+
+        :return: The tag.
+    """
+
+    return b"TAG" + title.ljust(30, b"\x00") + artist.ljust(30, b"\x00") + album.ljust(30, b"\x00") + year + \
+        b"\x00" * 31
+
+
+def mpeg_frames(count, first_frame=None):
+    """
+        Builds a constant bitrate MPEG audio stream.
+
+        :param count: The number of frames.
+        :param first_frame: Optional data stored after the header of the first frame (eg. a Xing header).
+
+        :return: The stream.
+    """
+
+    frame = MPEG_FRAME_HEADER + b"\x00" * (MPEG_FRAME_LENGTH - 4)
+
+    if first_frame is None:
+        return frame * count
+
+    return (MPEG_FRAME_HEADER + first_frame).ljust(MPEG_FRAME_LENGTH, b"\x00") + frame * (count - 1)
+
+
+def wav_file(info_fields, data_size=176400):
+    """
+        Builds a 16-bit stereo 44100 Hz WAV file.
+
+        :param info_fields: Pairs of (subchunk identifier, value) stored in the RIFF INFO list.
+        :param data_size: The size of the audio data (in bytes).
+
+        :return: The file.
+    """
+
+    info = b"INFO"
+
+    for info_id, value in info_fields:
+        value += b"\x00"
+        info += info_id + struct.pack("<I", len(value)) + value + b"\x00" * (len(value) & 1)
+
+    body = b"WAVE" + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 2, 44100, 176400, 4, 16) + \
+        b"LIST" + struct.pack("<I", len(info)) + info + b"data" + struct.pack("<I", data_size) + b"\x00" * data_size
+
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def tagged_mp3():
+    """
+        Builds an MP3 file with both ID3v2 and ID3v1 tags.
+
+        :return: The file.
+    """
+
+    return id3v2_tag([(b"TIT2", b"\x03Title"), (b"TPE1", b"\x03Artist")]) + mpeg_frames(20) + \
+        id3v1_tag(b"Old title", b"Old artist", b"Album", b"1999")
+
+
+def test_id3v2_3_text_frames():
+    tag = id3v2_tag([(b"TIT2", b"\x00Title"), (b"TPE1", b"\x01" + "Artiste é".encode("utf-16")),
+                     (b"TALB", b"\x03Album \xc3\xa9"), (b"TYER", b"\x001999"), (b"APIC", b"\x00" * 50)])
+
+    metadata, tag_end = main.parse_id3v2_tag(io.BytesIO(tag + MPEG_FRAME_HEADER))
+
+    assert metadata == {"title": "Title", "artist": "Artiste é", "album": "Album é",
+                        "release_date": "1999"}
+    assert tag_end == len(tag)
+
+
+def test_id3v2_2_and_2_4_frames():
+    assert main.parse_id3v2_tag(io.BytesIO(id3v2_tag([(b"TT2", b"\x00Old")], version=2)))[0] == {"title": "Old"}
+
+    # ID3v2.4 stores the size of the frames as syncsafe integers, and text values may be separated by null characters
+    long_title = b"\x03" + b"x" * 200 + b"\x00second value"
+
+    assert main.parse_id3v2_tag(io.BytesIO(id3v2_tag([(b"TIT2", long_title)], version=4)))[0] == \
+        {"title": "x" * 200}
+
+
+def test_id3v2_unsynchronised_tag():
+    # The size of the frame is the one of its decoded contents, while the size of the tag is the one of the encoded tag
+    frame = b"TIT2" + struct.pack(">I", 4) + b"\x00\x00" + b"\x00A\xff\x00B"
+    tag = b"ID3\x03\x00\x80" + syncsafe(len(frame)) + frame
+
+    assert main.parse_id3v2_tag(io.BytesIO(tag))[0] == {"title": "AÿB"}
+
+
+def test_id3v2_missing_tag():
+    file = io.BytesIO(b"\x00" * 5 + MPEG_FRAME_HEADER)
+    file.seek(5)
+
+    assert main.parse_id3v2_tag(file) == ({}, 5)
+    assert main.parse_id3v2_tag(io.BytesIO(b"ID3\x09" + b"\x00" * 20)) == ({}, 0)  # Unknown version
+
+
+def test_id3v1_tag():
+    file = io.BytesIO(mpeg_frames(2) + id3v1_tag(b"Title", b"Artist", b"", b"2001"))
+
+    assert main.parse_id3v1_tag(file) == {"title": "Title", "artist": "Artist", "release_date": "2001"}
+    assert main.parse_id3v1_tag(io.BytesIO(mpeg_frames(2))) is None
+    assert main.parse_id3v1_tag(io.BytesIO(b"TAG")) is None  # Shorter than a tag
+
+
+def test_mpeg_constant_bitrate():
+    stream = mpeg_frames(100)
+
+    duration, bitrate = main.parse_mpeg_audio(io.BytesIO(b"junk" + stream), 0, len(stream) + 4)
+
+    assert bitrate == 128
+    assert duration == pytest.approx(len(stream) * 8 / 128000, rel=1e-3)
+
+
+def test_mpeg_xing_frame_count():
+    # The Xing header of a stereo MPEG-1 stream follows the 32 bytes of side information of the first frame
+    stream = mpeg_frames(10, b"\x00" * 32 + b"Xing" + struct.pack(">II", 1, 1000))
+
+    duration, bitrate = main.parse_mpeg_audio(io.BytesIO(stream), 0, len(stream))
+
+    assert duration == pytest.approx(1000 * 1152 / 44100)
+    assert bitrate == int(len(stream) * 8 / duration / 1000)
+
+
+def test_mpeg_without_frames():
+    # A lone frame sync followed by data that is not the header of the next frame is not a frame
+    data = MPEG_FRAME_HEADER + b"\x12" * MPEG_FRAME_LENGTH * 2
+
+    assert main.parse_mpeg_audio(io.BytesIO(data), 0, len(data)) is None
+    assert main.parse_mpeg_audio(io.BytesIO(b""), 0, 0) is None
+
+
+def test_riff_info_and_duration():
+    metadata = main.parse_riff_file(io.BytesIO(wav_file([(b"INAM", b"Wave"), (b"IART", b"Band"),
+                                                         (b"ICMT", b"comment")])))
+
+    assert metadata == {"title": "Wave", "artist": "Band", "duration": 1.0, "bitrate": 1411}
+    assert main.parse_riff_file(io.BytesIO(b"RIFF\x00\x00\x00\x00AVI LIST")) == {}
+
+
+def test_read_embedded_metadata(tmp_path):
+    media_path = tmp_path / "song.mp3"
+    media_path.write_bytes(tagged_mp3())
+
+    metadata = main.read_embedded_metadata(str(media_path))
+
+    # The ID3v2 tag takes precedence over the ID3v1 tag, which only completes it
+    assert metadata["title"] == "Title" and metadata["artist"] == "Artist"
+    assert metadata["album"] == "Album" and metadata["release_date"] == "1999"
+    assert metadata["bitrate"] == 128
+    assert metadata["duration"] == pytest.approx(20 * MPEG_FRAME_LENGTH * 8 / 128000, rel=1e-3)
+
+
+@pytest.mark.parametrize("data", [tagged_mp3(), id3v2_tag([(b"TIT2", b"\x03Title")], version=4, flags=0x40),
+                                  wav_file([(b"INAM", b"Wave")])], ids=["mp3", "id3v2.4", "wav"])
+def test_truncated_files(data):
+    # Every prefix of a file is parsed without raising an exception
+    for size in list(range(0, 200)) + [len(data) - 200, len(data) - 100]:
+        truncated = data[:size]
+
+        main.parse_id3v2_tag(io.BytesIO(truncated))
+        main.parse_id3v1_tag(io.BytesIO(truncated))
+        main.parse_mpeg_audio(io.BytesIO(truncated), 0, len(truncated))
+        main.parse_riff_file(io.BytesIO(truncated))
+
+    assert main.parse_id3v2_tag(io.BytesIO(tagged_mp3()[:40]))[0] == {"title": "Title"}
+
+
+def test_garbage_headers(tmp_path):
+    generator = random.Random(9)
+    prefixes = [b"", b"ID3\x03\x00\x00", b"ID3\x04\x00\x40", b"ID3\x02\x00\x80", b"RIFF\x00\x00\x00\x00WAVE",
+                MPEG_FRAME_HEADER]
+
+    for index in range(300):
+        data = generator.choice(prefixes) + bytes(generator.getrandbits(8) for _ in range(generator.randint(0, 400)))
+
+        for extension in (".mp3", ".wav"):
+            media_path = tmp_path / ("garbage" + extension)
+            media_path.write_bytes(data)
+
+            signature, metadata = main.extract_media_metadata(str(media_path))
+
+            assert signature == (len(data), media_path.stat().st_mtime_ns)
+            assert isinstance(metadata, dict)
@@ -0,0 +1,153 @@
+"""
+    Tests of the reconciliation of the database with the media folder, and of the folder manifest allowing it to skip
+    the directories that did not change.
+"""
+
+import os
+import time
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def scanned_directories(monkeypatch):
+    """
+        Records the directories listed by the folder scan.
+
+        :return: The list of listed directories, filled by every scan.
+    """
+
+    listed_directories = []
+    scan_directory = main.scan_directory
+
+    def recording_scan_directory(*arguments):
+        result = scan_directory(*arguments)
+
+        if result[2] is not None:  # The directory was listed (it was not skipped as unchanged)
+            listed_directories.append(result[0])
+
+        return result
+
+    monkeypatch.setattr(main, "scan_directory", recording_scan_directory)
+
+    return listed_directories
+
+
+def create_files(media_folder, *names):
+    """
+        Creates files in the media folder, then makes the folder look older than the racy window of the manifest, so
+        that its state can be recorded.
+
+        :return: The full paths of the files.
+    """
+
+    for name in names:
+        os.makedirs(os.path.dirname(os.path.join(media_folder, name)), exist_ok=True)
+
+        with open(os.path.join(media_folder, name), "wb") as media_file:
+            media_file.write(name.encode())
+
+    past = time.time_ns() - 10 * main.MANIFEST_RACY_WINDOW_NS - 10 ** 9
+
+    for directory, _, _ in os.walk(media_folder):
+        os.utime(directory, ns=(past, past))
+
+    return sorted(media_folder + "/" + name for name in names)
+
+
+def test_unchanged_folder_is_skipped(library, scanned_directories):
+    full_paths = create_files(library, "a - one.mp3", "b - two.wav", "notes.txt")
+
+    assert main.reconcile_media_folder() == (full_paths[:2], [])
+    assert scanned_directories == [library]
+
+    assert main.reconcile_media_folder() == ([], [])
+    assert scanned_directories == [library]  # The media folder was not listed again
+
+
+def test_added_and_removed_files(library):
+    full_paths = create_files(library, "a - one.mp3", "b - two.mp3")
+    main.reconcile_media_folder()
+
+    os.remove(full_paths[0])
+    new_paths = create_files(library, "c - three.mp3")
+
+    assert main.reconcile_media_folder() == (new_paths, [full_paths[0]])
+
+
+def test_deleted_record_is_indexed_again(library, scanned_directories):
+    full_paths = create_files(library, "a - one.mp3", "b - two.mp3")
+    main.reconcile_media_folder()
+
+    # The record is deleted while the file stays on disk (eg. the file could not be removed)
+    main.connection.execute("DELETE FROM media WHERE full_path = ?", (full_paths[1],))
+    main.connection.commit()
+
+    assert main.reconcile_media_folder() == ([full_paths[1]], [])
+    assert scanned_directories == [library, library]
+
+
+def test_deleted_record_of_subdirectory_is_indexed_again(library, monkeypatch):
+    monkeypatch.setitem(main.config_var['SCAN'], 'recursive', '1')
+
+    full_paths = create_files(library, "album/one.mp3", "album/two.mp3")
+    main.reconcile_media_folder()
+
+    main.connection.execute("DELETE FROM media WHERE full_path = ?", (full_paths[0],))
+    main.connection.commit()
+
+    # The subdirectory is listed again, although the media folder itself did not change
+    assert main.reconcile_media_folder() == ([full_paths[0]], [])
+
+
+def test_recursive_scan(library, monkeypatch):
+    monkeypatch.setitem(main.config_var['SCAN'], 'recursive', '1')
+    monkeypatch.setitem(main.config_var['SCAN'], 'exclude', 'skipped')
+
+    full_paths = create_files(library, "top.mp3", "album/one.mp3", "album/disc 2/two.mp3", "skipped/three.mp3",
+                              "savelist/four.mp3", "savelist/" + main.SAVELIST_MARKER)
+
+    assert sorted(main.reconcile_media_folder()[0]) == [library + "/album/disc 2/two.mp3", library + "/album/one.mp3",
+                                                        library + "/top.mp3"]
+
+    os.remove(full_paths[0])  # "album/disc 2/two.mp3"
+
+    assert main.reconcile_media_folder() == ([], [full_paths[0]])
+
+
+def test_racy_subdirectory_is_listed_again(library, monkeypatch):
+    monkeypatch.setitem(main.config_var['SCAN'], 'recursive', '1')
+
+    full_paths = create_files(library, "album/one.mp3")
+    os.utime(library + "/album")  # Modified within the racy window of the manifest; its state cannot be trusted
+
+    assert main.reconcile_media_folder() == (full_paths, [])
+
+    # The media folder itself does not change when a file is added to one of its subdirectories
+    new_paths = [library + "/album/two.mp3"]
+
+    with open(new_paths[0], "wb") as media_file:
+        media_file.write(b"two")
+
+    assert main.reconcile_media_folder() == (new_paths, [])
+
+
+def test_enabling_recursive_scan(library, monkeypatch):
+    create_files(library, "top.mp3", "album/one.mp3")
+
+    assert main.reconcile_media_folder() == ([library + "/top.mp3"], [])
+
+    # The manifest recorded without recursive scanning is discarded, although the media folder did not change
+    monkeypatch.setitem(main.config_var['SCAN'], 'recursive', '1')
+
+    assert main.reconcile_media_folder() == ([library + "/album/one.mp3"], [])
+
+
+def test_full_rescan(library, scanned_directories):
+    create_files(library, "a - one.mp3")
+    main.reconcile_media_folder()
+
+    assert main.reconcile_media_folder(full_rescan=True) == ([], [])
+    assert scanned_directories == [library, library]
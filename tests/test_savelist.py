@@ -0,0 +1,118 @@
+"""
+    Tests of the .zip savelists written by "SavelistBuilder".
+"""
+
+import os
+import zipfile
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def media_files(tmp_path, monkeypatch):
+    """
+        Creates a media folder holding a few media files of various sizes (including an empty one and one spanning
+        several chunks).
+
+        :return: The list of full paths of the media files.
+    """
+
+    media_folder = tmp_path / "media"
+    media_folder.mkdir()
+    monkeypatch.setattr(main, "media_folder", str(media_folder).replace("\\", "/"), raising=False)
+
+    contents = {"empty.mp3": b"", "short - song.mp3": b"ID3" + bytes(range(256)) * 40,
+                "long.wav": os.urandom(main.SavelistBuilder.CHUNK_SIZE * 2 + 12345)}
+    full_paths = []
+
+    for name, data in contents.items():
+        (media_folder / name).write_bytes(data)
+        full_paths.append(str(media_folder / name).replace("\\", "/"))
+
+    return full_paths
+
+
+def build_savelist(archive_path, files, **options):
+    """
+        Builds a savelist and waits for the builder thread to finish.
+
+        :return: The builder.
+    """
+
+    builder = main.SavelistBuilder(str(archive_path), files, **options)
+    builder.start()
+    builder.thread.join(timeout=60)
+
+    return builder
+
+
+@pytest.mark.parametrize("method, level", [("stored", None), ("deflated", None), ("deflated", 9), ("bzip2", 1)])
+def test_archive_round_trip(tmp_path, media_files, method, level):
+    archive_path = tmp_path / "savelist.zip"
+    progress = []
+
+    # Two media files are read ahead while the current one is compressed and written
+    builder = build_savelist(archive_path, media_files, method=method, level=level, workers=2,
+                             on_progress=lambda *state: progress.append(state))
+
+    assert builder.completed and builder.error is None and not builder.cancelled
+    assert not os.path.exists(str(archive_path) + ".part")
+
+    with zipfile.ZipFile(archive_path) as savelist_zip:
+        assert savelist_zip.testzip() is None
+        assert savelist_zip.namelist() == [os.path.basename(full_path) for full_path in media_files]
+
+        for full_path in media_files:
+            entry_info = savelist_zip.getinfo(os.path.basename(full_path))
+
+            assert entry_info.compress_type == main.SavelistBuilder.COMPRESSION_METHODS[method]
+
+            with open(full_path, "rb") as media_file:
+                assert savelist_zip.read(entry_info) == media_file.read()
+
+    total_bytes = sum(os.path.getsize(full_path) for full_path in media_files)
+
+    assert progress[-1] == (total_bytes, total_bytes, len(media_files), len(media_files))
+
+
+def test_compression_level(tmp_path, media_files):
+    compressed_sizes = []
+
+    for level in (0, 9):
+        build_savelist(tmp_path / "savelist.zip", media_files, method="deflated", level=level)
+
+        with zipfile.ZipFile(tmp_path / "savelist.zip") as savelist_zip:
+            compressed_sizes.append(savelist_zip.getinfo("short - song.mp3").compress_size)
+
+    # Level 0 only stores the data, while level 9 compresses the repeated bytes of the media file
+    assert compressed_sizes[0] > os.path.getsize(media_files[1]) > 10 * compressed_sizes[1]
+
+
+def test_missing_file_is_reported_as_error(tmp_path, media_files):
+    archive_path = tmp_path / "savelist.zip"
+    os.remove(media_files[1])  # Removed since the media files were selected
+
+    builder = build_savelist(archive_path, media_files, workers=2)
+
+    assert not builder.completed and not builder.cancelled
+    assert isinstance(builder.error, FileNotFoundError)
+    assert not os.path.exists(archive_path) and not os.path.exists(str(archive_path) + ".part")
+
+
+def test_cancelled_build_leaves_no_archive(tmp_path, media_files):
+    archive_path = tmp_path / "savelist.zip"
+
+    builder = main.SavelistBuilder(str(archive_path), media_files, workers=1,
+                                   on_progress=lambda *state: builder.cancel())
+    builder.start()
+    builder.thread.join(timeout=60)
+
+    assert builder.cancelled and builder.error is None and not builder.completed
+    assert not os.path.exists(archive_path) and not os.path.exists(str(archive_path) + ".part")
+
+
+def test_unknown_compression_method():
+    with pytest.raises(ValueError):
+        main.SavelistBuilder("savelist.zip", [], method="lzma")
@@ -0,0 +1,70 @@
+"""
+    Tests of the search criteria compiled into a single query (see "compile_media_criteria").
+"""
+
+import pytest
+
+import main
+
+
+MEDIA_ITEMS = [("Bohemian Rhapsody", "Queen", "A Night at the Opera", "1975-10-31", "rock,classic"),
+               ("Night Fever", "Bee Gees", "Saturday Night Fever", "1977-11-14", "disco"),
+               ("Under Pressure", "Queen & David Bowie", "Hot Space", "1982", "rock,live"),
+               ("Jazz Night", "Various Artists", "", "1999", "jazz")]
+
+
+@pytest.fixture(params=[False, True], ids=["sql", "fts5"])
+def populated_library(request, library, monkeypatch):
+    """
+        Fills the database with a few media items. Every test runs twice: once using plain SQL conditions and once using
+        the full-text index (if the SQLite library supports it).
+
+        :return: A function converting titles into the full paths of their media items.
+    """
+
+    if request.param and not main.fts5_available:
+        pytest.skip("The SQLite library does not support FTS5.")
+
+    monkeypatch.setattr(main, "fts5_available", request.param)
+
+    main.connection.executemany("INSERT INTO media (title, artist, album, release_date, tags, full_path) "
+                                "VALUES (?, ?, ?, ?, ?, ?)",
+                                [media_item + (library + "/" + media_item[0] + ".mp3",) for media_item in MEDIA_ITEMS])
+    main.connection.commit()
+
+    main.rebuild_media_tags(main.connection)
+
+    return lambda *titles: sorted(library + "/" + title + ".mp3" for title in titles)
+
+
+@pytest.mark.parametrize("criteria, titles", [
+    (["artist=Queen"], ["Bohemian Rhapsody", "Under Pressure"]),
+    (["artist==queen"], ["Bohemian Rhapsody"]),
+    (["title=Night"], ["Jazz Night", "Night Fever"]),
+    (["album=Night", "title=Fever"], ["Night Fever"]),
+    (["release_year=1977"], ["Night Fever"]),
+    (["release_year=1975..1980"], ["Bohemian Rhapsody", "Night Fever"]),
+    (["release_year=1980.."], ["Jazz Night", "Under Pressure"]),
+    (["release_year=..1976"], ["Bohemian Rhapsody"]),
+    (["tags=rock"], ["Bohemian Rhapsody", "Under Pressure"]),
+    (["tags=rock+live"], ["Under Pressure"]),
+    (["tags=disco,jazz"], ["Jazz Night", "Night Fever"]),
+    (["artist=Queen", "tags=live"], ["Under Pressure"]),
+    (["unknown=Queen", "artist=Bee"], ["Night Fever"]),
+    (["artist=", "title="], []),
+    (["artist=Nobody"], []),
+])
+def test_find_media_by_criteria(populated_library, criteria, titles):
+    assert sorted(main.find_media_by_criteria(criteria)) == populated_library(*titles)
+
+
+def test_compile_release_year_filter():
+    column = main.release_year_column
+
+    assert main.compile_release_year_filter("1999") == (column + " = ?", [1999])
+    assert main.compile_release_year_filter(" 1990 .. 1999 ") == (column + " >= ? AND " + column + " <= ?",
+                                                                  [1990, 1999])
+    assert main.compile_release_year_filter("..1999") == (column + " <= ?", [1999])
+
+    for value in ("", "..", "1990 1999", "nineties", "1999-01"):
+        assert main.compile_release_year_filter(value) == (None, [])